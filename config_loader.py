@@ -1,9 +1,13 @@
+import copy
 import logging
 import os
 import re
 
 import yaml
 
+from core.processor.mapper import MAP_EXECUTORS
+from utils.match_utils import MATCH_STRATEGIES
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,6 +66,34 @@ class ConfigHandler:
         ):
             raise ValueError("Missing 'entity_source' key in config")
 
+        fetch_engine = self.config.get("fetch_engine")
+        if fetch_engine is not None and str(fetch_engine).lower() not in (
+            "threaded",
+            "async",
+        ):
+            raise ValueError(
+                f"Invalid 'fetch_engine' value '{fetch_engine}': expected 'threaded' or 'async'"
+            )
+        ConfigHandler._validate_positive_int(
+            self.config, "max_requests_in_flight", "config"
+        )
+        ConfigHandler._validate_positive_int(self.config, "fetch_workers", "config")
+        ConfigHandler._validate_positive_int(self.config, "map_workers", "config")
+        if not isinstance(self.config.get("incremental", False), bool):
+            raise ValueError("'incremental' in config must be true or false")
+        if not isinstance(self.config.get("stream", False), bool):
+            raise ValueError("'stream' in config must be true or false")
+        ConfigHandler._validate_positive_int(self.config, "stream_chunk_size", "config")
+
+        if "retry" in self.config:
+            ConfigHandler._validate_retry_config(self.config, "config")
+
+        if "http_cache" in self.config:
+            ConfigHandler._require_dict_block(self.config, "http_cache", "config")
+            ConfigHandler._validate_positive_int(
+                self.config["http_cache"], "max_size_mb", "http_cache"
+            )
+
         ConfigHandler._require_dict_block(self.config, "output", "config")
         ConfigHandler._validate_output_config(self.config["output"])
 
@@ -199,6 +231,42 @@ class ConfigHandler:
             if "query" not in source:
                 raise ValueError("'graphql' sources must have a valid 'query'")
 
+        ConfigHandler._validate_positive_int(source, "pool_size", "source")
+        ConfigHandler._validate_positive_int(source, "max_concurrency", "source")
+        match_workers = source.get("match_workers", 1)
+        if (
+            isinstance(match_workers, bool)
+            or not isinstance(match_workers, int)
+            or (match_workers < 1 and match_workers != -1)
+        ):
+            raise ValueError(
+                "Invalid 'match_workers' value in 'source': expected a positive integer or -1"
+            )
+        if source.get("map_executor", "sequential") not in MAP_EXECUTORS:
+            raise ValueError(
+                f"Invalid 'map_executor' value in 'source': expected one of {', '.join(MAP_EXECUTORS)}"
+            )
+        ConfigHandler._validate_positive_int(source, "map_processes", "source")
+        ConfigHandler._validate_positive_int(source, "map_chunk_size", "source")
+        if "match_strategy" in source:
+            ConfigHandler._validate_match_strategy(source["match_strategy"])
+        if "retry" in source:
+            ConfigHandler._validate_retry_config(source, "source")
+        if "rate_limit" in source:
+            ConfigHandler._require_dict_block(source, "rate_limit", "source")
+            rate = source["rate_limit"].get("requests_per_second")
+            if (
+                isinstance(rate, bool)
+                or not isinstance(rate, (int, float))
+                or rate <= 0
+            ):
+                raise ValueError(
+                    "Invalid 'requests_per_second' value in 'rate_limit': expected a positive number"
+                )
+            ConfigHandler._validate_positive_int(
+                source["rate_limit"], "burst", "rate_limit"
+            )
+
         if "discovery" in source and source_type != "rest_raw":
             discovery = source["discovery"]
             fetch = source.get("fetch", {})
@@ -208,6 +276,8 @@ class ConfigHandler:
                 raise ValueError(
                     "'discovery' property requires defined 'endpoint', 'match_key' and 'filter_prefix'"
                 )
+            if not isinstance(discovery.get("targeted", False), bool):
+                raise ValueError("'targeted' in 'discovery' must be true or false")
             if not fetch:
                 raise ValueError(
                     "source using 'discovery' must define a 'fetch' section with 'endpoint_template' and 'key_param'"
@@ -217,6 +287,109 @@ class ConfigHandler:
                     "'fetch' property requires defined 'endpoint_template' and 'key_param'"
                 )
 
+    @staticmethod
+    def _validate_match_strategy(match_strategy) -> None:
+        """
+        Validate a source's 'match_strategy': a strategy name, a list of them,
+        or a block with 'order', 'strip_prefixes', 'strip_suffixes' and
+        'fuzzy_threshold'.
+
+        Args:
+            match_strategy: Value of the 'match_strategy' key.
+
+        Raises:
+            ValueError: If the value or its settings are invalid.
+        """
+        if isinstance(match_strategy, dict):
+            order = match_strategy.get("order", ["fuzzy"])
+        elif isinstance(match_strategy, str):
+            order = [match_strategy]
+        else:
+            order = match_strategy
+        if not isinstance(order, list) or not order:
+            raise ValueError(
+                "Invalid 'match_strategy' in 'source': expected a strategy name, a non-empty list of names or a block"
+            )
+        for name in order:
+            if name not in MATCH_STRATEGIES:
+                raise ValueError(
+                    f"Invalid match strategy '{name}': expected one of {', '.join(MATCH_STRATEGIES)}"
+                )
+        if len(set(order)) != len(order):
+            raise ValueError("Duplicate strategy in 'match_strategy' order")
+
+        if not isinstance(match_strategy, dict):
+            return
+        for key in ("strip_prefixes", "strip_suffixes"):
+            affixes = match_strategy.get(key, [])
+            if not isinstance(affixes, list) or not all(
+                isinstance(affix, str) for affix in affixes
+            ):
+                raise ValueError(
+                    f"Invalid '{key}' value in 'match_strategy': expected a list of strings"
+                )
+        threshold = match_strategy.get("fuzzy_threshold", 75)
+        if (
+            isinstance(threshold, bool)
+            or not isinstance(threshold, (int, float))
+            or not 0 < threshold <= 100
+        ):
+            raise ValueError(
+                "Invalid 'fuzzy_threshold' value in 'match_strategy': expected a number above 0 and at most 100"
+            )
+
+    @staticmethod
+    def _validate_retry_config(parent: dict, context: str) -> None:
+        """
+        Validate a 'retry' block.
+
+        Args:
+            parent (dict): Config block containing the 'retry' block.
+            context (str): Context name for error message.
+
+        Raises:
+            ValueError: If the block or its values are invalid.
+        """
+        ConfigHandler._require_dict_block(parent, "retry", context)
+        retry = parent["retry"]
+        for key in ("max_retries", "budget"):
+            value = retry.get(key, 0)
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                raise ValueError(
+                    f"Invalid '{key}' value in 'retry': expected a non-negative integer"
+                )
+        for key in ("backoff_base", "backoff_max"):
+            value = retry.get(key, 1)
+            if (
+                isinstance(value, bool)
+                or not isinstance(value, (int, float))
+                or value <= 0
+            ):
+                raise ValueError(
+                    f"Invalid '{key}' value in 'retry': expected a positive number"
+                )
+
+    @staticmethod
+    def _validate_positive_int(block: dict, key: str, context: str) -> None:
+        """
+        Checks that an optional config value, if present, is a positive integer.
+
+        Args:
+            block (dict): Config block containing the value.
+            key (str): Key of the value to check.
+            context (str): Context name for error message.
+
+        Raises:
+            ValueError: If the value is present but not a positive integer.
+        """
+        if key not in block:
+            return
+        value = block[key]
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError(
+                f"Invalid '{key}' value in '{context}': expected a positive integer"
+            )
+
     @staticmethod
     def _require_dict_block(parent: dict, key: str, context: str) -> None:
         """
@@ -298,3 +471,65 @@ class ConfigHandler:
         config_handler.validate()
 
         return config_handler
+
+
+class ConfigWatcher:
+    """
+    Keeps the loaded config of a file for a long-running process, reloading it
+    only when the file's modification time changes.
+    """
+
+    def __init__(self, config_path: str):
+        """
+        Initialize ConfigWatcher without loading the file.
+
+        Args:
+            config_path (str): Path to config YAML file.
+        """
+        self.config_path = config_path
+        self._config = None
+        self._mtime = None
+
+    def has_changed(self) -> bool:
+        """
+        Check whether the file changed since the config was last loaded.
+
+        Returns:
+            bool: True if a loaded config is out of date with its file.
+        """
+        if self._config is None:
+            return False
+        try:
+            return os.stat(self.config_path).st_mtime_ns != self._mtime
+        except OSError:
+            return False
+
+    def load(self) -> dict:
+        """
+        Return the config, (re)loading the file on first use or if it changed.
+        If a changed file fails to load or validate, the last valid config is
+        kept and the file is retried on the next call.
+
+        Returns:
+            dict: Copy of the config dict, safe to modify during a run.
+
+        Raises:
+            OSError: If the file cannot be read and no config was loaded yet.
+            ValueError: If the file is invalid and no config was loaded yet.
+        """
+        try:
+            mtime = os.stat(self.config_path).st_mtime_ns
+            if self._config is None or mtime != self._mtime:
+                if self._config is not None:
+                    logger.info(f"Config file changed: {self.config_path}")
+                self._config = ConfigHandler.load_config_with_env_vars(
+                    self.config_path
+                ).config
+                self._mtime = mtime
+        except Exception as e:
+            if self._config is None:
+                raise
+            logger.error(
+                f"Failed to reload config file {self.config_path}; keeping the last valid config: {e}"
+            )
+        return copy.deepcopy(self._config)
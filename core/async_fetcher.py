@@ -0,0 +1,1081 @@
+"""
+Asyncio fetch engine.
+
+Runs every source, page and discovery sub-request on a single event loop,
+bounded by a global in-flight request limit and per-host limits. Mirrors the
+fetch strategies in core.fetcher and shares their parsing helpers.
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+import aiohttp
+from multidict import CIMultiDict
+
+from core.fetcher import (
+    REQUEST_TIMEOUT,
+    MAX_RAW_PAGES,
+    STREAM_CHUNK_SIZE,
+    add_page_data,
+    build_fetch_url,
+    build_prefetch_urls,
+    extract_response_data,
+    filter_direct_data,
+    filter_discovery_matches,
+    get_cache_signature,
+    get_deferred_sources,
+    get_entity_ids,
+    get_fetch_endpoint,
+    get_next_link,
+    get_request_key,
+    load_cached_data,
+    make_stream_extractor,
+    parse_total_pages,
+    raise_for_status,
+    tag_repository,
+)
+from core.fetch_metrics import RequestTimer
+from core.http_cache import get_http_cache
+from core.http_session import get_host_key, get_pool_size
+from core.rate_limiter import rate_limiters
+from core.request_dedup import request_dedup
+from core.retry import call_with_retries_async
+from core.run_report import RunReport, count_records, report_stage
+from utils.stream_utils import ResponseStreamExtractor
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_REQUESTS_IN_FLIGHT = 100
+
+# request errors retried according to the source's retry policy
+RETRY_ERRORS = (
+    asyncio.TimeoutError,
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+)
+
+# marks a fetch phase request that timed out and should be skipped
+_TIMED_OUT = object()
+
+
+class AsyncResponse:
+    """
+    Fully-read HTTP response returned by AsyncHttpClient.
+    """
+
+    def __init__(
+        self, status: int, reason: str, headers: Any, body: bytes, data: Any = None
+    ):
+        """
+        Initialize AsyncResponse.
+
+        Args:
+            status (int): HTTP status code.
+            reason (str): HTTP reason phrase.
+            headers (Any): Case-insensitive response headers.
+            body (bytes): Response body (empty if the body was streamed).
+            data (Any): Data extracted while streaming the body, if any.
+        """
+        self.status_code = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.data = data
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the response has a non-error status code.
+
+        Returns:
+            bool: True if the status code is below 400.
+        """
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        """
+        Decode the response body as JSON.
+
+        Returns:
+            Any: Decoded JSON body.
+
+        Raises:
+            ValueError: If the body is not valid JSON.
+        """
+        return json.loads(self.body)
+
+
+class AsyncHttpClient:
+    """
+    Shared aiohttp session with global and per-host concurrency limits.
+    """
+
+    def __init__(self, max_requests: int = DEFAULT_MAX_REQUESTS_IN_FLIGHT):
+        """
+        Initialize AsyncHttpClient. The underlying session is opened on entry to
+        the async context manager.
+
+        Args:
+            max_requests (int): Max requests in flight across all hosts.
+        """
+        self.max_requests = max_requests
+        self._session = None
+        self._global_limit = None
+        self._host_limits = {}
+        self._stats = {}
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        """
+        Open the shared aiohttp session.
+
+        Returns:
+            AsyncHttpClient: This client.
+        """
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(self._on_connection_creating)
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        trace_config.on_dns_resolvehost_start.append(self._on_dns_resolving)
+        trace_config.on_dns_resolvehost_end.append(self._on_dns_resolved)
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_end.append(self._on_request_end)
+
+        connector = aiohttp.TCPConnector(limit=self.max_requests)
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=REQUEST_TIMEOUT[0], sock_read=REQUEST_TIMEOUT[1]
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=timeout, trace_configs=[trace_config]
+        )
+        self._global_limit = asyncio.Semaphore(self.max_requests)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """
+        Close the shared aiohttp session and its connections.
+
+        Returns:
+            None
+        """
+        await self._session.close()
+        self._session = None
+
+    async def request(
+        self,
+        source: dict,
+        method: str,
+        url: str,
+        extractor: Optional[ResponseStreamExtractor] = None,
+        sink: Optional[Callable[[bytes], None]] = None,
+        timer: Optional[RequestTimer] = None,
+        **kwargs,
+    ) -> AsyncResponse:
+        """
+        Send an HTTP request and read the response body.
+
+        Successful (2xx) response bodies are fed chunk by chunk to the extractor,
+        if given, instead of being held in memory. DNS, connection setup, time to
+        first byte, body sizes and streaming decode time are added to the timer.
+
+        Args:
+            source (dict): Config for external data source. Its pool size sets
+                the per-host limit the first time the host is seen.
+            method (str): HTTP method (e.g. 'GET', 'POST').
+            url (str): Request URL.
+            extractor (Optional[ResponseStreamExtractor]): Streaming extractor
+                for the response body.
+            sink (Optional[Callable[[bytes], None]]): Called with each streamed
+                body chunk (e.g. to store it in the HTTP cache).
+            timer (Optional[RequestTimer]): Timer of the logical request.
+            kwargs: Additional arguments passed to aiohttp.ClientSession.request.
+
+        Returns:
+            AsyncResponse: Fully-read response.
+        """
+        timer = timer or RequestTimer(source.get("name", ""), url)
+        host_limit = self._get_host_limit(source, url)
+        async with self._global_limit, host_limit:
+            async with self._session.request(
+                method, url, trace_request_ctx=timer, **kwargs
+            ) as response:
+                if extractor is None or response.status >= 300:
+                    body = await response.read()
+                    timer.add_response(len(body), response.content_length)
+                    return AsyncResponse(
+                        response.status, response.reason, response.headers, body
+                    )
+                decoded_bytes = 0
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    decoded_bytes += len(chunk)
+                    if sink is not None:
+                        sink(chunk)
+                    with timer.time_decode():
+                        extractor.feed(chunk)
+                with timer.time_decode():
+                    data = extractor.close()
+                timer.add_response(decoded_bytes, response.content_length)
+                return AsyncResponse(
+                    response.status, response.reason, response.headers, b"", data
+                )
+
+    def get_stats(self) -> dict:
+        """
+        Collect connection reuse counters for every host contacted.
+
+        Returns:
+            dict: Mapping of host to {'requests', 'hits', 'misses'} counts.
+        """
+        return {
+            host: {
+                "requests": counts["hits"] + counts["misses"],
+                "hits": counts["hits"],
+                "misses": counts["misses"],
+            }
+            for host, counts in self._stats.items()
+        }
+
+    def log_stats(self) -> None:
+        """
+        Log connection hit/miss counters for every host contacted.
+
+        Returns:
+            None
+        """
+        for host, counts in self.get_stats().items():
+            logger.info(
+                f"Connection pool stats for {host}: {counts['requests']} requests, "
+                f"{counts['hits']} pool hits, {counts['misses']} new connections"
+            )
+
+    def _get_host_limit(self, source: dict, url: str) -> asyncio.Semaphore:
+        """
+        Return the concurrency limit for the host of a URL, creating it on first
+        use.
+
+        Args:
+            source (dict): Config for external data source.
+            url (str): Request URL.
+
+        Returns:
+            asyncio.Semaphore: Per-host semaphore.
+        """
+        host = get_host_key(url)
+        if host not in self._host_limits:
+            limit = get_pool_size(source)
+            logger.debug(f"Limiting {host} to {limit} concurrent requests")
+            self._host_limits[host] = asyncio.Semaphore(limit)
+        return self._host_limits[host]
+
+    def _count(self, url: Any, outcome: str) -> None:
+        """
+        Increment a connection reuse counter for the host of a URL.
+
+        Args:
+            url (Any): Request URL.
+            outcome (str): Counter to increment ('hits' or 'misses').
+
+        Returns:
+            None
+        """
+        host = get_host_key(str(url))
+        counts = self._stats.setdefault(host, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    async def _on_connection_creating(self, session, context, params) -> None:
+        """aiohttp trace hook: a request started opening a new connection."""
+        context.connect_started = time.perf_counter()
+
+    async def _on_connection_created(self, session, context, params) -> None:
+        """aiohttp trace hook: a request opened a new connection."""
+        timer = context.trace_request_ctx
+        timer.add_connect(time.perf_counter() - context.connect_started)
+        self._count(timer.url, "misses")
+
+    async def _on_connection_reused(self, session, context, params) -> None:
+        """aiohttp trace hook: a request reused a pooled connection."""
+        self._count(context.trace_request_ctx.url, "hits")
+
+    async def _on_dns_resolving(self, session, context, params) -> None:
+        """aiohttp trace hook: a request started resolving its host."""
+        context.dns_started = time.perf_counter()
+
+    async def _on_dns_resolved(self, session, context, params) -> None:
+        """aiohttp trace hook: a request resolved its host."""
+        context.trace_request_ctx.add_dns(time.perf_counter() - context.dns_started)
+
+    async def _on_request_start(self, session, context, params) -> None:
+        """aiohttp trace hook: a request is about to be sent."""
+        context.request_started = time.perf_counter()
+
+    async def _on_request_end(self, session, context, params) -> None:
+        """aiohttp trace hook: a request received its response headers."""
+        timer = context.trace_request_ctx
+        timer.ttfb = time.perf_counter() - context.request_started
+
+
+def run_fetch_all_async(
+    sources: list,
+    max_requests: int = DEFAULT_MAX_REQUESTS_IN_FLIGHT,
+    entity_source_name: Optional[str] = None,
+    report: Optional[RunReport] = None,
+) -> dict:
+    """
+    Fetch data from all sources on a single event loop.
+
+    Args:
+        sources (list): List of source config dicts.
+        max_requests (int): Max requests in flight across all sources.
+        entity_source_name (Optional[str]): Name of the entity source that
+            targeted discovery sources wait for.
+        report (Optional[RunReport]): Report to record each source's fetch
+            stage to, if any.
+
+    Returns:
+        dict: Mapping of source names to fetched data, or None if fetch failed.
+    """
+    return asyncio.run(
+        fetch_all_async(sources, max_requests, entity_source_name, report)
+    )
+
+
+async def fetch_all_async(
+    sources: list,
+    max_requests: int = DEFAULT_MAX_REQUESTS_IN_FLIGHT,
+    entity_source_name: Optional[str] = None,
+    report: Optional[RunReport] = None,
+) -> dict:
+    """
+    Fetch data from all sources concurrently using asyncio.
+
+    Args:
+        sources (list): List of source config dicts.
+        max_requests (int): Max requests in flight across all sources.
+        entity_source_name (Optional[str]): Name of the entity source that
+            targeted discovery sources wait for.
+        report (Optional[RunReport]): Report to record each source's fetch
+            stage to, if any.
+
+    Returns:
+        dict: Mapping of source names to fetched data, or None if fetch failed.
+    """
+    logger.info(
+        f"Fetching from {len(sources)} sources asynchronously "
+        f"(max {max_requests} requests in flight)..."
+    )
+    fetched = {}
+
+    def store(name, data):
+        fetched[name] = data
+
+    async with AsyncHttpClient(max_requests=max_requests) as client:
+        await fetch_each_async(client, sources, store, entity_source_name, report)
+        client.log_stats()
+
+    results = {}
+    for source in sources:
+        name = source.get("name", "<unknown>")
+        results[name] = fetched.get(name)
+        if results[name]:
+            logger.info(f"Fetched data from source: {name}")
+        else:
+            logger.warning(f"No data returned from source: {name}")
+    return results
+
+
+def iter_fetch_all_async(
+    sources: list,
+    max_requests: int = DEFAULT_MAX_REQUESTS_IN_FLIGHT,
+    entity_source_name: Optional[str] = None,
+    report: Optional[RunReport] = None,
+) -> Iterator[tuple]:
+    """
+    Fetch data from all sources on an event loop in a background thread,
+    yielding each source's data as soon as its fetch completes.
+
+    Args:
+        sources (list): List of source config dicts.
+        max_requests (int): Max requests in flight across all sources.
+        entity_source_name (Optional[str]): Name of the entity source that
+            targeted discovery sources wait for.
+        report (Optional[RunReport]): Report to record each source's fetch
+            stage to, if any.
+
+    Yields:
+        tuple: (source name, fetched data or None if fetch failed), in
+        completion order.
+
+    Raises:
+        Exception: Any error that stopped the event loop.
+    """
+    completed = queue.Queue()
+
+    async def fetch_into_queue():
+        async with AsyncHttpClient(max_requests=max_requests) as client:
+            await fetch_each_async(
+                client,
+                sources,
+                lambda name, data: completed.put((name, data)),
+                entity_source_name,
+                report,
+            )
+            client.log_stats()
+
+    def run_loop():
+        try:
+            asyncio.run(fetch_into_queue())
+        except Exception as e:
+            completed.put(e)
+
+    logger.info(
+        f"Fetching from {len(sources)} sources asynchronously in the background "
+        f"(max {max_requests} requests in flight)..."
+    )
+    thread = threading.Thread(target=run_loop, name="async-fetch", daemon=True)
+    thread.start()
+    try:
+        for _ in sources:
+            # keep no reference to the data while suspended, so the consumer
+            # can release it
+            fetched = [completed.get()]
+            if isinstance(fetched[0], Exception):
+                raise fetched[0]
+            yield fetched.pop()
+    finally:
+        thread.join()
+
+
+async def fetch_each_async(
+    client: AsyncHttpClient,
+    sources: list,
+    on_fetched: Callable[[str, Any], None],
+    entity_source_name: Optional[str] = None,
+    report: Optional[RunReport] = None,
+) -> None:
+    """
+    Fetch data from all sources concurrently, reporting each source as soon as
+    its fetch completes. Sources with targeted discovery wait for the entity
+    source and only fetch discovered IDs that match a known entity.
+
+    Args:
+        client (AsyncHttpClient): Shared async HTTP client.
+        sources (list): List of source config dicts.
+        on_fetched (Callable[[str, Any], None]): Called with the source name
+            and fetched data (None if fetch failed) of each source.
+        entity_source_name (Optional[str]): Name of the entity source that
+            targeted discovery sources wait for.
+        report (Optional[RunReport]): Report to record each source's fetch
+            stage to, if any.
+    """
+    deferred = {
+        id(source) for source in get_deferred_sources(sources, entity_source_name)
+    }
+    entities = asyncio.get_running_loop().create_future()
+
+    async def fetch_one(source):
+        name = source.get("name", "<unknown>")
+        data = None
+        try:
+            targeted = id(source) in deferred
+            known_entities = await entities if targeted else None
+            with report_stage(report, "fetch", source=name) as record:
+                if targeted:
+                    data = await fetch_targeted_async(client, source, known_entities)
+                else:
+                    data = await fetch_from_source_async(client, source)
+                record["records_out"] = count_records(data)
+        finally:
+            if name == entity_source_name and not entities.done():
+                entities.set_result(data)
+        on_fetched(name, data)
+
+    await asyncio.gather(*(fetch_one(source) for source in sources))
+
+
+async def fetch_targeted_async(
+    client: AsyncHttpClient, source: dict, entities: Optional[list]
+) -> Optional[list]:
+    """
+    Fetch a targeted discovery source, narrowed to the fetched entities.
+
+    Args:
+        client (AsyncHttpClient): Shared async HTTP client.
+        source (dict): Config for external data source.
+        entities (Optional[list]): Entities fetched from the entity source.
+
+    Returns:
+        Optional[list]: Data fetched from the source, or None if there were no
+        entities to target.
+    """
+    if not entities:
+        logger.warning(
+            f"Skipping targeted discovery for source '{source.get('name', '')}': "
+            "no entities were fetched"
+        )
+        return None
+    return await fetch_from_source_async(
+        client, source, get_entity_ids(source, entities)
+    )
+
+
+async def fetch_from_source_async(
+    client: AsyncHttpClient, source: dict, entity_ids: Optional[list] = None
+) -> Optional[list]:
+    """
+    Routes external data source fetching to the appropriate async fetching
+    function based on source config.
+
+    Args:
+        client (AsyncHttpClient): Shared async HTTP client.
+        source (dict): Config for external data source.
+        entity_ids (Optional[list]): Known entity IDs used to narrow targeted
+            discovery, if any.
+
+    Returns:
+        Optional[list]: Data fetched from the source, or None if no data was retrieved.
+    """
+    source_name = source.get("name", "")
+    source_type = source.get("type", "").lower()
+
+    logger.info(
+        f"Starting async fetch from source: {source_name} (type: {source_type})"
+    )
+
+    try:
+        if source_type == "rest":
+            if "discovery" in source:
+                data = await do_discovery_then_fetch_async(client, source, entity_ids)
+            else:
+                data = await fetch_direct_async(client, source)
+        elif source_type == "graphql":
+            data = await fetch_graphql_async(client, source)
+        elif source_type == "rest_raw":
+            data = await fetch_raw_async(client, source)
+        else:
+            logger.warning(
+                f"Unknown source type '{source_type}' for source: {source_name}"
+            )
+            return None
+
+        if data is None or data == []:
+            logger.warning(f"No data returned from source: {source_name}")
+        else:
+            logger.info(
+                f"Successfully fetched data from source: {source_name} (records: {len(data) if isinstance(data, list) else 'n/a'})"
+            )
+
+        return tag_repository(data, source_name)
+    except Exception as e:
+        logger.error(
+            f"Failed to fetch data from source: {source_name}. Error: {e}",
+            exc_info=True,
+        )
+        return None
+
+
+async def fetch_direct_async(client: AsyncHttpClient, source: dict) -> list:
+    """
+    Async counterpart of core.fetcher.fetch_direct.
+
+    Args:
+        client (AsyncHttpClient): Shared async HTTP client.
+        source (dict): Config for external data source.
+
+    Returns:
+        list: Data fetched from the source.
+
+    Raises:
+        RuntimeError: If the request fails or response is invalid.
+    """
+    source_name = source.get("name", "<unknown>")
+    source_url = f"{source['api_base_url']}{source['endpoint']}"
+
+    try:
+        data, _ = await _request_data(
+            client,
+            source,
+            "GET",
+            source_url,
+            f"Direct fetch for source '{source_name}'",
+            source.get("match_key"),
+            source.get("filter_prefix"),
+        )
+        data = filter_direct_data(source, data)
+        record_count = len(data) if isinstance(data, list) else 1
+        logger.info(f"Fetched {record_count} records from source: {source_name}")
+        return data
+    except asyncio.TimeoutError:
+        logger.warning(f"Request timed out for source {source_name} (url={source_url})")
+        return []
+    except aiohttp.ClientError as e:
+        _raise_request_error(source_name, e)
+    except ValueError as e:
+        _raise_json_error(source_name, e)
+
+
+async def fetch_raw_async(client: AsyncHttpClient, source: dict) -> list:
+    """
+    Async counterpart of core.fetcher.fetch_raw. On request timeout, returns
+    whatever data has been fetched so far, up to the first timed out page.
+    Prefetched pages are bounded by the source's 'max_concurrency' as well as
+    the client's limits.
+
+    Args:
+        client (AsyncHttpClient): Shared async HTTP client.
+        source (dict): Config for external data source.
+
+    Returns:
+        list: Data fetched from the source (may be partial if timeout occurs).
+
+    Raises:
+        RuntimeError: If the request fails (non-timeout) or response is invalid.
+    """
+    source_name = source.get("name", "")
+    all_data = []
+    page = 1
+    max_pages = None
+    source_url = f"{source['api_base_url']}{source['endpoint']}"
+
+    try:
+        while True:
+            data, response = await _request_data(
+                client,
+                source,
+                "GET",
+                source_url,
+                f"Raw fetch for source '{source_name}'",
+            )
+            add_page_data(all_data, data)
+
+            if max_pages is None:
+                max_pages = parse_total_pages(response.headers, source_name)
+            if max_pages and page >= max_pages:
+                break
+
+            next_url = get_next_link(response.headers.get("Link", ""))
+            if not next_url:
+                break
+
+            page_urls = (
+                build_prefetch_urls(source, next_url, max_pages) if page == 1 else []
+            )
+            if page_urls:
+                page_limit = asyncio.Semaphore(source.get("max_concurrency", 1))
+                pages = await gather_ordered(
+                    _fetch_raw_page_async(client, source, url, page_limit)
+                    for url in page_urls
+                )
+                for page_data in pages:
+                    # stop at the first timed out page, as the sequential path does
+                    if page_data is _TIMED_OUT:
+                        logger.warning(
+                            f"Prefetch timed out for source {source_name}; "
+                            f"returning {len(all_data)} records fetched so far."
+                        )
+                        break
+                    add_page_data(all_data, page_data)
+                break
+
+            if page >= MAX_RAW_PAGES:
+                logger.warning(
+                    f"Aborting raw fetch for source {source_name} after {MAX_RAW_PAGES} pages (possible infinite loop)."
+                )
+                break
+
+            page += 1
+            source_url = next_url
+
+        logger.info(f"Fetched {len(all_data)} records from source: {source_name}")
+        return all_data
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Request timed out for source {source_name} (url={source_url}); "
+            f"returning {len(all_data)} records fetched so far."
+        )
+        return all_data
+    except aiohttp.ClientError as e:
+        _raise_request_error(source_name, e)
+    except ValueError as e:
+        _raise_json_error(source_name, e)
+
+
+async def do_discovery_then_fetch_async(
+    client: AsyncHttpClient, source: dict, entity_ids: Optional[list] = None
+) -> list:
+    """
+    Async counterpart of core.fetcher.do_discovery_then_fetch. All fetch phase
+    requests are started at once and bounded by the client's limits.
+
+    Args:
+        client (AsyncHttpClient): Shared async HTTP client.
+        source (dict): Config for external data source.
+        entity_ids (Optional[list]): Known entity IDs. If given, only
+            discovered IDs matching one of them are fetched.
+
+    Returns:
+        list: Data fetched from the source, in discovery order.
+    """
+    source_name = source["name"]
+    discovery_url = f"{source['api_base_url']}{source['discovery']['endpoint']}"
+
+    try:
+        discovery_data, _ = await _request_data(
+            client,
+            source,
+            "GET",
+            discovery_url,
+            f"Discovery fetch for source '{source_name}'",
+            source["discovery"]["match_key"],
+            source["discovery"]["filter_prefix"],
+        )
+        matches = filter_discovery_matches(source, discovery_data, entity_ids)
+        fetch_urls = [build_fetch_url(source, match) for match in matches]
+
+        batches = await gather_ordered(
+            _fetch_discovery_batch_async(client, source, url) for url in fetch_urls
+        )
+        fetch_data = [batch for batch in batches if batch is not _TIMED_OUT]
+        logger.info(
+            f"Fetched {len(fetch_data)} batches of data from source: {source_name}"
+        )
+        return fetch_data
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Request timed out for source {source_name} (url={discovery_url})"
+        )
+        return []
+    except aiohttp.ClientError as e:
+        _raise_request_error(source_name, e)
+    except ValueError as e:
+        _raise_json_error(source_name, e)
+
+
+async def fetch_graphql_async(client: AsyncHttpClient, source: dict) -> list:
+    """
+    Async counterpart of core.fetcher.fetch_graphql.
+
+    Args:
+        client (AsyncHttpClient): Shared async HTTP client.
+        source (dict): Config for external data source.
+
+    Returns:
+        list: Data fetched from the GraphQL source.
+
+    Raises:
+        RuntimeError: If the GraphQL query fails or returns an error.
+    """
+    source_name = source["name"]
+    source_url = f"{source['api_base_url']}{source['endpoint']}"
+
+    try:
+        data, _ = await _request_data(
+            client,
+            source,
+            "POST",
+            source_url,
+            f"GraphQL fetch for source '{source_name}'",
+            json={"query": source["query"]},
+        )
+        logger.info(f"GraphQL fetch successful for source: {source_name}")
+        return data
+    except asyncio.TimeoutError:
+        logger.warning(f"Request timed out for source {source_name} (url={source_url})")
+        return []
+    except aiohttp.ClientError as e:
+        _raise_request_error(source_name, e)
+    except ValueError as e:
+        _raise_json_error(source_name, e)
+
+
+async def gather_ordered(coros: Any) -> list:
+    """
+    Run coroutines concurrently and return their results in input order.
+
+    On the first exception, the remaining coroutines are cancelled and the
+    exception is re-raised.
+
+    Args:
+        coros (Any): Iterable of coroutines.
+
+    Returns:
+        list: Results of each coroutine, in input order.
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _fetch_discovery_batch_async(
+    client: AsyncHttpClient, source: dict, fetch_url: str
+) -> Any:
+    """
+    Fetch the data batch for a single discovered match.
+
+    Args:
+        client (AsyncHttpClient): Shared async HTTP client.
+        source (dict): Config for external data source.
+        fetch_url (str): Fetch phase URL for the match.
+
+    Returns:
+        Any: Extracted batch data, or _TIMED_OUT if the request timed out.
+    """
+    try:
+        data, _ = await _request_data(
+            client,
+            source,
+            "GET",
+            fetch_url,
+            f"Fetch phase for {fetch_url}",
+            endpoint=get_fetch_endpoint(source),
+        )
+        return data
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Request timed out for source {source['name']} (url={fetch_url})"
+        )
+        return _TIMED_OUT
+
+
+async def _fetch_raw_page_async(
+    client: AsyncHttpClient,
+    source: dict,
+    page_url: str,
+    page_limit: asyncio.Semaphore,
+) -> Any:
+    """
+    Fetch a single prefetched page of a raw source.
+
+    Args:
+        client (AsyncHttpClient): Shared async HTTP client.
+        source (dict): Config for external data source.
+        page_url (str): URL of the page.
+        page_limit (asyncio.Semaphore): Bounds the source's page requests in
+            flight to its 'max_concurrency'.
+
+    Returns:
+        Any: Extracted page data, or _TIMED_OUT if the request timed out.
+    """
+    try:
+        async with page_limit:
+            data, _ = await _request_data(
+                client,
+                source,
+                "GET",
+                page_url,
+                f"Raw fetch for source '{source.get('name', '')}'",
+            )
+        return data
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Request timed out for source {source.get('name', '')} (url={page_url})."
+        )
+        return _TIMED_OUT
+
+
+async def _request_data(
+    client: AsyncHttpClient,
+    source: dict,
+    method: str,
+    url: str,
+    action: str,
+    match_key: Optional[str] = None,
+    filter_prefix: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    **kwargs,
+) -> tuple[Any, AsyncResponse]:
+    """
+    Send a request and read the relevant data from the response, streaming the
+    body if the source has 'stream_response' enabled. As in
+    core.fetcher.request_data, every attempt waits for the host's rate limiter,
+    failed requests are retried according to the source's retry policy and
+    sources with 'cache' enabled are revalidated against the HTTP cache.
+    Identical requests are shared while request_dedup is active.
+
+    Args:
+        client (AsyncHttpClient): Shared async HTTP client.
+        source (dict): Config for external data source.
+        method (str): HTTP method.
+        url (str): Request URL.
+        action (str): Description of the request, used for logging.
+        match_key (Optional[str]): Record key checked against filter_prefix
+            (streaming only).
+        filter_prefix (Optional[str]): Prefix a kept record's match_key value
+            must start with (streaming only).
+        endpoint (Optional[str]): Endpoint label for fetch metrics; defaults to
+            the URL without its query string.
+        kwargs: Additional arguments passed to AsyncHttpClient.request.
+
+    Returns:
+        tuple[Any, AsyncResponse]: Extracted data and the response. For a
+        response served from the cache, the response carries the cached headers.
+
+    Raises:
+        RuntimeError: If the response status is not OK.
+        ValueError: If the response body is not valid JSON.
+    """
+    timer = RequestTimer(source.get("name", ""), url, endpoint)
+    data = None
+    try:
+        data, response = await request_dedup.call_async(
+            get_request_key(source, method, url, match_key, filter_prefix, kwargs),
+            lambda: _send_and_read(
+                client,
+                source,
+                method,
+                url,
+                action,
+                match_key,
+                filter_prefix,
+                timer,
+                **kwargs,
+            ),
+        )
+        return data, response
+    finally:
+        timer.finish(data)
+
+
+async def _send_and_read(
+    client: AsyncHttpClient,
+    source: dict,
+    method: str,
+    url: str,
+    action: str,
+    match_key: Optional[str],
+    filter_prefix: Optional[str],
+    timer: RequestTimer,
+    **kwargs,
+) -> tuple[Any, AsyncResponse]:
+    """
+    Send a request and read the relevant data from the response, using the HTTP
+    cache if enabled. See _request_data.
+
+    Args:
+        client (AsyncHttpClient): Shared async HTTP client.
+        source (dict): Config for external data source.
+        method (str): HTTP method.
+        url (str): Request URL.
+        action (str): Description of the request, used for logging.
+        match_key (Optional[str]): Record key checked against filter_prefix.
+        filter_prefix (Optional[str]): Prefix a kept record's match_key value
+            must start with.
+        timer (RequestTimer): Timer of the logical request.
+        kwargs: Additional arguments passed to AsyncHttpClient.request.
+
+    Returns:
+        tuple[Any, AsyncResponse]: Extracted data and the response.
+    """
+    cache = get_http_cache(source)
+    entry = writer = None
+    if cache is not None:
+        key = cache.make_key(method, url, kwargs.get("json"))
+        signature = get_cache_signature(source, match_key, filter_prefix)
+        entry = cache.get_entry(key)
+        headers = kwargs.get("headers", {})
+        if entry:
+            kwargs["headers"] = {**headers, **cache.conditional_headers(entry)}
+        writer = cache.open_writer(key)
+    limiter = rate_limiters.get_limiter(source, url)
+
+    async def attempt() -> AsyncResponse:
+        # each attempt streams into a fresh extractor and cache body
+        if writer:
+            writer.reset()
+        if limiter is not None:
+            await limiter.acquire_async()
+        timer.attempts += 1
+        return await client.request(
+            source,
+            method,
+            url,
+            extractor=make_stream_extractor(source, match_key, filter_prefix),
+            sink=writer.write if writer else None,
+            timer=timer,
+            **kwargs,
+        )
+
+    try:
+        response = await call_with_retries_async(source, url, attempt, RETRY_ERRORS)
+        if entry and response.status_code == 304:
+            writer.discard()
+            try:
+                with timer.time_decode():
+                    data = load_cached_data(
+                        cache, key, signature, source, match_key, filter_prefix
+                    )
+            except OSError:
+                # evicted by another request since the conditional request was sent
+                logger.info(
+                    f"Cached response for {url} was evicted, requesting it again"
+                )
+                kwargs["headers"] = headers
+                writer = cache.open_writer(key)
+                response = await call_with_retries_async(
+                    source, url, attempt, RETRY_ERRORS
+                )
+            else:
+                logger.debug(f"Serving cached response for {url} (not modified)")
+                response.headers = CIMultiDict(entry["headers"])
+                return data, response
+
+        raise_for_status(response, action)
+        if source.get("stream_response"):
+            data = response.data
+        else:
+            if writer:
+                writer.write(response.body)
+            with timer.time_decode():
+                data = extract_response_data(source, response.json())
+    except BaseException:
+        if writer:
+            writer.discard()
+        raise
+
+    if writer:
+        if cache.has_validators(response.headers):
+            writer.commit(url, response.headers, signature, data)
+        else:
+            writer.discard()
+    return data, response
+
+
+def _raise_request_error(source_name: str, error: Exception) -> None:
+    """
+    Log and re-raise a client request error as a RuntimeError.
+
+    Args:
+        source_name (str): Name of the source being fetched.
+        error (Exception): Original client error.
+
+    Raises:
+        RuntimeError: Always.
+    """
+    logger.error(f"Request error for source {source_name}: {error}")
+    raise RuntimeError(f"Request failed for source {source_name}: {error}") from error
+
+
+def _raise_json_error(source_name: str, error: Exception) -> None:
+    """
+    Log and re-raise an invalid response body error as a RuntimeError.
+
+    Args:
+        source_name (str): Name of the source being fetched.
+        error (Exception): Original decoding error.
+
+    Raises:
+        RuntimeError: Always.
+    """
+    logger.error(f"Invalid JSON response for source {source_name}: {error}")
+    raise RuntimeError(
+        f"Invalid JSON response for source {source_name}: {error}"
+    ) from error
@@ -1,21 +1,103 @@
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
-from core.fetcher import fetch_from_source
-from core.processor.mapper import collect_mappings
+from core.async_fetcher import (
+    DEFAULT_MAX_REQUESTS_IN_FLIGHT,
+    iter_fetch_all_async,
+    run_fetch_all_async,
+)
+from core.fetch_metrics import fetch_metrics
+from core.fetcher import (
+    fetch_from_source,
+    get_deferred_sources,
+    get_entity_ids,
+    iter_raw_pages,
+    tag_repository,
+)
+from core.http_cache import configure_http_cache, flush_http_cache
+from core.http_session import session_pool
+from core.request_dedup import request_dedup
+from core.retry import (
+    DEFAULT_RETRY_BUDGET,
+    RetryBudget,
+    clear_project_retries,
+    configure_retries,
+    set_project_retries,
+)
+from core.run_id import new_run_id
+from core.run_report import RunReport, count_records, report_stage
+from core.run_state import RunState
+from core.snapshot_store import DEFAULT_SNAPSHOT_DIR, SnapshotStore
+from core.source_stats import DEFAULT_STATS_FILE, SourceStats
+from core.processor.mapper import DEFAULT_MAP_CHUNK_SIZE, collect_mappings
 from core.processor.post_processor_registry import get_post_processor
 
 logger = logging.getLogger(__name__)
 
 
-def run_dispatcher(config: dict, parallel: bool = False) -> list:
+DEFAULT_FETCH_WORKERS = 8
+DEFAULT_MAP_WORKERS = 1
+
+# entities and fetched data shared by all tasks of a mapping worker process,
+# set once per process by _init_map_worker
+_worker_entities = None
+_worker_fetched_data = None
+
+# retry budget shared by the projects of a batch run, set by batch_fetch_run
+_batch_retry_budget = None
+
+# 'http_cache' settings of the first project of a batch run using the HTTP
+# cache, which every other project must match; reset by batch_fetch_run
+_batch_http_cache_settings = None
+_batch_lock = threading.Lock()
+
+
+def run_dispatcher(
+    config: dict,
+    parallel: bool = False,
+    fetch_engine: Optional[str] = None,
+    save_snapshot: bool = False,
+    from_snapshot: Optional[str] = None,
+    pipeline: bool = False,
+    fetch_workers: Optional[int] = None,
+    map_workers: Optional[int] = None,
+    run_state: Optional[RunState] = None,
+    report: Optional[RunReport] = None,
+) -> list:
     """
     Coordinates data retrieval from config sources and maps results to project
     entities.
 
     Args:
         config (dict): Config dict.
-        parallel (bool): Parallel fetching switch.
+        parallel (bool): Parallel fetching switch (threaded engine only).
+        fetch_engine (Optional[str]): 'threaded' or 'async'. Overrides the
+            config 'fetch_engine' key; defaults to 'threaded'.
+        save_snapshot (bool): Save the fetched data to the snapshot store under
+            a new run id.
+        from_snapshot (Optional[str]): Run id (or 'latest') of a saved snapshot
+            to use instead of fetching.
+        pipeline (bool): Map each source as soon as it and the entity source
+            are fetched, instead of after all fetches. Also enabled by the
+            config 'pipeline' key.
+        fetch_workers (Optional[int]): Worker threads for parallel fetching.
+            Overrides the config 'fetch_workers' key; defaults to 8.
+        map_workers (Optional[int]): Worker processes for mapping (not used in
+            pipelined mode). Overrides the config 'map_workers' key; defaults
+            to 1 (map in this process).
+        run_state (Optional[RunState]): Fingerprints of the previous run, to
+            reuse the mappings of unchanged sources (incremental runs only).
+        report (Optional[RunReport]): Report to record fetch and matching
+            stages to, if any.
 
     Returns:
         list: List of external data mappings associated with entities.
@@ -25,11 +107,30 @@ def run_dispatcher(config: dict, parallel: bool = False) -> list:
     entity_source_name = config.get("entity_source")
 
     # check if in raw fetch mode
-    all_raw = all(source.get("type", "").lower() == "rest_raw" for source in sources)
+    all_raw = is_raw_config(config)
 
-    logger.info("Fetching all source data...")
-    fetched_data = fetch_all_parallel(sources) if parallel else fetch_all(sources)
-    logger.info("Fetching complete!")
+    snapshot_store = SnapshotStore(config.get("snapshot_dir", DEFAULT_SNAPSHOT_DIR))
+    if (pipeline or config.get("pipeline")) and not (from_snapshot or all_raw):
+        return run_pipeline(
+            config,
+            fetch_engine,
+            snapshot_store if save_snapshot else None,
+            fetch_workers,
+            run_state,
+            report,
+        )
+
+    if from_snapshot:
+        logger.info(f"Loading source data from snapshot: {from_snapshot}")
+        fetched_data = load_snapshot_data(snapshot_store, from_snapshot, sources)
+    else:
+        fetched_data = fetch_sources(
+            config, parallel, fetch_engine, fetch_workers, report
+        )
+        if save_snapshot:
+            snapshot_store.save(new_run_id(), fetched_data)
+    if run_state is not None:
+        run_state.check_unchanged(config, fetched_data)
 
     # bypass entity matching if all sources are raw fetches
     if all_raw:
@@ -52,25 +153,411 @@ def run_dispatcher(config: dict, parallel: bool = False) -> list:
         logger.error(f"No data found for entity source: {entity_source_name}")
         return []
 
-    return match_all(entities, sources, fetched_data, entity_source_name)
+    return match_all(
+        entities,
+        sources,
+        fetched_data,
+        entity_source_name,
+        map_workers or config.get("map_workers") or DEFAULT_MAP_WORKERS,
+        run_state,
+        report,
+    )
+
+
+def fetch_sources(
+    config: dict,
+    parallel: bool = False,
+    fetch_engine: Optional[str] = None,
+    fetch_workers: Optional[int] = None,
+    report: Optional[RunReport] = None,
+) -> dict:
+    """
+    Fetch data from all config sources with the selected fetch engine.
+
+    Args:
+        config (dict): Config dict.
+        parallel (bool): Parallel fetching switch (threaded engine only).
+        fetch_engine (Optional[str]): 'threaded' or 'async'. Overrides the
+            config 'fetch_engine' key; defaults to 'threaded'.
+        fetch_workers (Optional[int]): Worker threads for parallel fetching.
+            Overrides the config 'fetch_workers' key; defaults to 8.
+        report (Optional[RunReport]): Report to record each source's fetch
+            stage to, if any.
+
+    Returns:
+        dict: Mapping of source names to fetched data, or None if fetch failed.
+    """
+    sources = config["sources"]
+    fetch_engine = get_fetch_engine(config, fetch_engine)
+    retry_budget = prepare_fetch(config)
+
+    logger.info(f"Fetching all source data (engine: {fetch_engine})...")
+    if fetch_engine == "async":
+        fetched_data = run_fetch_all_async(
+            sources,
+            config.get("max_requests_in_flight", DEFAULT_MAX_REQUESTS_IN_FLIGHT),
+            config.get("entity_source"),
+            report,
+        )
+    else:
+        source_stats = load_source_stats(config)
+        if parallel:
+            fetched_data = fetch_all_parallel(
+                sources,
+                get_fetch_workers(config, fetch_workers),
+                source_stats,
+                config.get("entity_source"),
+                report,
+            )
+        else:
+            fetched_data = fetch_all(
+                sources, source_stats, config.get("entity_source"), report
+            )
+        source_stats.save()
+    finish_fetch(fetch_engine, retry_budget)
+    return fetched_data
+
+
+def iter_fetch_sources(
+    config: dict,
+    fetch_engine: Optional[str] = None,
+    fetch_workers: Optional[int] = None,
+    report: Optional[RunReport] = None,
+) -> Iterator[tuple]:
+    """
+    Fetch data from all config sources concurrently with the selected fetch
+    engine, yielding each source's data as soon as its fetch completes.
+
+    Args:
+        config (dict): Config dict.
+        fetch_engine (Optional[str]): 'threaded' or 'async'. Overrides the
+            config 'fetch_engine' key; defaults to 'threaded'.
+        fetch_workers (Optional[int]): Worker threads (threaded engine only).
+            Overrides the config 'fetch_workers' key; defaults to 8.
+        report (Optional[RunReport]): Report to record each source's fetch
+            stage to, if any.
+
+    Yields:
+        tuple: (source name, fetched data or None if fetch failed), in
+        completion order.
+    """
+    sources = config["sources"]
+    fetch_engine = get_fetch_engine(config, fetch_engine)
+    retry_budget = prepare_fetch(config)
+
+    logger.info(f"Fetching all source data (engine: {fetch_engine}, pipelined)...")
+    if fetch_engine == "async":
+        yield from iter_fetch_all_async(
+            sources,
+            config.get("max_requests_in_flight", DEFAULT_MAX_REQUESTS_IN_FLIGHT),
+            config.get("entity_source"),
+            report,
+        )
+    else:
+        source_stats = load_source_stats(config)
+        yield from iter_fetch_parallel(
+            sources,
+            get_fetch_workers(config, fetch_workers),
+            source_stats,
+            config.get("entity_source"),
+            report,
+        )
+        source_stats.save()
+    finish_fetch(fetch_engine, retry_budget)
+
+
+def is_raw_config(config: dict) -> bool:
+    """
+    Check whether every source of a config is a raw fetch, so its records are
+    written as-is without entity matching.
+
+    Args:
+        config (dict): Config dict.
+
+    Returns:
+        bool: True if all sources are of type 'rest_raw'.
+    """
+    return all(
+        source.get("type", "").lower() == "rest_raw" for source in config["sources"]
+    )
+
+
+def iter_raw_records(
+    config: dict, report: Optional[RunReport] = None
+) -> Iterator[dict]:
+    """
+    Fetch the sources of a raw config one after another with the threaded
+    engine, yielding their records page by page as they arrive, so that a
+    consumer writing them out holds at most a few pages in memory. A source
+    that fails is logged and skipped, keeping the records already yielded. The
+    fetch is finished even if the consumer stops early.
+
+    Args:
+        config (dict): Config dict; every source must be of type 'rest_raw'.
+        report (Optional[RunReport]): Report to record each source's fetch
+            stage to, if any. Its wall time includes the time the consumer
+            spends on the source's records.
+
+    Yields:
+        dict: Fetched records, tagged with their source's repository.
+    """
+    retry_budget = prepare_fetch(config)
+    logger.info("Streaming raw records from all sources...")
+    try:
+        for source in config["sources"]:
+            name = source.get("name", "<unknown>")
+            record_count = 0
+            with report_stage(report, "fetch", source=name, streamed=True) as record:
+                try:
+                    for data in iter_raw_pages(source):
+                        data = tag_repository(data, name)
+                        if isinstance(data, list):
+                            record_count += len(data)
+                            yield from data
+                        else:
+                            record_count += 1
+                            yield data
+                except Exception as e:
+                    logger.error(
+                        f"Failed to stream data from source: {name} after "
+                        f"{record_count} records. Error: {e}",
+                        exc_info=True,
+                    )
+                record["records_out"] = record_count
+            if record_count:
+                logger.info(f"Streamed {record_count} records from source: {name}")
+            else:
+                logger.warning(f"No data found for raw source {name}; skipping.")
+    finally:
+        finish_fetch("threaded", retry_budget)
+
+
+def get_fetch_engine(config: dict, fetch_engine: Optional[str] = None) -> str:
+    """
+    Resolve the fetch engine to use.
+
+    Args:
+        config (dict): Config dict.
+        fetch_engine (Optional[str]): Engine override from the CLI.
+
+    Returns:
+        str: 'threaded' or 'async'.
+    """
+    return (fetch_engine or config.get("fetch_engine") or "threaded").lower()
 
 
-def fetch_all(sources: list) -> dict:
+def get_fetch_workers(config: dict, fetch_workers: Optional[int] = None) -> int:
+    """
+    Resolve the number of worker threads for parallel fetching.
+
+    Args:
+        config (dict): Config dict.
+        fetch_workers (Optional[int]): Worker count override from the CLI.
+
+    Returns:
+        int: Number of worker threads.
+    """
+    return fetch_workers or config.get("fetch_workers") or DEFAULT_FETCH_WORKERS
+
+
+def load_source_stats(config: dict) -> SourceStats:
+    """
+    Load the per-source fetch durations recorded by previous runs.
+
+    Args:
+        config (dict): Config dict.
+
+    Returns:
+        SourceStats: Stats read from the config 'source_stats_file'.
+    """
+    return SourceStats(config.get("source_stats_file", DEFAULT_STATS_FILE))
+
+
+def prepare_fetch(config: dict) -> RetryBudget:
+    """
+    Set up the HTTP cache, retry budget and fetch metrics for a fetch run, or
+    join the shared HTTP cache, retry budget and fetch metrics of a batch run.
+
+    Args:
+        config (dict): Config dict.
+
+    Returns:
+        RetryBudget: Retry budget shared by all sources in the run.
+    """
+    if _batch_retry_budget is not None:
+        if any(source.get("cache") for source in config["sources"]):
+            join_batch_http_cache(config)
+        return join_batch_retry_budget(config)
+    if any(source.get("cache") for source in config["sources"]):
+        configure_http_cache(config.get("http_cache"))
+    retry_budget = configure_retries(config.get("retry"))
+    fetch_metrics.reset()
+    return retry_budget
+
+
+def join_batch_retry_budget(config: dict) -> RetryBudget:
+    """
+    Add a project's retry budget to the budget shared by a batch run, and use
+    its top-level retry settings as the defaults of its own sources, since the
+    run-wide defaults are shared by every project.
+
+    Args:
+        config (dict): Config dict of the project.
+
+    Returns:
+        RetryBudget: Retry budget shared by the batch run.
+    """
+    settings = dict(config.get("retry") or {})
+    _batch_retry_budget.extend(settings.pop("budget", DEFAULT_RETRY_BUDGET))
+    set_project_retries(config["sources"], settings)
+    return _batch_retry_budget
+
+
+def join_batch_http_cache(config: dict) -> None:
+    """
+    Use the HTTP cache shared by a batch run. The cache is a single shared
+    instance, so it is configured by the first project using it, and a
+    project whose 'http_cache' settings differ is rejected rather than
+    switching the cache of projects already fetching.
+
+    Args:
+        config (dict): Config dict of the project.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If the project's 'http_cache' settings differ from those
+            of the batch.
+    """
+    global _batch_http_cache_settings
+    settings = config.get("http_cache") or {}
+    with _batch_lock:
+        if _batch_http_cache_settings is None:
+            configure_http_cache(settings)
+            _batch_http_cache_settings = settings
+        elif settings != _batch_http_cache_settings:
+            raise ValueError(
+                f"Project '{config.get('project')}' uses different 'http_cache' "
+                "settings than other projects of the batch run"
+            )
+
+
+def finish_fetch(fetch_engine: str, retry_budget: RetryBudget) -> None:
+    """
+    Persist the HTTP cache's access times and log connection, retry and
+    fetch metrics stats at the end of a fetch run (stats are logged at the
+    end of the batch instead, in a batch run).
+
+    Args:
+        fetch_engine (str): 'threaded' or 'async'.
+        retry_budget (RetryBudget): Retry budget of the run.
+
+    Returns:
+        None
+    """
+    flush_http_cache()
+    if retry_budget is not _batch_retry_budget:
+        if fetch_engine != "async":
+            session_pool.log_stats()
+        retry_budget.log_stats()
+        fetch_metrics.log_summary()
+    logger.info("Fetching complete!")
+
+
+@contextmanager
+def batch_fetch_run() -> Iterator[RetryBudget]:
+    """
+    Share fetch state between the projects of a batch run running concurrently
+    in this process: identical upstream requests in flight are deduplicated,
+    the retry budget is the sum of the projects' budgets, the HTTP cache is
+    configured once (see join_batch_http_cache), and connection, retry, fetch
+    metrics and deduplication stats are logged once for the whole batch.
+    Pooled HTTP sessions are shared by the threaded engine in any run.
+
+    Returns:
+        Iterator[RetryBudget]: Context yielding the shared retry budget.
+    """
+    global _batch_retry_budget, _batch_http_cache_settings
+    _batch_retry_budget = configure_retries({"budget": 0})
+    _batch_http_cache_settings = None
+    fetch_metrics.reset()
+    request_dedup.activate()
+    try:
+        yield _batch_retry_budget
+    finally:
+        request_dedup.log_stats()
+        request_dedup.deactivate()
+        session_pool.log_stats()
+        _batch_retry_budget.log_stats()
+        fetch_metrics.log_summary()
+        clear_project_retries()
+        _batch_retry_budget = None
+        _batch_http_cache_settings = None
+
+
+def load_snapshot_data(
+    snapshot_store: SnapshotStore, run_id: str, sources: list
+) -> dict:
+    """
+    Load previously fetched data for all config sources from a snapshot.
+
+    Args:
+        snapshot_store (SnapshotStore): Store holding the snapshot.
+        run_id (str): Run id of the snapshot, or 'latest'.
+        sources (list): List of source config dicts.
+
+    Returns:
+        dict: Mapping of source names to fetched data, or None for sources
+        missing from the snapshot.
+
+    Raises:
+        FileNotFoundError: If the snapshot does not exist.
+    """
+    snapshot = snapshot_store.load(run_id)
+    fetched_data = {}
+    for source in sources:
+        name = source.get("name", "<unknown>")
+        if name not in snapshot:
+            logger.warning(f"Source '{name}' not found in snapshot {run_id}")
+        fetched_data[name] = snapshot.get(name)
+    return fetched_data
+
+
+def fetch_all(
+    sources: list,
+    source_stats: Optional[SourceStats] = None,
+    entity_source_name: Optional[str] = None,
+    report: Optional[RunReport] = None,
+) -> dict:
     """
     Fetch data from all sources sequentially.
 
     Args:
         sources (list): List of source config dicts.
+        source_stats (Optional[SourceStats]): Stats to record each source's
+            fetch duration to, if any.
+        entity_source_name (Optional[str]): Name of the entity source that
+            targeted discovery sources wait for.
+        report (Optional[RunReport]): Report to record each source's fetch
+            stage to, if any.
 
     Returns:
         dict: Mapping of source names to fetched data, or None if fetch failed.
     """
     logger.info(f"Fetching from {len(sources)} sources sequentially...")
+    deferred = get_deferred_sources(sources, entity_source_name)
+    deferred_ids = {id(source) for source in deferred}
     results = {}
-    for source in sources:
+    for source in [s for s in sources if id(s) not in deferred_ids] + deferred:
         name = source.get("name", "<unknown>")
         try:
-            results[name] = fetch_from_source(source)
+            if id(source) in deferred_ids:
+                results[name] = fetch_targeted(
+                    source, results.get(entity_source_name), source_stats, report
+                )
+            else:
+                results[name] = fetch_and_record(source, source_stats, report=report)
             if results[name]:
                 logger.info(f"Fetched data from source: {name}")
             else:
@@ -78,45 +565,197 @@ def fetch_all(sources: list) -> dict:
         except Exception as e:
             logger.error(f"Failed to fetch from source '{name}': {e}")
             results[name] = None
-    return results
+    return {
+        source.get("name", "<unknown>"): results[source.get("name", "<unknown>")]
+        for source in sources
+    }
 
 
-def fetch_all_parallel(sources: list, max_workers: int = 8) -> dict:
+def fetch_all_parallel(
+    sources: list,
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    source_stats: Optional[SourceStats] = None,
+    entity_source_name: Optional[str] = None,
+    report: Optional[RunReport] = None,
+) -> dict:
     """
     Fetch data from all sources concurrently using threads.
 
     Args:
         sources (list): List of source config dicts.
         max_workers (int): Max number of worker threads.
+        source_stats (Optional[SourceStats]): Fetch durations of previous runs.
+            If given, the longest-running sources are started first and this
+            run's durations are recorded.
+        entity_source_name (Optional[str]): Name of the entity source that
+            targeted discovery sources wait for.
+        report (Optional[RunReport]): Report to record each source's fetch
+            stage to, if any.
 
     Returns:
         dict: Mapping of source names to fetched data, or None if fetch failed.
     """
+    return dict(
+        iter_fetch_parallel(
+            sources, max_workers, source_stats, entity_source_name, report
+        )
+    )
+
+
+def iter_fetch_parallel(
+    sources: list,
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    source_stats: Optional[SourceStats] = None,
+    entity_source_name: Optional[str] = None,
+    report: Optional[RunReport] = None,
+) -> Iterator[tuple]:
+    """
+    Fetch data from all sources concurrently using threads, yielding each
+    source's data as soon as its fetch completes. Targeted discovery sources
+    are submitted once the entity source is fetched.
+
+    Args:
+        sources (list): List of source config dicts.
+        max_workers (int): Max number of worker threads.
+        source_stats (Optional[SourceStats]): Fetch durations of previous runs.
+            If given, the longest-running sources are started first and this
+            run's durations are recorded.
+        entity_source_name (Optional[str]): Name of the entity source that
+            targeted discovery sources wait for.
+        report (Optional[RunReport]): Report to record each source's fetch
+            stage to, if any.
+
+    Yields:
+        tuple: (source name, fetched data or None if fetch failed), in
+        completion order.
+    """
+    if source_stats is not None:
+        sources = source_stats.order_longest_first(sources)
+    deferred = get_deferred_sources(sources, entity_source_name)
+    deferred_ids = {id(source) for source in deferred}
+
     logger.info(
         f"Fetching from {len(sources)} sources in parallel using {max_workers} workers..."
     )
-    results = {}
-
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_source = {
-            executor.submit(fetch_from_source, source): source for source in sources
+        # the executor starts queued fetches in submission order
+        pending = {
+            executor.submit(
+                fetch_and_record, source, source_stats, report=report
+            ): source
+            for source in sources
+            if id(source) not in deferred_ids
         }
 
-    for future in as_completed(future_to_source):
-        source = future_to_source[future]
-        name = source.get("name", "<unknown>")
-        try:
-            results[name] = future.result()
-            logger.info(f"Fetched data from source: {name}")
-        except Exception as e:
-            logger.error(f"Parallel fetch failed for source '{name}': {e}")
-            results[name] = None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            while done:
+                future = done.pop()
+                source = pending.pop(future)
+                name = source.get("name", "<unknown>")
+                try:
+                    fetched = [(name, future.result())]
+                    logger.info(f"Fetched data from source: {name}")
+                except Exception as e:
+                    logger.error(f"Parallel fetch failed for source '{name}': {e}")
+                    fetched = [(name, None)]
 
-    return results
+                if name == entity_source_name:
+                    for deferred_source in deferred:
+                        future = executor.submit(
+                            fetch_targeted,
+                            deferred_source,
+                            fetched[0][1],
+                            source_stats,
+                            report,
+                        )
+                        pending[future] = deferred_source
+
+                # keep no reference to the data while suspended, so the
+                # consumer can release it
+                del future
+                yield fetched.pop()
+
+
+def fetch_and_record(
+    source: dict,
+    source_stats: Optional[SourceStats] = None,
+    entity_ids: Optional[list] = None,
+    report: Optional[RunReport] = None,
+) -> Optional[list]:
+    """
+    Fetch data from a source, recording the fetch duration.
+
+    Args:
+        source (dict): Config for external data source.
+        source_stats (Optional[SourceStats]): Stats to record the duration to,
+            if any.
+        entity_ids (Optional[list]): Known entity IDs used to narrow targeted
+            discovery, if any.
+        report (Optional[RunReport]): Report to record the fetch stage to, if
+            any.
+
+    Returns:
+        Optional[list]: Data fetched from the source.
+    """
+    started = time.perf_counter()
+    try:
+        with report_stage(
+            report, "fetch", source=source.get("name", "<unknown>")
+        ) as record:
+            if entity_ids is None:
+                data = fetch_from_source(source)
+            else:
+                data = fetch_from_source(source, entity_ids)
+            record["records_out"] = count_records(data)
+        return data
+    finally:
+        if source_stats is not None:
+            source_stats.record(
+                source.get("name", "<unknown>"), time.perf_counter() - started
+            )
+
+
+def fetch_targeted(
+    source: dict,
+    entities: Optional[list],
+    source_stats: Optional[SourceStats] = None,
+    report: Optional[RunReport] = None,
+) -> Optional[list]:
+    """
+    Fetch a targeted discovery source, narrowed to the fetched entities.
+
+    Args:
+        source (dict): Config for external data source.
+        entities (Optional[list]): Entities fetched from the entity source.
+        source_stats (Optional[SourceStats]): Stats to record the duration to,
+            if any.
+        report (Optional[RunReport]): Report to record the fetch stage to, if
+            any.
+
+    Returns:
+        Optional[list]: Data fetched from the source, or None if there were no
+        entities to target.
+    """
+    if not entities:
+        logger.warning(
+            f"Skipping targeted discovery for source '{source.get('name', '')}': "
+            "no entities were fetched"
+        )
+        return None
+    return fetch_and_record(
+        source, source_stats, get_entity_ids(source, entities), report
+    )
 
 
 def match_all(
-    entities: list, sources: list, fetched_data: dict, entity_source_name: str
+    entities: list,
+    sources: list,
+    fetched_data: dict,
+    entity_source_name: str,
+    map_workers: int = DEFAULT_MAP_WORKERS,
+    run_state: Optional[RunState] = None,
+    report: Optional[RunReport] = None,
 ) -> list:
     """
     Maps fetched external data from sources (excluding entity source) to matching project
@@ -127,47 +766,385 @@ def match_all(
         sources (list): List of external data source configs.
         fetched_data (dict): All data fetched from sources.
         entity_source_name (str): Name of source providing entities.
+        map_workers (int): Worker processes to map with; 1 maps in this process.
+        run_state (Optional[RunState]): Fingerprints of the previous run; the
+            saved mappings of unchanged sources are reused.
+        report (Optional[RunReport]): Report to record matching stages to, if
+            any. Mapping in processes is recorded as one stage.
 
     Returns:
         list: Combined list of external data mappings to project entities.
     """
     logger.info("Beginning mapping of source data to entities...")
     results = []
+    mapped_sources = [
+        source for source in sources if source.get("name") != entity_source_name
+    ]
 
-    for source in sources:
-        name = source.get("name")
-        if name == entity_source_name:
-            continue
+    if map_workers > 1:
+        source_mappings = {}
+        if run_state is not None:
+            for source in mapped_sources:
+                mappings = run_state.get_mappings(source, entity_source_name)
+                if mappings is not None:
+                    source_mappings[source["name"]] = mappings
+        changed_sources = [
+            source for source in mapped_sources if source["name"] not in source_mappings
+        ]
+        with report_stage(report, "match", map_workers=map_workers) as record:
+            changed_mappings = map_sources_in_processes(
+                entities, changed_sources, fetched_data, map_workers
+            )
+            record["records_in"] = sum(
+                count_records(fetched_data[source["name"]]) or 0
+                for source in changed_sources
+            )
+            record["records_out"] = sum(len(mappings) for mappings in changed_mappings)
+        for source, mappings in zip(changed_sources, changed_mappings):
+            source_mappings[source["name"]] = mappings
+            if run_state is not None and fetched_data[source["name"]] is not None:
+                run_state.set_mappings(source, entity_source_name, mappings)
+        for source in mapped_sources:
+            results.extend(source_mappings[source["name"]])
+    else:
+        for source in mapped_sources:
+            results.extend(
+                map_source_incremental(
+                    entities,
+                    source,
+                    fetched_data[source["name"]],
+                    entity_source_name,
+                    run_state,
+                    report,
+                )
+            )
 
-        logger.debug(f"Processing source for mapping: {name}")
-        source_data = fetched_data[source["name"]]
-        if source_data is None:
-            logger.warning(f"No data to map for source: {name}")
-            continue
+    logger.info(f"Total mappings created: {len(results)}")
+
+    return results
+
+
+def map_source(entities: list, source: dict, source_data: Optional[list]) -> list:
+    """
+    Maps the data fetched from one source to matching project entities.
+
+    Args:
+        entities (list): List of project entities to match against.
+        source (dict): External data source config.
+        source_data (Optional[list]): Data fetched from the source.
+
+    Returns:
+        list: External data mappings from the source to project entities.
+    """
+    name = source.get("name")
+    logger.debug(f"Processing source for mapping: {name}")
+    if source_data is None:
+        logger.warning(f"No data to map for source: {name}")
+        return []
+
+    mappings = collect_source_mappings(entities, source, source_data)
+    log_mapping_count(name, mappings)
+    return mappings
+
+
+def map_source_incremental(
+    entities: list,
+    source: dict,
+    source_data: Optional[list],
+    entity_source_name: str,
+    run_state: Optional[RunState] = None,
+    report: Optional[RunReport] = None,
+) -> list:
+    """
+    Maps the data fetched from one source like map_source, reusing the mappings
+    saved in the run state if the source's inputs are unchanged.
+
+    Args:
+        entities (list): List of project entities to match against.
+        source (dict): External data source config.
+        source_data (Optional[list]): Data fetched from the source.
+        entity_source_name (str): Name of source providing entities.
+        run_state (Optional[RunState]): Fingerprints of the previous run, if any.
+        report (Optional[RunReport]): Report to record the matching stage to,
+            if any.
+
+    Returns:
+        list: External data mappings from the source to project entities.
+    """
+    with report_stage(report, "match", source=source.get("name")) as record:
+        mappings = None
+        if run_state is not None:
+            mappings = run_state.get_mappings(source, entity_source_name)
+            record["reused"] = mappings is not None
+        if mappings is None:
+            mappings = map_source(entities, source, source_data)
+            if run_state is not None and source_data is not None:
+                run_state.set_mappings(source, entity_source_name, mappings)
+        record["records_in"] = count_records(source_data)
+        record["records_out"] = len(mappings)
+    return mappings
+
+
+def collect_source_mappings(
+    entities: list,
+    source: dict,
+    source_data: list,
+    map_executor: Optional[str] = None,
+) -> list:
+    """
+    Runs collect_mappings for one source with the settings from its config.
+
+    Args:
+        entities (list): List of project entities to match against.
+        source (dict): External data source config.
+        source_data (list): Data fetched from the source.
+        map_executor (Optional[str]): Overrides the source 'map_executor' key.
 
-        post_processor = get_post_processor(source.get("post_processor"))
-
-        mappings = collect_mappings(
-            entities=entities,
-            source_config=source,
-            matched_source_data=source_data,
-            dataset_base_url=source["dataset_base_url"],
-            dataset_base_url_param=source["dataset_base_url_param"],
-            repository_name=source["name"],
-            match_key=(
-                source.get("match_key")
-                or source.get("discovery", {}).get("match_key")
-                or source.get("fetch", {}).get("match_key")
-            ),
-            post_processor=post_processor,
+    Returns:
+        list: External data mappings from the source to project entities.
+    """
+    post_processor = get_post_processor(source.get("post_processor"))
+
+    return collect_mappings(
+        entities=entities,
+        source_config=source,
+        matched_source_data=source_data,
+        dataset_base_url=source["dataset_base_url"],
+        dataset_base_url_param=source["dataset_base_url_param"],
+        repository_name=source["name"],
+        match_key=(
+            source.get("match_key")
+            or source.get("discovery", {}).get("match_key")
+            or source.get("fetch", {}).get("match_key")
+        ),
+        post_processor=post_processor,
+        executor=map_executor or source.get("map_executor", "sequential"),
+        processes=source.get("map_processes"),
+        chunk_size=source.get("map_chunk_size", DEFAULT_MAP_CHUNK_SIZE),
+    )
+
+
+def log_mapping_count(name: str, mappings: list) -> None:
+    """
+    Log the number of mappings created from a source.
+
+    Args:
+        name (str): Source name.
+        mappings (list): Mappings created from the source.
+
+    Returns:
+        None
+    """
+    if mappings:
+        logger.info(f"{len(mappings)} mappings created from source: {name}")
+    else:
+        logger.info(f"No mappings created from source: {name}")
+
+
+def map_sources_in_processes(
+    entities: list, sources: list, fetched_data: dict, map_workers: int
+) -> list:
+    """
+    Maps the data fetched from each source to project entities in a pool of
+    worker processes, so CPU-bound matching and post-processing use several
+    cores.
+
+    Each source is one task; when there are fewer sources than workers, each
+    source's entities are split into contiguous chunks. The entities and the
+    fetched data are sent to each worker once, and the post-processor is looked
+    up by its registry name in the worker. Chunk results are merged in source
+    and entity order, so the output matches mapping in a single process. With
+    fewer than two tasks, no pool is started and they are mapped in this
+    process.
+
+    Args:
+        entities (list): List of project entities to match against.
+        sources (list): External data source configs to map (excluding the
+            entity source).
+        fetched_data (dict): All data fetched from sources.
+        map_workers (int): Number of worker processes.
+
+    Returns:
+        list: Mappings of each source, in source order.
+    """
+    mappable = []
+    for index, source in enumerate(sources):
+        if fetched_data[source["name"]] is None:
+            logger.warning(f"No data to map for source: {source['name']}")
+        else:
+            mappable.append(index)
+    results = [[] for _ in sources]
+    if not mappable:
+        return results
+
+    chunks_per_source = max(1, -(-map_workers // max(len(mappable), 1)))
+    chunk_size = max(1, -(-len(entities) // chunks_per_source))
+    tasks = [
+        (index, start, start + chunk_size)
+        for index in mappable
+        for start in range(0, len(entities), chunk_size)
+    ]
+
+    if len(tasks) < 2:
+        # a pool costs more to start than it saves on a single task
+        for index, start, stop in tasks:
+            source = sources[index]
+            results[index] = collect_source_mappings(
+                entities[start:stop],
+                source,
+                fetched_data[source["name"]],
+                map_executor="sequential",
+            )
+    else:
+        logger.info(
+            f"Mapping {len(mappable)} sources in {len(tasks)} tasks using "
+            f"{map_workers} worker processes..."
         )
+        worker_data = {
+            sources[index]["name"]: fetched_data[sources[index]["name"]]
+            for index in mappable
+        }
+        with ProcessPoolExecutor(
+            max_workers=map_workers,
+            initializer=_init_map_worker,
+            initargs=(entities, worker_data),
+        ) as executor:
+            futures = [
+                (index, executor.submit(_map_chunk, sources[index], start, stop))
+                for index, start, stop in tasks
+            ]
+            # collect in submission order to keep the merged output deterministic
+            for index, future in futures:
+                results[index].extend(future.result())
+
+    for index in mappable:
+        log_mapping_count(sources[index]["name"], results[index])
+    return results
 
-        if mappings:
-            logger.info(f"{len(mappings)} mappings created from source: {name}")
-            results.extend(mappings)
+
+def _init_map_worker(entities: list, fetched_data: dict) -> None:
+    """
+    Store the entities and fetched data in a mapping worker process.
+
+    Args:
+        entities (list): List of project entities to match against.
+        fetched_data (dict): Data fetched from the sources to map.
+    """
+    global _worker_entities, _worker_fetched_data
+    _worker_entities = entities
+    _worker_fetched_data = fetched_data
+
+
+def _map_chunk(source: dict, start: int, stop: int) -> list:
+    """
+    Map one source to a contiguous chunk of entities in a worker process.
+
+    Args:
+        source (dict): External data source config.
+        start (int): Index of the first entity in the chunk.
+        stop (int): Index after the last entity in the chunk.
+
+    Returns:
+        list: Mappings from the source to the chunk's entities.
+    """
+    # already in a worker process, so map the chunk's entities sequentially
+    return collect_source_mappings(
+        _worker_entities[start:stop],
+        source,
+        _worker_fetched_data[source["name"]],
+        map_executor="sequential",
+    )
+
+
+def run_pipeline(
+    config: dict,
+    fetch_engine: Optional[str] = None,
+    snapshot_store: Optional[SnapshotStore] = None,
+    fetch_workers: Optional[int] = None,
+    run_state: Optional[RunState] = None,
+    report: Optional[RunReport] = None,
+) -> list:
+    """
+    Fetches all config sources concurrently and maps each source as soon as it
+    and the entity source are fetched, while slower fetches are still running.
+    Each source's fetched data is released once its mappings are built.
+
+    Args:
+        config (dict): Config dict.
+        fetch_engine (Optional[str]): 'threaded' or 'async'. Overrides the
+            config 'fetch_engine' key; defaults to 'threaded'.
+        snapshot_store (Optional[SnapshotStore]): Store to save the fetched
+            data to under a new run id, if any.
+        fetch_workers (Optional[int]): Worker threads (threaded engine only).
+            Overrides the config 'fetch_workers' key; defaults to 8.
+        run_state (Optional[RunState]): Fingerprints of the previous run, to
+            reuse the mappings of unchanged sources and detect an unchanged
+            run (incremental runs only).
+        report (Optional[RunReport]): Report to record fetch and matching
+            stages to, if any.
+
+    Returns:
+        list: List of external data mappings associated with entities, in
+        config source order.
+    """
+    sources = config["sources"]
+    entity_source_name = config.get("entity_source")
+    sources_by_name = {source.get("name", "<unknown>"): source for source in sources}
+    snapshot_writer = (
+        snapshot_store.open_run(new_run_id()) if snapshot_store else None
+    )
+
+    entities = None
+    entities_fetched = False
+    waiting = {}
+    source_mappings = {}
+
+    logger.info("Beginning pipelined fetching and entity matching...")
+    for name, data in iter_fetch_sources(config, fetch_engine, fetch_workers, report):
+        if snapshot_writer is not None:
+            snapshot_writer.add(name, data)
+        if run_state is not None:
+            run_state.add_source(name, data)
+
+        if name == entity_source_name:
+            entities, entities_fetched = data, True
+            if not entities:
+                logger.error(f"No data found for entity source: {entity_source_name}")
+            ready, waiting = waiting, {}
+        elif not entities_fetched:
+            # hold until the entities to match against are fetched
+            waiting[name] = data
+            continue
         else:
-            logger.info(f"No mappings created from source: {name}")
+            ready = {name: data}
+        del data
 
-    logger.info(f"Total mappings created: {len(results)}")
+        while ready:
+            ready_name, source_data = ready.popitem()
+            if entities:
+                source_mappings[ready_name] = map_source_incremental(
+                    entities,
+                    sources_by_name[ready_name],
+                    source_data,
+                    entity_source_name,
+                    run_state,
+                    report,
+                )
+            del source_data
+
+    if snapshot_writer is not None:
+        snapshot_writer.commit()
+    if run_state is not None:
+        # every source was fingerprinted by add_source as it was fetched
+        run_state.check_unchanged(config, {})
+
+    if not entities:
+        if not entities_fetched:
+            logger.error(f"No data found for entity source: {entity_source_name}")
+        return []
 
+    results = []
+    for source in sources:
+        results.extend(source_mappings.pop(source.get("name", "<unknown>"), []))
+    logger.info(f"Total mappings created: {len(results)}")
     return results
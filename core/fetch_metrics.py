@@ -0,0 +1,396 @@
+"""
+Per-request fetch instrumentation.
+
+Each logical request (including its retries) is timed by a RequestTimer and
+recorded in the shared FetchMetrics collector, which summarizes timings, sizes
+and record counts per source and per endpoint with p50/p95/max.
+
+Threaded fetches measure connection setup (DNS + TCP + TLS combined) through
+timed urllib3 connection classes installed by the session pool; async fetches
+measure DNS and connection setup separately through aiohttp trace hooks.
+"""
+
+import contextlib
+import logging
+import math
+import threading
+import time
+from typing import Any, Iterator, Optional
+from urllib.parse import urlsplit
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+# (metric, column label, unit) in summary table order
+SUMMARY_METRICS = [
+    ("total", "total", "s"),
+    ("ttfb", "ttfb", "s"),
+    ("connect", "connect", "s"),
+    ("dns", "dns", "s"),
+    ("decode", "decode", "s"),
+    ("wire_bytes", "wire", "KB"),
+    ("decoded_bytes", "decoded", "KB"),
+    ("records", "records", ""),
+]
+
+_active = threading.local()
+
+
+class RequestTimer:
+    """
+    Collects the timings and sizes of one logical request, including retries.
+    """
+
+    def __init__(self, source_name: str, url: str, endpoint: Optional[str] = None):
+        """
+        Initialize RequestTimer and start the total time clock.
+
+        Args:
+            source_name (str): Name of the source being fetched.
+            url (str): Request URL.
+            endpoint (Optional[str]): Endpoint label; defaults to the URL without
+                its query string.
+        """
+        self.source_name = source_name
+        self.url = url
+        self.endpoint = endpoint or RequestTimer._endpoint_of(url)
+        self.attempts = 0
+        self.ttfb = None
+        self.connect = None
+        self.dns = None
+        self.decode = 0.0
+        self.wire_bytes = None
+        self.decoded_bytes = 0
+        self._started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["RequestTimer"]:
+        """
+        Make this timer the current thread's active timer, so connections
+        opened by the thread add their setup time to it.
+
+        Yields:
+            RequestTimer: This timer.
+        """
+        previous = getattr(_active, "timer", None)
+        _active.timer = self
+        try:
+            yield self
+        finally:
+            _active.timer = previous
+
+    @contextlib.contextmanager
+    def time_decode(self) -> Iterator[None]:
+        """
+        Add the time spent in the block to the JSON decode time.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.decode += time.perf_counter() - started
+
+    def add_response(
+        self, decoded_bytes: int, wire_bytes: Optional[int] = None
+    ) -> None:
+        """
+        Add the size of a response body.
+
+        Args:
+            decoded_bytes (int): Body size after content decoding.
+            wire_bytes (Optional[int]): Body size as received, if known.
+        """
+        self.decoded_bytes += decoded_bytes
+        if wire_bytes is not None:
+            self.wire_bytes = (self.wire_bytes or 0) + wire_bytes
+
+    def add_connect(self, seconds: float) -> None:
+        """
+        Add connection setup time.
+
+        Args:
+            seconds (float): Time spent opening a connection.
+        """
+        self.connect = (self.connect or 0.0) + seconds
+
+    def add_dns(self, seconds: float) -> None:
+        """
+        Add DNS resolution time.
+
+        Args:
+            seconds (float): Time spent resolving the host.
+        """
+        self.dns = (self.dns or 0.0) + seconds
+
+    def finish(
+        self, data: Any = None, metrics: Optional["FetchMetrics"] = None
+    ) -> None:
+        """
+        Stop the total time clock and record the request.
+
+        Args:
+            data (Any): Data extracted from the response, used for the record count.
+            metrics (Optional[FetchMetrics]): Collector to record to; defaults to
+                the shared fetch_metrics.
+        """
+        records = len(data) if isinstance(data, list) else int(data is not None)
+        (metrics or fetch_metrics).record(
+            self.source_name,
+            self.endpoint,
+            {
+                "total": time.perf_counter() - self._started,
+                "ttfb": self.ttfb,
+                "connect": self.connect,
+                "dns": self.dns,
+                "decode": self.decode,
+                "wire_bytes": self.wire_bytes,
+                "decoded_bytes": self.decoded_bytes,
+                "records": records,
+                "attempts": self.attempts,
+            },
+        )
+
+    @staticmethod
+    def _endpoint_of(url: str) -> str:
+        """
+        Build the default endpoint label of a URL.
+
+        Args:
+            url (str): Request URL.
+
+        Returns:
+            str: URL without its query string or fragment.
+        """
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def get_active_timer() -> Optional[RequestTimer]:
+    """
+    Return the current thread's active request timer.
+
+    Returns:
+        Optional[RequestTimer]: Active timer, or None outside a timed request.
+    """
+    return getattr(_active, "timer", None)
+
+
+def time_decode(timer: Optional[RequestTimer]) -> contextlib.AbstractContextManager:
+    """
+    Time a decoding block against a request timer, if there is one.
+
+    Args:
+        timer (Optional[RequestTimer]): Request timer, or None.
+
+    Returns:
+        contextlib.AbstractContextManager: Context manager timing the block.
+    """
+    return timer.time_decode() if timer is not None else contextlib.nullcontext()
+
+
+class FetchMetrics:
+    """
+    Thread-safe collector of per-request fetch measurements.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty FetchMetrics.
+        """
+        self._requests = []
+        self._lock = threading.Lock()
+
+    def record(self, source_name: str, endpoint: str, values: dict) -> None:
+        """
+        Record the measurements of one request.
+
+        Args:
+            source_name (str): Name of the source fetched.
+            endpoint (str): Endpoint label.
+            values (dict): Measurements; None marks a value not measured.
+        """
+        with self._lock:
+            self._requests.append((source_name, endpoint, values))
+
+    def reset(self) -> None:
+        """
+        Drop all recorded requests.
+        """
+        with self._lock:
+            self._requests.clear()
+
+    def summarize(self, by: str = "source") -> dict:
+        """
+        Summarize the recorded requests per source or per endpoint.
+
+        Args:
+            by (str): 'source' or 'endpoint'.
+
+        Returns:
+            dict: Mapping of group to {'requests', 'attempts', <metric>: {'p50',
+            'p95', 'max', 'sum'}}. Metrics never measured for a group are None.
+        """
+        with self._lock:
+            requests = list(self._requests)
+
+        groups = {}
+        for source_name, endpoint, values in requests:
+            key = source_name if by == "source" else f"{source_name} {endpoint}"
+            groups.setdefault(key, []).append(values)
+
+        summary = {}
+        for key, group in groups.items():
+            summary[key] = {
+                "requests": len(group),
+                "attempts": sum(values["attempts"] for values in group),
+            }
+            for metric, _, _ in SUMMARY_METRICS:
+                measured = sorted(
+                    values[metric] for values in group if values[metric] is not None
+                )
+                summary[key][metric] = (
+                    {
+                        "p50": percentile(measured, 50),
+                        "p95": percentile(measured, 95),
+                        "max": measured[-1],
+                        "sum": sum(measured),
+                    }
+                    if measured
+                    else None
+                )
+        return summary
+
+    def format_summary(self, by: str = "source") -> str:
+        """
+        Format the summary as a text table with p50/p95/max per metric.
+
+        Args:
+            by (str): 'source' or 'endpoint'.
+
+        Returns:
+            str: Table text, or an empty string if nothing was recorded.
+        """
+        summary = self.summarize(by)
+        if not summary:
+            return ""
+
+        header = [by, "reqs", "tries"] + [
+            f"{label} p50/p95/max" + (f" ({unit})" if unit else "")
+            for _, label, unit in SUMMARY_METRICS
+        ]
+        rows = [header]
+        for key, stats in summary.items():
+            row = [key, str(stats["requests"]), str(stats["attempts"])]
+            for metric, _, unit in SUMMARY_METRICS:
+                row.append(FetchMetrics._format_stats(stats[metric], unit))
+            rows.append(row)
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines = [
+            "  ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows
+        ]
+        lines.insert(1, "  ".join("-" * w for w in widths))
+        return "\n".join(line.rstrip() for line in lines)
+
+    def log_summary(self) -> None:
+        """
+        Log the per-source summary table, and the per-endpoint table at DEBUG.
+
+        Returns:
+            None
+        """
+        table = self.format_summary("source")
+        if not table:
+            return
+        logger.info(f"Fetch metrics per source:\n{table}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Fetch metrics per endpoint:\n{self.format_summary('endpoint')}"
+            )
+
+    @staticmethod
+    def _format_stats(stats: Optional[dict], unit: str) -> str:
+        """
+        Format p50/p95/max of a metric for the summary table.
+
+        Args:
+            stats (Optional[dict]): Metric summary, or None if not measured.
+            unit (str): 's' (seconds), 'KB' (from bytes) or '' (counts).
+
+        Returns:
+            str: Formatted 'p50/p95/max', or '-' if not measured.
+        """
+        if stats is None:
+            return "-"
+        values = [stats["p50"], stats["p95"], stats["max"]]
+        if unit == "s":
+            return "/".join(f"{value:.3f}" for value in values)
+        if unit == "KB":
+            return "/".join(f"{value / 1024:.1f}" for value in values)
+        return "/".join(str(value) for value in values)
+
+
+def percentile(sorted_values: list, pct: float) -> Any:
+    """
+    Nearest-rank percentile of pre-sorted values.
+
+    Args:
+        sorted_values (list): Values in ascending order.
+        pct (float): Percentile in (0, 100].
+
+    Returns:
+        Any: Value at the percentile, or None if there are no values.
+    """
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """
+    urllib3 connection that adds its setup time (DNS + TCP) to the active
+    request timer.
+    """
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        timer = get_active_timer()
+        if timer is not None:
+            timer.add_connect(time.perf_counter() - started)
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """
+    urllib3 connection that adds its setup time (DNS + TCP + TLS) to the active
+    request timer.
+    """
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        timer = get_active_timer()
+        if timer is not None:
+            timer.add_connect(time.perf_counter() - started)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+# urllib3 pool classes to install on a PoolManager's pool_classes_by_scheme
+TIMED_POOL_CLASSES = {
+    "http": TimedHTTPConnectionPool,
+    "https": TimedHTTPSConnectionPool,
+}
+
+
+fetch_metrics = FetchMetrics()
@@ -1,19 +1,47 @@
+import json
 import logging
 import requests
-from typing import Optional, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from requests.structures import CaseInsensitiveDict
+from typing import Any, Callable, Iterator, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from core.fetch_metrics import RequestTimer, get_active_timer, time_decode
+from core.http_cache import MISSING, HttpCache, get_http_cache
+from core.http_session import send_request
+from core.rate_limiter import rate_limiters
+from core.request_dedup import request_dedup
+from core.retry import call_with_retries
+from utils.match_utils import MatchStrategy
+from utils.stream_utils import ResponseStreamExtractor
 
 logger = logging.getLogger(__name__)
 
 
 REQUEST_TIMEOUT = (5, 30)  # (connect_timeout, read_timeout)
 
+MAX_RAW_PAGES = 1000
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# request errors retried according to the source's retry policy
+RETRY_ERRORS = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+
+# marks a fetch phase request that timed out and should be skipped
+_TIMED_OUT = object()
 
-def fetch_from_source(source: dict) -> Optional[list]:
+
+def fetch_from_source(
+    source: dict, entity_ids: Optional[list] = None
+) -> Optional[list]:
     """Routes external data source fetching to appropriate fetching function
     based on source config.
 
     Args:
         source (dict): Config for external data source.
+        entity_ids (Optional[list]): Known entity IDs used to narrow targeted
+            discovery, if any.
 
     Returns:
         Optional[list]: Data fetched from the source, or None if no data was retrieved.
@@ -27,7 +55,7 @@ def fetch_from_source(source: dict) -> Optional[list]:
         if source_type == "rest":
             if "discovery" in source:
                 logger.debug(f"Using two-part fetch for source: {source_name}")
-                data = do_discovery_then_fetch(source)
+                data = do_discovery_then_fetch(source, entity_ids)
             else:
                 logger.debug(f"Using direct fetch for source: {source_name}")
                 data = fetch_direct(source)
@@ -50,15 +78,7 @@ def fetch_from_source(source: dict) -> Optional[list]:
                 f"Successfully fetched data from source: {source_name} (records: {len(data) if isinstance(data, list) else 'n/a'})"
             )
 
-        # associate source name with fetched data
-        if isinstance(data, list):
-            for record in data:
-                if isinstance(record, dict) and "repository" not in record:
-                    record["repository"] = source_name
-        elif isinstance(data, dict) and "repository" not in data:
-            data["repository"] = source_name
-
-        return data
+        return tag_repository(data, source_name)
     except Exception as e:
         logger.error(
             f"Failed to fetch data from source: {source_name}. Error: {e}",
@@ -87,30 +107,15 @@ def fetch_direct(source: dict) -> list:
     try:
         source_url = f"{source['api_base_url']}{source['endpoint']}"
         logger.debug(f"Request URL: {source_url}")
-        response = requests.get(source_url, timeout=REQUEST_TIMEOUT)
-        if not response.ok:
-            logger.error(
-                f"Direct fetch failed for source '{source_name}': {response.status_code} {response.reason}"
-            )
-            raise RuntimeError(
-                f"Fetch failed: {response.status_code} {response.reason}"
-            )
-        data = extract_response_data(source, response.json())
-        if (
-            isinstance(data, list)
-            and "filter_prefix" in source
-            and "match_key" in source
-        ):
-            filter_prefix = source["filter_prefix"]
-            match_key = source["match_key"]
-            logger.debug(
-                f"Filtering fetched data for prefix '{filter_prefix}' on key '{match_key}'"
-            )
-            data = [
-                item
-                for item in data
-                if item.get(match_key, "").startswith(filter_prefix)
-            ]
+        data, _ = request_data(
+            source,
+            "GET",
+            source_url,
+            f"Direct fetch for source '{source_name}'",
+            source.get("match_key"),
+            source.get("filter_prefix"),
+        )
+        data = filter_direct_data(source, data)
         record_count = len(data) if isinstance(data, list) else 1
         logger.info(f"Fetched {record_count} records from source: {source_name}")
         return data
@@ -136,79 +141,113 @@ def fetch_raw(source: dict) -> list:
     On request timeout, returns whatever data has been fetched so far (e.g., partial
     results in a paginated scenario).
 
+    If 'prefetch_pages' is set and the first response reports the total page count
+    via 'X-Wp-TotalPages', pages 2..N are fetched concurrently (bounded by
+    'max_concurrency') and appended in page order. Pages that time out are skipped.
+
     Args:
         source (dict): Config for external data source.
 
     Returns:
         list: Data fetched from the source (may be partial if timeout occurs).
 
+    Raises:
+        RuntimeError: If the request fails (non-timeout) or response is invalid.
+    """
+    all_data = []
+    for data in iter_raw_pages(source):
+        add_page_data(all_data, data)
+
+    logger.info(
+        f"Fetched {len(all_data)} records from source: {source.get('name', '')}"
+    )
+    return all_data
+
+
+def iter_raw_pages(source: dict) -> Iterator[Any]:
+    """Fetches the pages of a raw source one at a time, yielding the data of each
+    page as soon as it is available, so callers can process a source without
+    holding all of its pages in memory.
+
+    Pagination, prefetching and timeouts are handled as in fetch_raw: on request
+    timeout the iteration stops, and prefetched pages are yielded in page order
+    with at most 2 x 'max_concurrency' pages fetched ahead.
+
+    Args:
+        source (dict): Config for external data source.
+
+    Yields:
+        Any: Data extracted from each page, in page order.
+
     Raises:
         RuntimeError: If the request fails (non-timeout) or response is invalid.
     """
     source_name = source.get("name", "")
     logger.info(f"Starting raw fetch for source: {source_name}")
 
-    all_data = []
     page = 1
     max_pages = None
     source_url = None
+    record_count = 0
 
     try:
         source_url = f"{source['api_base_url']}{source['endpoint']}"
         while True:
             logger.debug(f"Request URL: {source_url}")
-            response = requests.get(source_url, timeout=REQUEST_TIMEOUT)
-            if not response.ok:
-                logger.error(
-                    f"Raw fetch failed for source '{source_name}': {response.status_code} {response.reason}"
-                )
-                raise RuntimeError(
-                    f"Raw fetch failed: {response.status_code} {response.reason}"
-                )
-            data = extract_response_data(source, response.json())
-
-            # add current page data
-            if isinstance(data, list):
-                all_data.extend(data)
-            else:
-                all_data.append(data)
+            data, headers = request_data(
+                source, "GET", source_url, f"Raw fetch for source '{source_name}'"
+            )
 
-            # check pagination info
-            link_header = response.headers.get("Link", "")
-            total_pages_header = response.headers.get("X-Wp-TotalPages", "")
+            # check pagination info before handing the page on
+            if max_pages is None:
+                max_pages = parse_total_pages(headers, source_name)
+            next_url = get_next_link(headers.get("Link", ""))
 
-            if total_pages_header and max_pages is None:
-                try:
-                    max_pages = int(total_pages_header)
-                except ValueError:
-                    logger.warning(
-                        f"Invalid X-Wp-TotalPages header value '{total_pages_header}' for source {source_name}; falling back to Link header parsing for pagination."
-                    )
+            # yield current page data
+            record_count += len(data) if isinstance(data, list) else 1
+            yield data
+            del data
 
             if max_pages and page >= max_pages:
                 break
 
-            next_url = get_next_link(link_header)
             if not next_url:
                 break
 
-            if page >= 1000:
+            # fetch all remaining pages at once when the page count is known
+            page_urls = (
+                build_prefetch_urls(source, next_url, max_pages) if page == 1 else []
+            )
+            if page_urls:
+                for page_data in iter_ordered(
+                    _fetch_raw_page,
+                    [(source, url) for url in page_urls],
+                    source.get("max_concurrency", 1),
+                ):
+                    # stop at the first timed out page, as the sequential path does
+                    if page_data is _TIMED_OUT:
+                        logger.warning(
+                            f"Prefetch timed out for source {source_name}; "
+                            f"returning {record_count} records fetched so far."
+                        )
+                        break
+                    record_count += len(page_data) if isinstance(page_data, list) else 1
+                    yield page_data
+                break
+
+            if page >= MAX_RAW_PAGES:
                 logger.warning(
-                    f"Aborting raw fetch for source {source_name} after 1000 pages (possible infinite loop)."
+                    f"Aborting raw fetch for source {source_name} after {MAX_RAW_PAGES} pages (possible infinite loop)."
                 )
                 break
 
             page += 1
             source_url = next_url
-
-        logger.info(f"Fetched {len(all_data)} records from source: {source_name}")
-        return all_data
     except requests.exceptions.Timeout as e:
         logger.warning(
             f"Request timed out for source {source_name} (url={source_url}); "
-            f"returning {len(all_data)} records fetched so far."
+            f"returning {record_count} records fetched so far."
         )
-        return all_data
     except requests.exceptions.RequestException as e:
         logger.error(f"RequestException for source {source_name}: {e}")
         raise RuntimeError(f"Request failed for source {source_name}: {e}") from e
@@ -219,68 +258,132 @@ def fetch_raw(source: dict) -> list:
         ) from e
 
 
-def do_discovery_then_fetch(source: dict) -> list:
+def add_page_data(all_data: list, data: Any) -> None:
+    """Appends one page of raw fetch data to the accumulated records.
+
+    Args:
+        all_data (list): Records accumulated so far; modified in place.
+        data (Any): Data extracted from a single page.
+
+    Returns:
+        None
+    """
+    if isinstance(data, list):
+        all_data.extend(data)
+    else:
+        all_data.append(data)
+
+
+def build_prefetch_urls(
+    source: dict, next_url: str, max_pages: Optional[int]
+) -> list[str]:
+    """Builds the URLs of pages 2..N for concurrent prefetching by rewriting the
+    page number query parameter of the 'next' link.
+
+    Args:
+        source (dict): Config for external data source. Prefetching is enabled by
+            'prefetch_pages'; 'page_param' names the page number query parameter
+            (default: 'page').
+        next_url (str): URL of page 2, taken from the first response's Link header.
+        max_pages (Optional[int]): Total page count from 'X-Wp-TotalPages'.
+
+    Returns:
+        list[str]: Page URLs in page order, or an empty list if prefetching is
+        disabled or the page URLs cannot be derived.
+    """
+    if not source.get("prefetch_pages") or not max_pages or max_pages < 2:
+        return []
+
+    page_param = source.get("page_param", "page")
+    parts = urlsplit(next_url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if page_param not in dict(query):
+        logger.warning(
+            f"Cannot prefetch pages for source {source.get('name', '')}: "
+            f"'{page_param}' not found in next link {next_url}; following Link headers instead."
+        )
+        return []
+
+    last_page = min(max_pages, MAX_RAW_PAGES)
+    return [
+        urlunsplit(
+            parts._replace(
+                query=urlencode(
+                    [(k, str(page) if k == page_param else v) for k, v in query]
+                )
+            )
+        )
+        for page in range(2, last_page + 1)
+    ]
+
+
+def _fetch_raw_page(source: dict, page_url: str) -> Any:
+    """Fetches a single prefetched page of a raw source.
+
+    Args:
+        source (dict): Config for external data source.
+        page_url (str): URL of the page.
+
+    Returns:
+        Any: Extracted page data, or _TIMED_OUT if the request timed out.
+
+    Raises:
+        RuntimeError: If the request fails with a non-OK status.
+    """
+    try:
+        logger.debug(f"Request URL: {page_url}")
+        data, _ = request_data(
+            source,
+            "GET",
+            page_url,
+            f"Raw fetch for source '{source.get('name', '')}'",
+        )
+        return data
+    except requests.exceptions.Timeout:
+        logger.warning(
+            f"Request timed out for source {source.get('name', '')} (url={page_url})."
+        )
+        return _TIMED_OUT
+
+
+def do_discovery_then_fetch(source: dict, entity_ids: Optional[list] = None) -> list:
     """Performs a two-step fetch process, where data from a 'discovery'
     endpoint is used to generate one or more follow-up fetch requests.
 
     Args:
         source (dict): Config for external data source.
+        entity_ids (Optional[list]): Known entity IDs. If given, only
+            discovered IDs matching one of them are fetched.
 
     Returns:
         list: Data fetched from the source.
     """
-    discovery = source["discovery"]
-    match_key = discovery["match_key"]
-    filter_prefix = discovery["filter_prefix"]
-    api_base_url = source["api_base_url"]
-    discovery_url = f"{api_base_url}{discovery['endpoint']}"
+    discovery_url = f"{source['api_base_url']}{source['discovery']['endpoint']}"
 
     try:
         logger.debug(f"Starting fetch from discovery URL: {discovery_url}")
-        discovery_res = requests.get(discovery_url, timeout=REQUEST_TIMEOUT)
-        if not discovery_res.ok:
-            logger.error(
-                f"Discovery fetch failed for source '{source['name']}': {discovery_res.status_code} {discovery_res.reason}"
-            )
-            raise RuntimeError(
-                f"Fetch failed: {discovery_res.status_code} {discovery_res.reason}"
-            )
-        discovery_data = extract_response_data(source, discovery_res.json())
-        logger.debug(
-            f"Filtering fetched data for prefix '{filter_prefix}' on key '{match_key}'"
+        discovery_data, _ = request_data(
+            source,
+            "GET",
+            discovery_url,
+            f"Discovery fetch for source '{source['name']}'",
+            source["discovery"]["match_key"],
+            source["discovery"]["filter_prefix"],
+        )
+        filtered_discovery_data = filter_discovery_matches(
+            source, discovery_data, entity_ids
         )
-        filtered_discovery_data = [
-            item[match_key]
-            for item in discovery_data
-            if item[match_key].startswith(filter_prefix)
+        max_concurrency = source.get("max_concurrency", 1)
+        logger.debug(f"Starting fetch phase (max concurrency: {max_concurrency})...")
+        fetch_args = [
+            (source, match, build_fetch_url(source, match))
+            for match in filtered_discovery_data
+        ]
+        fetch_data = [
+            data
+            for data in map_ordered(_fetch_discovery_batch, fetch_args, max_concurrency)
+            if data is not _TIMED_OUT
         ]
-        logger.debug("Starting fetch phase...")
-        fetch_data = []
-        for match in filtered_discovery_data:
-            try:
-                param = source["fetch"]["key_param"]
-                endpoint = source["fetch"]["endpoint_template"].format(**{param: match})
-                fetch_url = f"{api_base_url}{endpoint}"
-            except KeyError as e:
-                logger.error(f"Missing key in 'endpoint_template': {e}")
-                raise ValueError(f"Missing key in 'endpoint_template': {e}")
-            try:
-                res = requests.get(fetch_url, timeout=REQUEST_TIMEOUT)
-                if not res.ok:
-                    logger.error(
-                        f"Fetch phase failed for {fetch_url}: {res.status_code} {res.reason}"
-                    )
-                    raise RuntimeError(f"Fetch failed: {res.status_code} {res.reason}")
-                data = extract_response_data(source, res.json())
-                logger.debug(
-                    f"Successfully fetched data for match '{match}' from URL: {fetch_url}"
-                )
-                fetch_data.append(data)
-            except requests.exceptions.Timeout as e:
-                logger.warning(
-                    f"Request timed out for source {source['name']} (url={fetch_url})"
-                )
-                continue
         logger.info(
             f"Fetched {len(fetch_data)} batches of data from source: {source['name']}"
         )
@@ -300,6 +403,253 @@ def do_discovery_then_fetch(source: dict) -> list:
         ) from e
 
 
+def filter_direct_data(source: dict, data: Union[list, dict]) -> Union[list, dict]:
+    """Keeps only records whose 'match_key' value starts with the source's
+    'filter_prefix', when both are configured.
+
+    Args:
+        source (dict): Config for external data source.
+        data (Union[list, dict]): Data extracted from a direct fetch response.
+
+    Returns:
+        Union[list, dict]: Filtered records, or data unchanged if no filter applies.
+    """
+    if not (
+        isinstance(data, list) and "filter_prefix" in source and "match_key" in source
+    ):
+        return data
+
+    filter_prefix = source["filter_prefix"]
+    match_key = source["match_key"]
+    logger.debug(
+        f"Filtering fetched data for prefix '{filter_prefix}' on key '{match_key}'"
+    )
+    return [item for item in data if item.get(match_key, "").startswith(filter_prefix)]
+
+
+def filter_discovery_matches(
+    source: dict, discovery_data: list, entity_ids: Optional[list] = None
+) -> list:
+    """Extracts the discovered IDs that start with the discovery 'filter_prefix'
+    and, if entity IDs are given, are matched by at least one of them under the
+    source's 'match_strategy' (fuzzy matching by default).
+
+    Args:
+        source (dict): Config for external data source.
+        discovery_data (list): Records extracted from the discovery response.
+        entity_ids (Optional[list]): Known entity IDs, for targeted discovery.
+
+    Returns:
+        list: Matching IDs, in discovery order.
+    """
+    match_key = source["discovery"]["match_key"]
+    filter_prefix = source["discovery"]["filter_prefix"]
+    logger.debug(
+        f"Filtering fetched data for prefix '{filter_prefix}' on key '{match_key}'"
+    )
+    matches = [
+        item[match_key]
+        for item in discovery_data
+        if item[match_key].startswith(filter_prefix)
+    ]
+    if entity_ids is None:
+        return matches
+
+    # same matching the mapper applies later, so no mappable ID is dropped
+    matched = set()
+    for positions in MatchStrategy.from_config(source.get("match_strategy")).match(
+        entity_ids, matches, source.get("match_workers", 1)
+    ):
+        matched.update(positions)
+    targeted = [match for position, match in enumerate(matches) if position in matched]
+    logger.info(
+        f"Targeted discovery for source '{source.get('name', '')}': "
+        f"{len(targeted)} of {len(matches)} discovered IDs match a known entity"
+    )
+    return targeted
+
+
+def is_targeted_discovery(source: dict) -> bool:
+    """Checks whether a source narrows its discovery matches to known entities.
+
+    Args:
+        source (dict): Config for external data source.
+
+    Returns:
+        bool: True for 'rest' sources with 'discovery.targeted' enabled.
+    """
+    return source.get("type", "").lower() == "rest" and bool(
+        source.get("discovery", {}).get("targeted")
+    )
+
+
+def get_deferred_sources(sources: list, entity_source_name: Optional[str]) -> list:
+    """Finds the targeted discovery sources that must wait for the entity source.
+
+    Args:
+        sources (list): List of source config dicts.
+        entity_source_name (Optional[str]): Name of the entity source.
+
+    Returns:
+        list: Targeted discovery sources, or an empty list if the entity
+        source is not among the sources.
+    """
+    if entity_source_name not in {source.get("name") for source in sources}:
+        return []
+    return [
+        source
+        for source in sources
+        if source.get("name") != entity_source_name and is_targeted_discovery(source)
+    ]
+
+
+def get_entity_ids(source: dict, entities: Optional[list]) -> list:
+    """Extracts the IDs a source's data is matched against from the entities.
+
+    Args:
+        source (dict): Config for external data source.
+        entities (Optional[list]): Entities fetched from the entity source.
+
+    Returns:
+        list: Non-empty values of the source's 'entity_id_key'.
+    """
+    entity_id_key = source["entity_id_key"]
+    return [
+        entity[entity_id_key]
+        for entity in entities or []
+        if isinstance(entity, dict) and entity.get(entity_id_key)
+    ]
+
+
+def build_fetch_url(source: dict, match: str) -> str:
+    """Builds the fetch phase URL for a single discovered match.
+
+    Args:
+        source (dict): Config for external data source.
+        match (str): Discovered ID substituted into 'endpoint_template'.
+
+    Returns:
+        str: Full fetch URL for the match.
+
+    Raises:
+        ValueError: If 'endpoint_template' references an unknown key.
+    """
+    try:
+        param = source["fetch"]["key_param"]
+        endpoint = source["fetch"]["endpoint_template"].format(**{param: match})
+    except KeyError as e:
+        logger.error(f"Missing key in 'endpoint_template': {e}")
+        raise ValueError(f"Missing key in 'endpoint_template': {e}")
+    return f"{source['api_base_url']}{endpoint}"
+
+
+def get_fetch_endpoint(source: dict) -> str:
+    """Builds the fetch metrics endpoint label shared by all fetch phase requests
+    of a discovery source.
+
+    Args:
+        source (dict): Config for external data source.
+
+    Returns:
+        str: Base URL joined with the unformatted 'endpoint_template'.
+    """
+    return f"{source['api_base_url']}{source['fetch']['endpoint_template']}"
+
+
+def _fetch_discovery_batch(source: dict, match: str, fetch_url: str) -> Any:
+    """Fetches the data batch for a single discovered match.
+
+    Args:
+        source (dict): Config for external data source.
+        match (str): Discovered ID the batch is fetched for.
+        fetch_url (str): Fetch phase URL for the match.
+
+    Returns:
+        Any: Extracted batch data, or _TIMED_OUT if the request timed out.
+
+    Raises:
+        RuntimeError: If the request fails with a non-OK status.
+    """
+    try:
+        data, _ = request_data(
+            source,
+            "GET",
+            fetch_url,
+            f"Fetch phase for {fetch_url}",
+            endpoint=get_fetch_endpoint(source),
+        )
+        logger.debug(
+            f"Successfully fetched data for match '{match}' from URL: {fetch_url}"
+        )
+        return data
+    except requests.exceptions.Timeout:
+        logger.warning(
+            f"Request timed out for source {source['name']} (url={fetch_url})"
+        )
+        return _TIMED_OUT
+
+
+def map_ordered(
+    fn: Callable[..., Any], arg_tuples: list[tuple], max_concurrency: int = 1
+) -> list:
+    """Calls a function for each argument tuple, using up to max_concurrency
+    threads, and returns the results in input order.
+
+    The first exception raised (in input order) is propagated and any calls
+    that have not started yet are cancelled.
+
+    Args:
+        fn (Callable[..., Any]): Function to call.
+        arg_tuples (list[tuple]): Positional arguments for each call.
+        max_concurrency (int): Max number of calls in flight at once.
+
+    Returns:
+        list: Results of each call, in the order of arg_tuples.
+    """
+    if max_concurrency <= 1 or len(arg_tuples) <= 1:
+        return [fn(*args) for args in arg_tuples]
+
+    executor = ThreadPoolExecutor(max_workers=min(max_concurrency, len(arg_tuples)))
+    try:
+        return list(executor.map(lambda args: fn(*args), arg_tuples))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_ordered(
+    fn: Callable[..., Any], arg_tuples: list[tuple], max_concurrency: int = 1
+) -> Iterator[Any]:
+    """Like map_ordered, but yields each result in input order as soon as it and
+    all earlier results are available. At most 2 x max_concurrency calls are
+    started ahead of the result last yielded, which bounds the results held in
+    memory.
+
+    Args:
+        fn (Callable[..., Any]): Function to call.
+        arg_tuples (list[tuple]): Positional arguments for each call.
+        max_concurrency (int): Max number of calls in flight at once.
+
+    Yields:
+        Any: Result of each call, in the order of arg_tuples.
+    """
+    if max_concurrency <= 1 or len(arg_tuples) <= 1:
+        for args in arg_tuples:
+            yield fn(*args)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(max_concurrency, len(arg_tuples)))
+    pending = deque()
+    try:
+        for args in arg_tuples:
+            if len(pending) >= 2 * max_concurrency:
+                yield pending.popleft().result()
+            pending.append(executor.submit(fn, *args))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 def fetch_graphql(source: dict) -> list:
     """Performs data fetch from a GraphQL endpoint via a POST request.
 
@@ -317,19 +667,15 @@ def fetch_graphql(source: dict) -> list:
     try:
         source_url = f"{source['api_base_url']}{source['endpoint']}"
         logger.debug(f"GraphQL fetch URL: {source_url}")
-        response = requests.post(
-            url=source_url, json={"query": source["query"]}, timeout=REQUEST_TIMEOUT
+        data, _ = request_data(
+            source,
+            "POST",
+            source_url,
+            f"GraphQL fetch for source '{source['name']}'",
+            json={"query": source["query"]},
         )
-        if not response.ok:
-            logger.error(
-                f"GraphQL fetch failed for {source_url}: {response.status_code} {response.reason}"
-            )
-            raise RuntimeError(
-                f"GraphQL fetch failed: {response.status_code} {response.reason}"
-            )
-        data = response.json()
         logger.info(f"GraphQL fetch successful for source: {source['name']}")
-        return extract_response_data(source, data)
+        return data
     except requests.exceptions.Timeout as e:
         logger.warning(
             f"Request timed out for source {source['name']} (url={source_url})"
@@ -345,6 +691,396 @@ def fetch_graphql(source: dict) -> list:
         ) from e
 
 
+def request_data(
+    source: dict,
+    method: str,
+    url: str,
+    action: str,
+    match_key: Optional[str] = None,
+    filter_prefix: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    **kwargs,
+) -> tuple[Union[list, dict], Any]:
+    """Sends a request and reads the relevant data from the response.
+
+    Timeouts, connection errors and 429/5xx responses are retried according to
+    the source's retry policy. If the source has 'cache' enabled, the request is
+    revalidated against the HTTP cache with If-None-Match/If-Modified-Since, a
+    304 response is served from the cache, and a new response with an ETag or
+    Last-Modified header is stored in the cache.
+
+    Timings, sizes and the record count of the request are recorded in
+    fetch_metrics, whether or not it succeeds.
+
+    While request_dedup is active (in batch runs), an identical request made by
+    another source or project is shared instead of being sent again.
+
+    Args:
+        source (dict): Config for external data source.
+        method (str): HTTP method.
+        url (str): Request URL.
+        action (str): Description of the request, used for logging.
+        match_key (Optional[str]): Record key checked against filter_prefix
+            (streaming only).
+        filter_prefix (Optional[str]): Prefix a kept record's match_key value
+            must start with (streaming only).
+        endpoint (Optional[str]): Endpoint label for fetch metrics; defaults to
+            the URL without its query string.
+        kwargs: Additional arguments passed to send_request.
+
+    Returns:
+        tuple[Union[list, dict], Any]: Extracted data and the response headers.
+
+    Raises:
+        RuntimeError: If the response status is not OK.
+        ValueError: If the response body is not valid JSON.
+    """
+    timer = RequestTimer(source.get("name", ""), url, endpoint)
+    data = None
+    try:
+        with timer.activate():
+            data, headers = request_dedup.call(
+                get_request_key(source, method, url, match_key, filter_prefix, kwargs),
+                lambda: _request_data(
+                    source, method, url, action, match_key, filter_prefix, **kwargs
+                ),
+            )
+        return data, headers
+    finally:
+        timer.finish(data)
+
+
+def _request_data(
+    source: dict,
+    method: str,
+    url: str,
+    action: str,
+    match_key: Optional[str] = None,
+    filter_prefix: Optional[str] = None,
+    **kwargs,
+) -> tuple[Union[list, dict], Any]:
+    """Sends a request and reads the relevant data from the response, using the
+    HTTP cache if enabled. See request_data.
+
+    Args:
+        source (dict): Config for external data source.
+        method (str): HTTP method.
+        url (str): Request URL.
+        action (str): Description of the request, used for logging.
+        match_key (Optional[str]): Record key checked against filter_prefix
+            (streaming only).
+        filter_prefix (Optional[str]): Prefix a kept record's match_key value
+            must start with (streaming only).
+        kwargs: Additional arguments passed to send_request.
+
+    Returns:
+        tuple[Union[list, dict], Any]: Extracted data and the response headers.
+    """
+    cache = get_http_cache(source)
+    if cache is None:
+        response = send_with_retries(source, method, url, **kwargs)
+        data = read_ok_response(source, response, action, match_key, filter_prefix)
+        return data, response.headers
+
+    key = cache.make_key(method, url, kwargs.get("json"))
+    signature = get_cache_signature(source, match_key, filter_prefix)
+    entry = cache.get_entry(key)
+    headers = kwargs.get("headers", {})
+    if entry:
+        kwargs["headers"] = {**headers, **cache.conditional_headers(entry)}
+
+    response = send_with_retries(source, method, url, **kwargs)
+    if entry and response.status_code == 304:
+        response.close()
+        try:
+            with time_decode(get_active_timer()):
+                data = load_cached_data(
+                    cache, key, signature, source, match_key, filter_prefix
+                )
+        except OSError:
+            # evicted by another request since the conditional request was sent
+            logger.info(f"Cached response for {url} was evicted, requesting it again")
+            kwargs["headers"] = headers
+            response = send_with_retries(source, method, url, **kwargs)
+        else:
+            logger.debug(f"Serving cached response for {url} (not modified)")
+            return data, CaseInsensitiveDict(entry["headers"])
+
+    if not cache.has_validators(response.headers):
+        data = read_ok_response(source, response, action, match_key, filter_prefix)
+        return data, response.headers
+
+    writer = cache.open_writer(key)
+    try:
+        data = read_ok_response(
+            source, response, action, match_key, filter_prefix, sink=writer.write
+        )
+    except BaseException:
+        writer.discard()
+        raise
+    writer.commit(url, response.headers, signature, data)
+    return data, response.headers
+
+
+def read_ok_response(
+    source: dict,
+    response: requests.Response,
+    action: str,
+    match_key: Optional[str] = None,
+    filter_prefix: Optional[str] = None,
+    sink: Optional[Callable[[bytes], None]] = None,
+) -> Union[list, dict]:
+    """Checks the response status and reads the relevant data from the
+    response, then closes it. Streamed responses are otherwise left unread on
+    an error status or a parse error, holding their pooled connection.
+
+    Args:
+        source (dict): Config for external data source.
+        response (requests.Response): Response to read.
+        action (str): Description of the request, used for logging.
+        match_key (Optional[str]): Record key checked against filter_prefix
+            (streaming only).
+        filter_prefix (Optional[str]): Prefix a kept record's match_key value
+            must start with (streaming only).
+        sink (Optional[Callable[[bytes], None]]): Called with the raw body (see
+            read_response_data).
+
+    Returns:
+        Union[list, dict]: Portion of response containing relevant data.
+
+    Raises:
+        RuntimeError: If the response status is not OK.
+        ValueError: If the response body is not valid JSON.
+    """
+    try:
+        raise_for_status(response, action)
+        return read_response_data(source, response, match_key, filter_prefix, sink)
+    finally:
+        response.close()
+
+
+def send_with_retries(
+    source: dict, method: str, url: str, **kwargs
+) -> requests.Response:
+    """Sends a request, retrying timeouts, connection errors and retryable
+    response statuses (429/5xx) according to the source's retry policy. Every
+    attempt first waits for the host's rate limiter, if any.
+
+    Args:
+        source (dict): Config for external data source.
+        method (str): HTTP method.
+        url (str): Request URL.
+        kwargs: Additional arguments passed to send_request.
+
+    Returns:
+        requests.Response: The first response that is not retried.
+
+    Raises:
+        requests.exceptions.RequestException: If the last attempt fails.
+    """
+    limiter = rate_limiters.get_limiter(source, url)
+    timer = get_active_timer()
+
+    def attempt() -> requests.Response:
+        if limiter is not None:
+            limiter.acquire()
+        if timer is not None:
+            timer.attempts += 1
+        return send_request(source, method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+
+    response = call_with_retries(source, url, attempt, RETRY_ERRORS)
+    if timer is not None and isinstance(response.elapsed, timedelta):
+        timer.ttfb = response.elapsed.total_seconds()
+    return response
+
+
+def raise_for_status(response: Any, action: str) -> None:
+    """Raises if the response has an error status.
+
+    Args:
+        response (Any): Response to check.
+        action (str): Description of the request, used for logging.
+
+    Raises:
+        RuntimeError: If the response status is not OK.
+    """
+    if not response.ok:
+        logger.error(f"{action} failed: {response.status_code} {response.reason}")
+        raise RuntimeError(f"Fetch failed: {response.status_code} {response.reason}")
+
+
+def get_request_key(
+    source: dict,
+    method: str,
+    url: str,
+    match_key: Optional[str],
+    filter_prefix: Optional[str],
+    request_kwargs: dict,
+) -> str:
+    """Builds the request_dedup key of a request, covering the request itself and
+    the settings that shape the data extracted from its response.
+
+    Args:
+        source (dict): Config for external data source.
+        method (str): HTTP method.
+        url (str): Request URL.
+        match_key (Optional[str]): Record key checked against filter_prefix.
+        filter_prefix (Optional[str]): Prefix a kept record's match_key value
+            must start with.
+        request_kwargs (dict): Additional arguments passed to the HTTP client.
+
+    Returns:
+        str: Key identifying the request and its extracted data.
+    """
+    key = HttpCache.make_key(method, url, request_kwargs)
+    return f"{key}:{get_cache_signature(source, match_key, filter_prefix)}"
+
+
+def get_cache_signature(
+    source: dict, match_key: Optional[str] = None, filter_prefix: Optional[str] = None
+) -> str:
+    """Builds the signature of the settings that shape the data extracted from a
+    cached response body.
+
+    Args:
+        source (dict): Config for external data source.
+        match_key (Optional[str]): Record key checked against filter_prefix.
+        filter_prefix (Optional[str]): Prefix a kept record's match_key value
+            must start with.
+
+    Returns:
+        str: Extraction signature for HttpCache.
+    """
+    if not source.get("stream_response"):
+        match_key = filter_prefix = None
+    return HttpCache.make_signature(
+        source.get("response_data_key"), match_key, filter_prefix
+    )
+
+
+def load_cached_data(
+    cache: HttpCache,
+    key: str,
+    signature: str,
+    source: dict,
+    match_key: Optional[str] = None,
+    filter_prefix: Optional[str] = None,
+) -> Union[list, dict]:
+    """Loads the data of a cached response, re-extracting it from the cached body
+    only if the stored data was extracted with different settings.
+
+    Args:
+        cache (HttpCache): HTTP cache holding the response.
+        key (str): Cache key of the response.
+        signature (str): Extraction signature from get_cache_signature.
+        source (dict): Config for external data source.
+        match_key (Optional[str]): Record key checked against filter_prefix
+            (streaming only).
+        filter_prefix (Optional[str]): Prefix a kept record's match_key value
+            must start with (streaming only).
+
+    Returns:
+        Union[list, dict]: Portion of the cached response containing relevant data.
+
+    Raises:
+        ValueError: If the cached body is not valid JSON.
+    """
+    data = cache.load_data(key, signature)
+    if data is not MISSING:
+        return data
+
+    body = cache.load_body(key)
+    extractor = make_stream_extractor(source, match_key, filter_prefix)
+    if extractor is None:
+        data = extract_response_data(source, json.loads(body))
+    else:
+        extractor.feed(body)
+        data = extractor.close()
+    cache.save_data(key, signature, data)
+    return data
+
+
+def make_stream_extractor(
+    source: dict, match_key: Optional[str] = None, filter_prefix: Optional[str] = None
+) -> Optional[ResponseStreamExtractor]:
+    """Creates a streaming extractor for a response if the source has
+    'stream_response' enabled.
+
+    Args:
+        source (dict): Config for external data source.
+        match_key (Optional[str]): Record key checked against filter_prefix.
+        filter_prefix (Optional[str]): Prefix a kept record's match_key value
+            must start with.
+
+    Returns:
+        Optional[ResponseStreamExtractor]: Extractor for the source's
+        'response_data_key', or None if streaming is disabled.
+    """
+    if not source.get("stream_response"):
+        return None
+    return ResponseStreamExtractor(
+        source.get("response_data_key"), match_key, filter_prefix
+    )
+
+
+def read_response_data(
+    source: dict,
+    response: requests.Response,
+    match_key: Optional[str] = None,
+    filter_prefix: Optional[str] = None,
+    sink: Optional[Callable[[bytes], None]] = None,
+) -> Union[list, dict]:
+    """Reads the relevant data from a response body.
+
+    By default the whole body is decoded and passed to extract_response_data.
+    With 'stream_response' enabled, the body is parsed incrementally and only
+    the data under 'response_data_key' is built; list records whose match_key
+    value does not start with filter_prefix are skipped while streaming.
+
+    Args:
+        source (dict): Config for external data source.
+        response (requests.Response): Response to read.
+        match_key (Optional[str]): Record key checked against filter_prefix
+            (streaming only).
+        filter_prefix (Optional[str]): Prefix a kept record's match_key value
+            must start with (streaming only).
+        sink (Optional[Callable[[bytes], None]]): Called with the raw body, chunk
+            by chunk when streaming (e.g. to store it in the HTTP cache).
+
+    Returns:
+        Union[list, dict]: Portion of response containing relevant data.
+
+    Raises:
+        ValueError: If the response body is not valid JSON.
+    """
+    extractor = make_stream_extractor(source, match_key, filter_prefix)
+    timer = get_active_timer()
+    if extractor is None:
+        content = response.content
+        if sink is not None:
+            sink(content)
+        with time_decode(timer):
+            data = extract_response_data(source, response.json())
+        decoded_bytes = len(content) if isinstance(content, bytes) else 0
+    else:
+        decoded_bytes = 0
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            decoded_bytes += len(chunk)
+            if sink is not None:
+                sink(chunk)
+            with time_decode(timer):
+                extractor.feed(chunk)
+        with time_decode(timer):
+            data = extractor.close()
+
+    if timer is not None:
+        wire_bytes = response.raw.tell() if response.raw is not None else None
+        timer.add_response(
+            decoded_bytes, wire_bytes if isinstance(wire_bytes, int) else None
+        )
+    return data
+
+
 def extract_response_data(source: dict, response_json: dict) -> Union[list, dict]:
     """Extracts relevant data from the full JSON response using the 'response_data_key'
     provided in source config.
@@ -366,6 +1102,47 @@ def extract_response_data(source: dict, response_json: dict) -> Union[list, dict
     return response_json
 
 
+def tag_repository(data: Any, source_name: str) -> Any:
+    """Associates the source name with fetched records that lack a 'repository'.
+
+    Args:
+        data (Any): Data fetched from the source.
+        source_name (str): Name of the source the data was fetched from.
+
+    Returns:
+        Any: The same data, with 'repository' set on dict records.
+    """
+    if isinstance(data, list):
+        for record in data:
+            if isinstance(record, dict) and "repository" not in record:
+                record["repository"] = source_name
+    elif isinstance(data, dict) and "repository" not in data:
+        data["repository"] = source_name
+    return data
+
+
+def parse_total_pages(headers: Any, source_name: str) -> Optional[int]:
+    """Reads the total page count from the 'X-Wp-TotalPages' response header.
+
+    Args:
+        headers (Any): Response headers (case-insensitive mapping).
+        source_name (str): Name of the source, used for logging.
+
+    Returns:
+        Optional[int]: Total number of pages, or None if missing or invalid.
+    """
+    total_pages_header = headers.get("X-Wp-TotalPages", "")
+    if not total_pages_header:
+        return None
+    try:
+        return int(total_pages_header)
+    except ValueError:
+        logger.warning(
+            f"Invalid X-Wp-TotalPages header value '{total_pages_header}' for source {source_name}; falling back to Link header parsing for pagination."
+        )
+        return None
+
+
 def get_next_link(link_header: str) -> Optional[str]:
     """Parses the 'Link' HTTP header to extract the URL for the 'next' page.
 
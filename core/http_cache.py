@@ -0,0 +1,491 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_DIR = ".cache/http"
+DEFAULT_MAX_SIZE_MB = 256
+
+# response headers kept with a cache entry so a 304 can still drive pagination
+CACHED_HEADERS = ("ETag", "Last-Modified", "Link", "X-Wp-TotalPages")
+
+# returned by HttpCache.load_data when no pre-extracted data matches
+MISSING = object()
+
+
+class HttpCache:
+    """
+    On-disk cache of response bodies and their validators (ETag/Last-Modified),
+    with least-recently-used eviction under a total size cap.
+
+    Each entry also keeps the data extracted from the body, so a 304 response
+    can be served without re-parsing the body.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+    ):
+        """
+        Initialize HttpCache and load its index.
+
+        Args:
+            cache_dir (str): Directory holding cached entries.
+            max_size_mb (float): Max total size of cached entries, in MB.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        # whether access times changed since the index was last written
+        self._dirty = False
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index = self._read_index()
+
+    @staticmethod
+    def make_key(method: str, url: str, payload: Any = None) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            payload (Any): JSON request body, if any.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        raw = json.dumps([method.upper(), url, payload], sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @staticmethod
+    def make_signature(*extraction_params: Any) -> str:
+        """
+        Build the signature of the settings used to extract data from a body.
+
+        Args:
+            extraction_params (Any): Settings that affect extracted data (e.g.
+                response_data_key, match_key, filter_prefix).
+
+        Returns:
+            str: Signature stored with pre-extracted data.
+        """
+        return json.dumps(list(extraction_params))
+
+    def get_entry(self, key: str) -> Optional[dict]:
+        """
+        Look up the metadata of a cached entry.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Optional[dict]: Entry metadata ('url', 'headers', 'signature', 'size'),
+            or None if not cached.
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry and not os.path.exists(self._path(key, "body")):
+                del self._index[key]
+                entry = None
+            return dict(entry) if entry else None
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        """
+        Build conditional request headers from an entry's validators.
+
+        Args:
+            entry (dict): Entry metadata.
+
+        Returns:
+            dict: 'If-None-Match' and/or 'If-Modified-Since' headers.
+        """
+        headers = {}
+        cached_headers = entry.get("headers", {})
+        if cached_headers.get("ETag"):
+            headers["If-None-Match"] = cached_headers["ETag"]
+        if cached_headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+        return headers
+
+    @staticmethod
+    def has_validators(headers: Any) -> bool:
+        """
+        Check whether a response can be revalidated later.
+
+        Args:
+            headers (Any): Response headers.
+
+        Returns:
+            bool: True if the response has an ETag or Last-Modified header.
+        """
+        return bool(headers.get("ETag") or headers.get("Last-Modified"))
+
+    def load_data(self, key: str, signature: str) -> Any:
+        """
+        Load the pre-extracted data of an entry and mark it recently used.
+
+        Args:
+            key (str): Cache key.
+            signature (str): Extraction signature the data must match.
+
+        Returns:
+            Any: Extracted data, or MISSING if none matches the signature.
+        """
+        self._touch(key)
+        entry = self.get_entry(key)
+        if not entry or entry.get("signature") != signature:
+            return MISSING
+        try:
+            with open(self._path(key, "data"), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return MISSING
+
+    def load_body(self, key: str) -> bytes:
+        """
+        Load the response body of an entry and mark it recently used.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            bytes: Cached response body.
+        """
+        self._touch(key)
+        with open(self._path(key, "body"), "rb") as file:
+            return file.read()
+
+    def save_data(self, key: str, signature: str, data: Any) -> None:
+        """
+        Replace the pre-extracted data of an existing entry.
+
+        Args:
+            key (str): Cache key.
+            signature (str): Extraction signature of the data.
+            data (Any): Data extracted from the cached body.
+
+        Returns:
+            None
+        """
+        try:
+            data_path, data_size = self._write_data(data)
+        except ValueError as e:
+            logger.debug(f"Not caching extracted data for {key}: {e}")
+            return
+        with self._lock:
+            entry = self._index.get(key)
+            if not entry:
+                os.remove(data_path)
+                return
+            os.replace(data_path, self._path(key, "data"))
+            entry["size"] = entry["body_size"] + data_size
+            entry["signature"] = signature
+            self._write_index()
+
+    def open_writer(self, key: str) -> "CacheWriter":
+        """
+        Start writing a new response body for an entry.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            CacheWriter: Writer the response body is streamed to.
+        """
+        return CacheWriter(self, key)
+
+    def commit(
+        self,
+        key: str,
+        body_path: str,
+        url: str,
+        headers: Any,
+        signature: str,
+        data: Any,
+    ) -> None:
+        """
+        Store a fully-written response body with its validators and extracted
+        data, then evict least-recently-used entries over the size cap.
+
+        Args:
+            key (str): Cache key.
+            body_path (str): Path of the temporary file holding the body.
+            url (str): Request URL.
+            headers (Any): Response headers.
+            signature (str): Extraction signature of the data.
+            data (Any): Data extracted from the body.
+
+        Returns:
+            None
+        """
+        body_size = os.path.getsize(body_path)
+        try:
+            data_path, data_size = self._write_data(data)
+        except ValueError as e:
+            logger.debug(f"Not caching extracted data for {url}: {e}")
+            data_path, data_size = None, 0
+            signature = None
+
+        with self._lock:
+            # body and data are swapped in together so they match the index entry
+            os.replace(body_path, self._path(key, "body"))
+            if data_path:
+                os.replace(data_path, self._path(key, "data"))
+            else:
+                try:
+                    os.remove(self._path(key, "data"))
+                except FileNotFoundError:
+                    pass
+            # index order is recency order; it breaks last_access ties on eviction
+            self._index.pop(key, None)
+            self._index[key] = {
+                "url": url,
+                "headers": {
+                    name: headers[name] for name in CACHED_HEADERS if headers.get(name)
+                },
+                "signature": signature,
+                "body_size": body_size,
+                "size": body_size + data_size,
+                "last_access": time.time(),
+            }
+            self._evict()
+            self._write_index()
+        logger.debug(f"Cached response for {url} ({body_size} bytes)")
+
+    def flush(self) -> None:
+        """
+        Persist the access times recorded since the index was last written.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._dirty:
+                self._write_index()
+
+    def _touch(self, key: str) -> None:
+        """
+        Mark an entry as recently used. The access time is only kept in memory
+        until the index is next written (on commit or flush).
+
+        Args:
+            key (str): Cache key.
+        """
+        with self._lock:
+            if key in self._index:
+                self._index[key] = self._index.pop(key)
+                self._index[key]["last_access"] = time.time()
+                self._dirty = True
+
+    def _evict(self) -> None:
+        """
+        Remove least-recently-used entries until the cache fits its size cap.
+        Must be called with the lock held.
+        """
+        total = sum(entry["size"] for entry in self._index.values())
+        for key, entry in sorted(
+            self._index.items(), key=lambda item: item[1]["last_access"]
+        ):
+            if total <= self.max_bytes:
+                break
+            logger.debug(f"Evicting cached response for {entry['url']}")
+            for kind in ("body", "data"):
+                try:
+                    os.remove(self._path(key, kind))
+                except FileNotFoundError:
+                    pass
+            total -= entry["size"]
+            del self._index[key]
+
+    def _write_data(self, data: Any) -> tuple:
+        """
+        Write pre-extracted data to a temporary file, to be moved into place
+        with os.replace while the lock is held.
+
+        Args:
+            data (Any): JSON-compatible data.
+
+        Returns:
+            tuple: Path of the temporary file and its size, in bytes.
+
+        Raises:
+            ValueError: If the data cannot be serialized.
+        """
+        try:
+            payload = json.dumps(data).encode()
+        except TypeError as e:
+            raise ValueError(str(e)) from e
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(payload)
+        return tmp_path, len(payload)
+
+    def _read_index(self) -> dict:
+        """
+        Load the cache index from disk.
+
+        Returns:
+            dict: Mapping of cache key to entry metadata.
+        """
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable HTTP cache index: {e}")
+            return {}
+
+    def _write_index(self) -> None:
+        """
+        Atomically persist the cache index. Must be called with the lock held.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            json.dump(self._index, file)
+        os.replace(tmp_path, os.path.join(self.cache_dir, self.INDEX_FILE))
+        self._dirty = False
+
+    def _path(self, key: str, kind: str) -> str:
+        """
+        Build the path of an entry file.
+
+        Args:
+            key (str): Cache key.
+            kind (str): 'body' or 'data'.
+
+        Returns:
+            str: Path of the entry file.
+        """
+        return os.path.join(self.cache_dir, f"{key}.{kind}")
+
+
+class CacheWriter:
+    """
+    Collects a response body in a temporary file until it is committed to the
+    cache.
+    """
+
+    def __init__(self, cache: HttpCache, key: str):
+        """
+        Initialize CacheWriter.
+
+        Args:
+            cache (HttpCache): Cache the body will be committed to.
+            key (str): Cache key.
+        """
+        self.cache = cache
+        self.key = key
+        fd, self.path = tempfile.mkstemp(dir=cache.cache_dir, suffix=".tmp")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Append a chunk of the response body.
+
+        Args:
+            chunk (bytes): Body chunk.
+        """
+        self._file.write(chunk)
+
+    def reset(self) -> None:
+        """
+        Drop the body written so far, e.g. before a request is retried.
+        """
+        self._file.seek(0)
+        self._file.truncate()
+
+    def commit(self, url: str, headers: Any, signature: str, data: Any) -> None:
+        """
+        Store the written body with its validators and extracted data.
+
+        Args:
+            url (str): Request URL.
+            headers (Any): Response headers.
+            signature (str): Extraction signature of the data.
+            data (Any): Data extracted from the body.
+        """
+        self._file.close()
+        self.cache.commit(self.key, self.path, url, headers, signature, data)
+
+    def discard(self) -> None:
+        """
+        Drop the partially-written body.
+        """
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+http_cache = None
+
+
+def configure_http_cache(settings: Optional[dict]) -> Optional[HttpCache]:
+    """
+    Configure the shared HTTP cache from the top-level 'http_cache' config block.
+    The cache is reused while its settings are unchanged.
+
+    Args:
+        settings (Optional[dict]): 'http_cache' config block ('dir',
+            'max_size_mb'), or None to keep the default settings.
+
+    Returns:
+        Optional[HttpCache]: The shared cache.
+    """
+    global http_cache
+    settings = settings or {}
+    cache_dir = settings.get("dir", DEFAULT_CACHE_DIR)
+    max_size_mb = settings.get("max_size_mb", DEFAULT_MAX_SIZE_MB)
+
+    if (
+        http_cache is None
+        or http_cache.cache_dir != cache_dir
+        or http_cache.max_bytes != int(max_size_mb * 1024 * 1024)
+    ):
+        flush_http_cache()
+        http_cache = HttpCache(cache_dir, max_size_mb)
+    return http_cache
+
+
+@atexit.register
+def flush_http_cache() -> None:
+    """
+    Persist the access times of the shared HTTP cache, if configured. Called
+    at the end of each fetch run and when the process exits.
+
+    Returns:
+        None
+    """
+    if http_cache is not None:
+        http_cache.flush()
+
+
+def get_http_cache(source: dict) -> Optional[HttpCache]:
+    """
+    Return the shared HTTP cache if the source has opted in with 'cache'.
+
+    Args:
+        source (dict): Config for external data source.
+
+    Returns:
+        Optional[HttpCache]: The shared cache, or None if caching is disabled
+        for the source.
+    """
+    if not source.get("cache"):
+        return None
+    return http_cache or configure_http_cache(None)
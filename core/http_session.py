@@ -0,0 +1,178 @@
+import logging
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.fetch_metrics import TIMED_POOL_CLASSES
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_POOL_SIZE = 10
+
+
+class SessionPool:
+    """
+    Maintains one keep-alive requests.Session per upstream host, shared by all
+    fetchers for the lifetime of the process.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty SessionPool.
+        """
+        self._sessions = {}
+        self._pool_sizes = {}
+        self._lock = threading.Lock()
+
+    def get_session(
+        self, url: str, pool_size: Optional[int] = None
+    ) -> requests.Session:
+        """
+        Return the shared session for the host of the given URL, creating it on
+        first use.
+
+        Args:
+            url (str): Request URL; its scheme and host select the session.
+            pool_size (Optional[int]): Max keep-alive connections to hold for the
+                host. Only applied when the session is first created.
+
+        Returns:
+            requests.Session: Session bound to a per-host connection pool.
+        """
+        host = get_host_key(url)
+        pool_size = pool_size or DEFAULT_POOL_SIZE
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is not None:
+                if pool_size != self._pool_sizes[host]:
+                    logger.debug(
+                        f"Ignoring pool size {pool_size} for {host}; "
+                        f"session already created with pool size {self._pool_sizes[host]}"
+                    )
+                return session
+
+            logger.debug(f"Creating pooled session for {host} (pool size: {pool_size})")
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            # time connection setup for fetch metrics
+            adapter.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._sessions[host] = session
+            self._pool_sizes[host] = pool_size
+            return session
+
+    def get_stats(self) -> dict:
+        """
+        Collect connection reuse counters for every pooled host.
+
+        A request served over an existing keep-alive connection counts as a hit;
+        a request that had to open a new connection counts as a miss.
+
+        Returns:
+            dict: Mapping of host to {'requests', 'hits', 'misses'} counts.
+        """
+        stats = {}
+        with self._lock:
+            sessions = list(self._sessions.items())
+
+        for host, session in sessions:
+            requests_sent = 0
+            connections = 0
+            adapter = session.get_adapter(host)
+            for key in adapter.poolmanager.pools.keys():
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                requests_sent += pool.num_requests
+                connections += pool.num_connections
+            stats[host] = {
+                "requests": requests_sent,
+                "hits": max(requests_sent - connections, 0),
+                "misses": connections,
+            }
+        return stats
+
+    def log_stats(self) -> None:
+        """
+        Log connection pool hit/miss counters for every pooled host.
+
+        Returns:
+            None
+        """
+        for host, counts in self.get_stats().items():
+            logger.info(
+                f"Connection pool stats for {host}: {counts['requests']} requests, "
+                f"{counts['hits']} pool hits, {counts['misses']} new connections"
+            )
+
+    def close(self) -> None:
+        """
+        Close all pooled sessions and their connections.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._pool_sizes.clear()
+
+
+session_pool = SessionPool()
+
+
+def get_host_key(url: str) -> str:
+    """
+    Build the key identifying the upstream host of a URL, shared by the session
+    pool, the async per-host limits and the rate limiters.
+
+    Args:
+        url (str): Request URL.
+
+    Returns:
+        str: Key in the form 'scheme://host[:port]'.
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def get_pool_size(source: dict) -> int:
+    """
+    Resolve the per-host connection limit requested by a source.
+
+    Args:
+        source (dict): Config for external data source.
+
+    Returns:
+        int: The source's 'pool_size', defaulting to the larger of
+        DEFAULT_POOL_SIZE and its 'max_concurrency'.
+    """
+    return source.get("pool_size") or max(
+        DEFAULT_POOL_SIZE, source.get("max_concurrency", 1)
+    )
+
+
+def send_request(source: dict, method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Send an HTTP request for a source through the shared session pool.
+
+    Args:
+        source (dict): Config for external data source. With 'stream_response'
+            set, the body is left unread for incremental parsing.
+        method (str): HTTP method (e.g. 'GET', 'POST').
+        url (str): Request URL.
+        kwargs: Additional arguments passed to requests.Session.request.
+
+    Returns:
+        requests.Response: Response returned by the upstream host.
+    """
+    session = session_pool.get_session(url, get_pool_size(source))
+    kwargs.setdefault("stream", bool(source.get("stream_response")))
+    return session.request(method, url, **kwargs)
@@ -1,13 +1,101 @@
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, Callable, Any
 
-from core.processor.post_processor_registry import apply_post_processor
+from core.processor.post_processor_registry import PostProcessorCache
 from utils.mapping_utils import normalize_metadata_groups, extract_first_valid_match
-from utils.match_utils import is_fuzzy_match
+from utils.match_utils import MatchStrategy
 
 logger = logging.getLogger(__name__)
 
 
+MAP_EXECUTORS = ("sequential", "process")
+DEFAULT_MAP_CHUNK_SIZE = 64
+
+# candidate table and mapping settings shared by all tasks of an entity
+# mapping worker process, set once per process by _init_entity_worker
+_worker_table = None
+_worker_entities = None
+_worker_settings = None
+_worker_cache = None
+
+
+class CandidateTable:
+    """Immutable table of the metadata groups of a source that entities are
+    matched against, built once per source so that mapping each entity does
+    not rescan the source data.
+
+    Each row describes one metadata group with a match key value: the group's
+    position in the normalized source data, its match ID and its dataset URL.
+    Groups without a match key value are left out. Entities are matched to the
+    match IDs with the source's MatchStrategy.
+    """
+
+    def __init__(
+        self,
+        matched_source_data: list,
+        match_key: str,
+        dataset_base_url: str,
+        dataset_base_url_param: str,
+        match_strategy: Optional[MatchStrategy] = None,
+    ):
+        """Initialize CandidateTable from the data fetched from a source.
+
+        Args:
+            matched_source_data (list): Source data to match entities against.
+            match_key (str): Param used to access fetched source data from response.
+            dataset_base_url (str): External dataset base URL.
+            dataset_base_url_param (str): Parameter used to format dataset URL.
+            match_strategy (Optional[MatchStrategy]): How entity IDs are matched
+                to match IDs; fuzzy matching by default.
+        """
+        self.match_strategy = match_strategy or MatchStrategy()
+        group_indices = []
+        groups = []
+        match_ids = []
+        for group_index, metadata in enumerate(
+            normalize_metadata_groups(matched_source_data)
+        ):
+            match_id = extract_first_valid_match(
+                metadata_group=metadata, match_key=match_key
+            )
+            if not match_id:
+                logger.warning(f"Match key '{match_key}' not present in metadata.")
+                continue
+            group_indices.append(group_index)
+            groups.append(metadata)
+            match_ids.append(match_id)
+
+        self.group_indices = tuple(group_indices)
+        self.groups = tuple(groups)
+        self.match_ids = tuple(match_ids)
+        self.urls = tuple(
+            dataset_base_url.format(**{dataset_base_url_param: match_id})
+            for match_id in match_ids
+        )
+
+    def __len__(self) -> int:
+        """Count the rows of the table.
+
+        Returns:
+            int: Number of metadata groups with a match key value.
+        """
+        return len(self.match_ids)
+
+    def match(self, entity_ids: list, workers: int = 1) -> list[list[int]]:
+        """Find the rows each entity ID matches.
+
+        Args:
+            entity_ids (list): Entity IDs to match.
+            workers (int): Threads used for batch matching (-1 for all cores).
+
+        Returns:
+            list[list[int]]: For each entity ID, the matching rows in table order.
+        """
+        return self.match_strategy.match(entity_ids, self.match_ids, workers)
+
+
 def map_matches_to_entity(
     entity: dict,
     source_config: dict,
@@ -17,6 +105,9 @@ def map_matches_to_entity(
     repository_name: str,
     match_key: str,
     post_processor: Optional[Callable[..., Any]] = None,
+    candidate_table: Optional[CandidateTable] = None,
+    candidate_rows: Optional[list] = None,
+    post_processor_cache: Optional[PostProcessorCache] = None,
 ) -> list:
     """Maps matched external data to a single project entity.
 
@@ -29,6 +120,12 @@ def map_matches_to_entity(
         repository_name (str): External data repository name.
         match_key (str): Param used to access fetched source data from response.
         post_processor (Optional[Callable[..., Any]]): Optional post-processor function.
+        candidate_table (Optional[CandidateTable]): Table built from
+            matched_source_data, if already built for the source.
+        candidate_rows (Optional[list]): Rows of candidate_table the entity
+            matched, if already matched.
+        post_processor_cache (Optional[PostProcessorCache]): Post-processor
+            results shared with the other entities of the source, if any.
 
     Returns:
         list: List of matched source data for the provided entity.
@@ -37,34 +134,38 @@ def map_matches_to_entity(
     entity_id_key = source_config["entity_id_key"]
     entity_id = entity.get(entity_id_key, "")
 
-    for metadata in normalize_metadata_groups(matched_source_data):
-        candidate = extract_first_valid_match(
-            metadata_group=metadata, match_key=match_key
+    if candidate_table is None:
+        candidate_table = CandidateTable(
+            matched_source_data,
+            match_key,
+            dataset_base_url,
+            dataset_base_url_param,
+            MatchStrategy.from_config(source_config.get("match_strategy")),
         )
-        if not candidate:
-            logger.warning(f"Match key '{match_key}' not present in metadata.")
-            continue
-
-        if not is_fuzzy_match(entity_id, candidate):
-            logger.debug(f"Entity '{entity_id}' did not match candidate '{candidate}'")
-            continue
+    if candidate_rows is None:
+        candidate_rows = candidate_table.match([entity_id])[0]
+    if post_processor and post_processor_cache is None:
+        post_processor_cache = PostProcessorCache(post_processor)
 
-        match_id = extract_first_valid_match(
-            metadata_group=metadata, match_key=match_key
-        )
+    for row in candidate_rows:
+        metadata = candidate_table.groups[row]
         context = {
             "entity": entity,
-            "collection_id": match_id,
+            "collection_id": candidate_table.match_ids[row],
             "entity_id_key": entity_id_key,
         }
 
         if post_processor:
-            metadata = apply_post_processor(post_processor, metadata, **context)
-            logger.info(f"Applied post-processor: {post_processor.__name__}")
+            metadata = post_processor_cache.apply(
+                candidate_table.group_indices[row], metadata, **context
+            )
 
-        url = dataset_base_url.format(**{dataset_base_url_param: match_id})
         crdc_links.append(
-            {"repository": repository_name, "url": url, "metadata": metadata}
+            {
+                "repository": repository_name,
+                "url": candidate_table.urls[row],
+                "metadata": metadata,
+            }
         )
 
     logger.debug(f"{len(crdc_links)} links mapped for entity '{entity_id}'")
@@ -81,8 +182,23 @@ def collect_mappings(
     repository_name: str,
     match_key: str,
     post_processor: Optional[Callable[..., Any]],
+    executor: str = "sequential",
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_MAP_CHUNK_SIZE,
 ) -> list:
-    """Iterates project entities and maps relevant external data.
+    """Iterates project entities and maps relevant external data. The source
+    data is scanned once into a CandidateTable, all entity IDs are matched
+    against it in one batch with the source's 'match_strategy' (fuzzy matching
+    only scores the rows sharing a bigram with an entity ID, see
+    FuzzyMatchIndex), and each entity is only mapped against the rows it
+    matched. Post-processor results
+    are shared between the entities matching the same metadata group (see
+    PostProcessorCache).
+
+    With the 'process' executor, the matched entities are mapped in a pool of
+    worker processes instead (see map_entities_in_processes), for sources
+    whose post-processor is CPU-bound. The output is the same as with the
+    'sequential' executor.
 
     Args:
         entities (list[dict]): List of entities of a project.
@@ -93,25 +209,67 @@ def collect_mappings(
         repository_name (str): External data repository name.
         match_key (str): Param used to access fetched source data from response.
         post_processor (Optional[Callable[..., Any]]): Optional post-processor function.
+        executor (str): 'sequential' to map entities in this process, or
+            'process' to map them in a pool of worker processes.
+        processes (Optional[int]): Worker processes of the 'process' executor;
+            defaults to the number of CPUs.
+        chunk_size (int): Entities per task of the 'process' executor.
 
     Returns:
         list: List of mappings of entities to matched external data, if applicable.
+
+    Raises:
+        ValueError: If the executor is unknown.
     """
+    if executor not in MAP_EXECUTORS:
+        raise ValueError(
+            f"Unknown map executor '{executor}': expected one of {', '.join(MAP_EXECUTORS)}"
+        )
     crdc_mappings = []
     entity_id_key = source_config["entity_id_key"]
 
-    for entity in entities:
-        mappings = map_matches_to_entity(
-            entity=entity,
-            source_config=source_config,
-            matched_source_data=matched_source_data,
-            dataset_base_url=dataset_base_url,
-            dataset_base_url_param=dataset_base_url_param,
-            repository_name=repository_name,
-            match_key=match_key,
-            post_processor=post_processor,
+    # build the candidate table once and match all entities against it
+    candidate_table = CandidateTable(
+        matched_source_data,
+        match_key,
+        dataset_base_url,
+        dataset_base_url_param,
+        MatchStrategy.from_config(source_config.get("match_strategy")),
+    )
+    matched_rows = candidate_table.match(
+        [entity.get(entity_id_key, "") for entity in entities],
+        source_config.get("match_workers", 1),
+    )
+    settings = {
+        "source_config": source_config,
+        "matched_source_data": matched_source_data,
+        "dataset_base_url": dataset_base_url,
+        "dataset_base_url_param": dataset_base_url_param,
+        "repository_name": repository_name,
+        "match_key": match_key,
+        "post_processor": post_processor,
+    }
+
+    if executor == "process":
+        entity_links = map_entities_in_processes(
+            entities, matched_rows, candidate_table, settings, processes, chunk_size
+        )
+    else:
+        post_processor_cache = (
+            PostProcessorCache(post_processor) if post_processor else None
+        )
+        entity_links = (
+            map_matches_to_entity(
+                entity=entity,
+                candidate_table=candidate_table,
+                candidate_rows=rows,
+                post_processor_cache=post_processor_cache,
+                **settings,
+            )
+            for entity, rows in zip(entities, matched_rows)
         )
 
+    for entity, mappings in zip(entities, entity_links):
         if mappings:
             entity_id = entity.get(entity_id_key)
             crdc_mappings.append(
@@ -127,3 +285,109 @@ def collect_mappings(
             )
 
     return crdc_mappings
+
+
+def map_entities_in_processes(
+    entities: list[dict],
+    matched_rows: list[list[int]],
+    candidate_table: CandidateTable,
+    settings: dict,
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_MAP_CHUNK_SIZE,
+) -> list:
+    """Maps entities to the candidate table rows they matched in a pool of
+    worker processes, so CPU-bound post-processors use several cores.
+
+    The entities, the candidate table and the mapping settings are sent to
+    each worker once. Each task is a contiguous chunk of entities described by
+    its start index and matched rows, so only indices are sent per task. Each
+    worker shares post-processor results across its tasks. Entities without
+    matched rows are not sent at all, and chunk results are collected in
+    entity order.
+
+    Args:
+        entities (list[dict]): List of entities of a project.
+        matched_rows (list[list[int]]): For each entity, the candidate table
+            rows it matched.
+        candidate_table (CandidateTable): Table built from the source data.
+        settings (dict): Keyword arguments of map_matches_to_entity other than
+            the entity and the candidate table; the post-processor must be
+            picklable, like the registered post-processors.
+        processes (Optional[int]): Number of worker processes; defaults to the
+            number of CPUs.
+        chunk_size (int): Entities per task.
+
+    Returns:
+        list: For each entity, its list of matched source data.
+    """
+    entity_links = [[] for _ in entities]
+    matched = [index for index, rows in enumerate(matched_rows) if rows]
+    if not matched:
+        return entity_links
+
+    tasks = [
+        [(index, matched_rows[index]) for index in matched[start : start + chunk_size]]
+        for start in range(0, len(matched), chunk_size)
+    ]
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+    logger.info(
+        f"Mapping {len(matched)} matched entities from source "
+        f"'{settings['repository_name']}' in {len(tasks)} tasks using "
+        f"{processes} worker processes..."
+    )
+    # the candidate table holds all the source data the workers need
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_entity_worker,
+        initargs=(
+            entities,
+            candidate_table,
+            {**settings, "matched_source_data": None},
+        ),
+    ) as pool:
+        futures = [pool.submit(_map_entity_chunk, task) for task in tasks]
+        # collect in submission order to keep the output in entity order
+        for task, future in zip(tasks, futures):
+            for (index, _), links in zip(task, future.result()):
+                entity_links[index] = links
+    return entity_links
+
+
+def _init_entity_worker(
+    entities: list[dict], candidate_table: CandidateTable, settings: dict
+) -> None:
+    """Store the entities, candidate table and mapping settings in an entity
+    mapping worker process.
+
+    Args:
+        entities (list[dict]): List of entities of a project.
+        candidate_table (CandidateTable): Table built from the source data.
+        settings (dict): Keyword arguments of map_matches_to_entity.
+    """
+    global _worker_table, _worker_entities, _worker_settings, _worker_cache
+    _worker_table = candidate_table
+    _worker_entities = entities
+    _worker_settings = settings
+    post_processor = settings["post_processor"]
+    _worker_cache = PostProcessorCache(post_processor) if post_processor else None
+
+
+def _map_entity_chunk(task: list[tuple[int, list[int]]]) -> list:
+    """Map a chunk of entities to their matched rows in a worker process.
+
+    Args:
+        task (list[tuple[int, list[int]]]): (entity index, matched rows) pairs.
+
+    Returns:
+        list: For each entity of the chunk, its list of matched source data.
+    """
+    return [
+        map_matches_to_entity(
+            entity=_worker_entities[index],
+            candidate_table=_worker_table,
+            candidate_rows=rows,
+            post_processor_cache=_worker_cache,
+            **_worker_settings,
+        )
+        for index, rows in task
+    ]
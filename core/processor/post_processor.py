@@ -2,7 +2,7 @@ import copy
 import logging
 import re
 from datetime import datetime, timezone
-from typing import Callable, Any
+from typing import Any, Callable, Optional
 
 from html2text import HTML2Text
 
@@ -11,18 +11,34 @@ from utils.post_processor_utils import deep_merge_additive
 logger = logging.getLogger(__name__)
 
 
-def post_processor(fn: Callable[..., Any]):
-    """Labels a function as a post-processor by setting attribute.
+def post_processor(
+    fn: Optional[Callable[..., Any]] = None,
+    *,
+    entity_overrides: Optional[Callable[..., Any]] = None,
+):
+    """Labels a function as a post-processor by setting attribute. Usable as
+    '@post_processor' or '@post_processor(entity_overrides=...)'.
 
     Args:
-        fn (Callable[..., Any]): Function to be labeled post-processor.
+        fn (Optional[Callable[..., Any]]): Function to be labeled post-processor.
+        entity_overrides (Optional[Callable[..., Any]]): For source-level
+            post-processors whose result only depends on the entity through
+            per-entity overrides: function applying them, called as
+            entity_overrides(result, entity, entity_id_key) on the result
+            computed without an entity. Lets the mapper compute the result once
+            per metadata group and share it between entities.
 
     Returns:
         Callable[..., Any]: Original function with an '_is_post_processor'
-        attribute added.
+        attribute added, or a decorator adding it.
     """
-    fn._is_post_processor = True
-    return fn
+
+    def label(fn: Callable[..., Any]) -> Callable[..., Any]:
+        fn._is_post_processor = True
+        fn._entity_overrides = entity_overrides
+        return fn
+
+    return label if fn is None else label(fn)
 
 
 def transform_html(html: str) -> str:
@@ -65,28 +81,61 @@ def clean_idc_metadata(metadata_list: list[dict]) -> list[dict]:
     return metadata_list
 
 
-@post_processor
+# TCIA data missing from the series metadata of known entities, added to their
+# aggregated totals
+TCIA_ENTITY_OVERRIDES = {
+    "GLIOMA01": {
+        "Aggregate_ImageCount": 84,
+        "Aggregate_Modality": ["Histopathology"],
+    }
+}
+
+
+def apply_tcia_entity_overrides(
+    result: dict, entity: dict, entity_id_key: Optional[str]
+) -> dict:
+    """Adds the TCIA_ENTITY_OVERRIDES of an entity to aggregated TCIA data.
+
+    Args:
+        result (dict): Aggregated metadata fields for a collection.
+        entity (dict): Entity record being processed.
+        entity_id_key (Optional[str]): Key used to identify entity in project
+            metadata.
+
+    Returns:
+        dict: The given result if the entity has no overrides, otherwise a
+        copy with the overrides merged in.
+    """
+    entity_id = entity.get(entity_id_key)
+    if entity_id not in TCIA_ENTITY_OVERRIDES:
+        return result
+
+    override = copy.deepcopy(TCIA_ENTITY_OVERRIDES[entity_id])
+    result = deep_merge_additive(copy.deepcopy(result), override)
+    logger.info(f"Additional TCIA data for {entity_id} entity added to totals.")
+    return result
+
+
+@post_processor(entity_overrides=apply_tcia_entity_overrides)
 def aggregate_tcia_series_data(
-    data: list, entity: dict, collection_id: str, entity_id_key: str
+    data: list,
+    entity: Optional[dict] = None,
+    collection_id: Optional[str] = None,
+    entity_id_key: Optional[str] = None,
 ) -> dict:
     """Aggregates TCIA metadata fields for a given entity.
 
     Args:
         data (list[dict]): Array of TCIA metadata dicts.
-        entity (dict): Entity record being processed.
-        collection_id (str): ID of TCIA data collection.
-        entity_id_key (str): Key used to identify entity in project metadata.
+        entity (Optional[dict]): Entity record being processed. Without it,
+            TCIA_ENTITY_OVERRIDES are not applied.
+        collection_id (Optional[str]): ID of TCIA data collection.
+        entity_id_key (Optional[str]): Key used to identify entity in project
+            metadata.
 
     Returns:
         dict: A dict of aggregated metadata fields for the collection.
     """
-    ENTITY_OVERRIDES = {
-        "GLIOMA01": {
-            "Aggregate_ImageCount": 84,
-            "Aggregate_Modality": ["Histopathology"],
-        }
-    }
-
     total_images = 0
     total_patients = set()
     unique_modalities = set()
@@ -106,11 +155,8 @@ def aggregate_tcia_series_data(
         "Aggregate_ImageCount": total_images,
     }
 
-    entity_id = entity.get(entity_id_key)
-    if entity_id in ENTITY_OVERRIDES:
-        override = copy.deepcopy(ENTITY_OVERRIDES[entity_id])
-        result = deep_merge_additive(result, override)
-        logger.info(f"Additional TCIA data for {entity_id} entity added to totals.")
+    if entity is not None:
+        result = apply_tcia_entity_overrides(result, entity, entity_id_key)
 
     logger.info(
         f"Completed aggregation of TCIA series data for collection '{collection_id}': "
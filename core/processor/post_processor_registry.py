@@ -1,14 +1,21 @@
+import copy
 import inspect
-from typing import Callable, Optional, Any
+import logging
+from typing import Any, Callable, Hashable, Optional
 
 import core.processor.post_processor as post_processor
 
+logger = logging.getLogger(__name__)
+
 POST_PROCESSOR_MAP = {
     name: fn
     for name, fn in inspect.getmembers(post_processor, inspect.isfunction)
     if getattr(fn, "_is_post_processor", False)
 }
 
+# context passed by the mapper to source-level post-processors
+CONTEXT_FIELDS = ("entity", "collection_id", "entity_id_key")
+
 
 def get_post_processor(name: str) -> Optional[Callable[..., Any]]:
     """Maps a post-processor name to its corresponding function.
@@ -40,3 +47,85 @@ def apply_post_processor(fn: Callable[..., Any], metadata: dict, **kwargs: dict)
             return fn(metadata)
         else:
             raise e
+
+
+class PostProcessorCache:
+    """
+    Memoizes the results of a source-level post-processor per metadata group,
+    so a group matched by several entities is post-processed once.
+
+    Results are keyed by the group and the values of the context fields the
+    post-processor accepts. The entity is left out of the key when the
+    post-processor declares 'entity_overrides', which are then applied to the
+    shared result for each entity. Post-processors run on a copy of the group,
+    so the fetched source data is never modified.
+    """
+
+    def __init__(self, fn: Callable[..., Any]):
+        """
+        Initialize an empty PostProcessorCache for a post-processor.
+
+        Args:
+            fn (Callable[..., Any]): Post-processor function.
+        """
+        self.fn = fn
+        self.entity_overrides = getattr(fn, "_entity_overrides", None)
+        self.context_fields = PostProcessorCache._get_context_fields(fn)
+        if self.entity_overrides is not None:
+            self.context_fields = tuple(
+                field for field in self.context_fields if field != "entity"
+            )
+        self._results = {}
+
+    def apply(self, group_key: Hashable, metadata: Any, **context: Any) -> Any:
+        """
+        Post-process a metadata group, reusing the result computed for the same
+        group and context.
+
+        Args:
+            group_key (Hashable): Identifies the metadata group within its source.
+            metadata (Any): Metadata group undergoing post-processing.
+            context (Any): Context of the entity being mapped ('entity',
+                'collection_id', 'entity_id_key').
+
+        Returns:
+            Any: The post-processor result, shared between the entities with the
+            same key unless entity overrides apply.
+        """
+        shared_context = {
+            field: context[field] for field in self.context_fields if field in context
+        }
+        key = (group_key,) + tuple(
+            id(value) if field == "entity" else value
+            for field, value in shared_context.items()
+        )
+        if key not in self._results:
+            self._results[key] = apply_post_processor(
+                self.fn, copy.deepcopy(metadata), **shared_context
+            )
+            logger.info(f"Applied post-processor: {self.fn.__name__}")
+
+        result = self._results[key]
+        if self.entity_overrides is not None and "entity" in context:
+            result = self.entity_overrides(
+                result, context["entity"], context.get("entity_id_key")
+            )
+        return result
+
+    @staticmethod
+    def _get_context_fields(fn: Callable[..., Any]) -> tuple:
+        """
+        Find the context fields a post-processor accepts.
+
+        Args:
+            fn (Callable[..., Any]): Post-processor function.
+
+        Returns:
+            tuple: Names of the accepted context fields, or all of them if the
+            post-processor takes **kwargs.
+        """
+        parameters = inspect.signature(fn).parameters.values()
+        if any(parameter.kind == parameter.VAR_KEYWORD for parameter in parameters):
+            return CONTEXT_FIELDS
+        names = {parameter.name for parameter in parameters}
+        return tuple(field for field in CONTEXT_FIELDS if field in names)
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+from core.http_session import get_host_key
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BURST = 1
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the request rate to one host. Safe to share between
+    threads and event loops.
+
+    Tokens refill at 'rate' per second up to 'burst'. A request that finds the
+    bucket empty reserves a future token and waits for it, so concurrent
+    requests are spaced out in arrival order instead of retrying.
+    """
+
+    def __init__(self, rate: float, burst: int = DEFAULT_BURST):
+        """
+        Initialize a full TokenBucket.
+
+        Args:
+            rate (float): Tokens added per second (max sustained requests/sec).
+            burst (int): Max tokens held (max requests sent back-to-back).
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, going into debt if none is available.
+
+        Returns:
+            float: Seconds to wait before the reserved token may be used.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """
+        Take a token, blocking the calling thread until it may be used.
+
+        Returns:
+            float: Seconds waited.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Take a token, suspending the calling task until it may be used.
+
+        Returns:
+            float: Seconds waited.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class RateLimiterRegistry:
+    """
+    Holds one TokenBucket per upstream host, shared by all fetchers for the
+    lifetime of the process.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty RateLimiterRegistry.
+        """
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get_limiter(self, source: dict, url: str) -> Optional[TokenBucket]:
+        """
+        Return the token bucket for the host of a URL, creating it from the
+        source's 'rate_limit' settings on first use.
+
+        Args:
+            source (dict): Config for external data source.
+            url (str): Request URL; its scheme and host select the bucket.
+
+        Returns:
+            Optional[TokenBucket]: Bucket for the host, or None if the host is
+            not rate limited.
+        """
+        host = get_host_key(url)
+        settings = source.get("rate_limit")
+
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is not None or not settings:
+                return bucket
+
+            bucket = TokenBucket(
+                settings["requests_per_second"],
+                settings.get("burst", DEFAULT_BURST),
+            )
+            logger.debug(
+                f"Rate limiting {host} to {bucket.rate} requests/sec (burst: {bucket.burst})"
+            )
+            self._buckets[host] = bucket
+            return bucket
+
+    def clear(self) -> None:
+        """
+        Drop all token buckets.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._buckets.clear()
+
+
+rate_limiters = RateLimiterRegistry()
@@ -0,0 +1,195 @@
+import asyncio
+import copy
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RequestDeduplicator:
+    """
+    Collapses identical upstream requests made while active, e.g. by the
+    projects of a batch run that fetch from the same sources, into a single
+    request whose data is shared by every caller.
+
+    A request made while an identical one is in flight waits for it instead of
+    being sent. A request is forgotten as soon as it completes or fails, so
+    only in-flight requests are held in memory, and an identical request made
+    later is sent again (and may be served by the HTTP cache).
+
+    Requests return (data, response) pairs. Every caller receives its own deep
+    copy of the data, since fetchers tag and post-process records in place; the
+    response is shared and must only be read.
+    """
+
+    def __init__(self):
+        """
+        Initialize an inactive RequestDeduplicator.
+        """
+        self._results = None
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether identical requests are currently deduplicated.
+
+        Returns:
+            bool: True between activate() and deactivate().
+        """
+        return self._results is not None
+
+    def activate(self) -> None:
+        """
+        Start deduplicating requests, with no requests in flight yet.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._results = {}
+            self._hits = 0
+            self._misses = 0
+
+    def deactivate(self) -> None:
+        """
+        Stop deduplicating requests.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._results = None
+
+    def call(self, key: str, send: Callable[[], tuple]) -> tuple:
+        """
+        Send a request unless an identical one is in flight, in which case
+        wait for and share its result.
+
+        Args:
+            key (str): Key identifying the request and how its data is extracted.
+            send (Callable[[], tuple]): Sends the request and returns
+                (data, response).
+
+        Returns:
+            tuple: (data, response), with a private copy of the data.
+        """
+        future, owner = self._claim(key)
+        if future is None:
+            return send()
+        if owner:
+            try:
+                result = send()
+            except BaseException as e:
+                self._resolve(key, future, error=e)
+                raise
+            self._resolve(key, future, result)
+        data, response = future.result()
+        return copy.deepcopy(data), response
+
+    async def call_async(self, key: str, send: Callable[[], Awaitable[tuple]]) -> tuple:
+        """
+        Async version of call, usable from any event loop.
+
+        Args:
+            key (str): Key identifying the request and how its data is extracted.
+            send (Callable[[], Awaitable[tuple]]): Coroutine function sending the
+                request and returning (data, response).
+
+        Returns:
+            tuple: (data, response), with a private copy of the data.
+        """
+        future, owner = self._claim(key)
+        if future is None:
+            return await send()
+        if owner:
+            try:
+                result = await send()
+            except BaseException as e:
+                self._resolve(key, future, error=e)
+                raise
+            self._resolve(key, future, result)
+        data, response = await asyncio.wrap_future(future)
+        return copy.deepcopy(data), response
+
+    def get_stats(self) -> dict:
+        """
+        Collect the number of requests sent and shared since activation.
+
+        Returns:
+            dict: {'sent', 'shared'} request counts.
+        """
+        with self._lock:
+            return {"sent": self._misses, "shared": self._hits}
+
+    def log_stats(self) -> None:
+        """
+        Log the number of requests sent and shared since activation.
+
+        Returns:
+            None
+        """
+        stats = self.get_stats()
+        logger.info(
+            f"Request deduplication: {stats['sent']} requests sent, "
+            f"{stats['shared']} identical requests shared"
+        )
+
+    def _claim(self, key: str) -> tuple[Optional[Future], bool]:
+        """
+        Look up the future of an identical request in flight, creating it if
+        there is none.
+
+        Args:
+            key (str): Key identifying the request.
+
+        Returns:
+            tuple[Optional[Future], bool]: The future (None if inactive) and
+            whether the caller must send the request and resolve it.
+        """
+        with self._lock:
+            if self._results is None:
+                return None, False
+            future = self._results.get(key)
+            if future is not None:
+                self._hits += 1
+                return future, False
+            future = Future()
+            self._results[key] = future
+            self._misses += 1
+            return future, True
+
+    def _resolve(
+        self,
+        key: str,
+        future: Future,
+        result: Optional[tuple] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Forget a completed request, so a later identical request is sent again,
+        and pass its result or error to the callers waiting on it.
+
+        Args:
+            key (str): Key identifying the request.
+            future (Future): Future claimed for the request.
+            result (Optional[tuple]): (data, response) returned by the request.
+            error (Optional[BaseException]): Error raised by the request, if any.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._results is not None and self._results.get(key) is future:
+                del self._results[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+request_dedup = RequestDeduplicator()
@@ -0,0 +1,429 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5  # seconds
+DEFAULT_BACKOFF_MAX = 30.0  # seconds
+DEFAULT_RETRY_BUDGET = 100
+
+# response statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryBudget:
+    """
+    Caps the total number of retries across all sources in a run and counts the
+    retries spent per source.
+    """
+
+    def __init__(self, total: int = DEFAULT_RETRY_BUDGET):
+        """
+        Initialize RetryBudget.
+
+        Args:
+            total (int): Max retries allowed across all sources.
+        """
+        self.total = total
+        self._counts = {}
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    def spend(self, source_name: str) -> bool:
+        """
+        Take one retry from the budget for a source.
+
+        Args:
+            source_name (str): Name of the source retrying a request.
+
+        Returns:
+            bool: True if the retry is allowed, False if the budget is exhausted.
+        """
+        with self._lock:
+            if sum(self._counts.values()) >= self.total:
+                if not self._exhausted:
+                    logger.warning(
+                        f"Retry budget of {self.total} exhausted; failing further requests without retrying."
+                    )
+                    self._exhausted = True
+                return False
+            self._counts[source_name] = self._counts.get(source_name, 0) + 1
+            return True
+
+    def extend(self, count: int) -> None:
+        """
+        Add retries to the budget, e.g. when another project joins a shared run.
+
+        Args:
+            count (int): Number of retries to add.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.total += count
+            self._exhausted = False
+
+    def get_stats(self) -> dict:
+        """
+        Collect the retries spent per source.
+
+        Returns:
+            dict: Mapping of source name to retry count.
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def log_stats(self) -> None:
+        """
+        Log the retries spent per source.
+
+        Returns:
+            None
+        """
+        stats = self.get_stats()
+        for source_name, count in stats.items():
+            logger.info(f"Retried {count} requests for source: {source_name}")
+        if stats:
+            logger.info(
+                f"Used {sum(stats.values())} of {self.total} retries in retry budget"
+            )
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried, using exponential
+    backoff with full jitter and honoring 'Retry-After' response headers.
+    """
+
+    def __init__(
+        self,
+        source_name: str,
+        budget: RetryBudget,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+    ):
+        """
+        Initialize RetryPolicy.
+
+        Args:
+            source_name (str): Name of the source the policy applies to.
+            budget (RetryBudget): Run-wide retry budget.
+            max_retries (int): Max retries per request.
+            backoff_base (float): Backoff ceiling of the first retry, in seconds;
+                doubled for each further retry.
+            backoff_max (float): Max delay between attempts, in seconds.
+        """
+        self.source_name = source_name
+        self.budget = budget
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Compute the delay before the next attempt.
+
+        Args:
+            attempt (int): Number of retries already made for the request.
+            retry_after (Optional[str]): 'Retry-After' response header, if any.
+
+        Returns:
+            float: Delay in seconds, at most backoff_max.
+        """
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            return min(requested, self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    def next_delay(
+        self,
+        url: str,
+        attempt: int,
+        reason: str,
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]:
+        """
+        Decide whether a failed attempt is retried.
+
+        Args:
+            url (str): Request URL.
+            attempt (int): Number of retries already made for the request.
+            reason (str): Description of the failure, used for logging.
+            retry_after (Optional[str]): 'Retry-After' response header, if any.
+
+        Returns:
+            Optional[float]: Delay before retrying in seconds, or None if the
+            request should not be retried.
+        """
+        if attempt >= self.max_retries or not self.budget.spend(self.source_name):
+            return None
+        delay = self.get_delay(attempt, retry_after)
+        logger.warning(
+            f"Retrying request for source {self.source_name} in {delay:.2f}s "
+            f"(retry {attempt + 1}/{self.max_retries}, url={url}): {reason}"
+        )
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a 'Retry-After' header given in seconds or as an HTTP date.
+
+    Args:
+        value (Optional[str]): Header value.
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+retry_budget = RetryBudget()
+_retry_defaults = {}
+# per-project default retry settings of a batch run, by source object id
+_project_defaults = {}
+
+
+def configure_retries(settings: Optional[dict]) -> RetryBudget:
+    """
+    Start a new run-wide retry budget and set the default retry settings from the
+    top-level 'retry' config block.
+
+    Args:
+        settings (Optional[dict]): 'retry' config block ('max_retries',
+            'backoff_base', 'backoff_max', 'budget'), or None for defaults.
+
+    Returns:
+        RetryBudget: The new retry budget.
+    """
+    global retry_budget, _retry_defaults
+    settings = dict(settings or {})
+    retry_budget = RetryBudget(settings.pop("budget", DEFAULT_RETRY_BUDGET))
+    _retry_defaults = settings
+    return retry_budget
+
+
+def set_project_retries(sources: list, settings: dict) -> None:
+    """
+    Use a project's top-level retry settings as the defaults of its own
+    sources, in a batch run whose run-wide defaults are shared by every
+    project. The source configs are left unchanged.
+
+    Args:
+        sources (list): Source config dicts of the project.
+        settings (dict): The project's 'retry' block, without 'budget'.
+
+    Returns:
+        None
+    """
+    for source in sources:
+        # the source is kept so its id is not reused while registered
+        _project_defaults[id(source)] = (source, settings)
+
+
+def clear_project_retries() -> None:
+    """
+    Forget the per-project retry settings of a batch run.
+
+    Returns:
+        None
+    """
+    _project_defaults.clear()
+
+
+def get_retry_defaults(source: dict) -> dict:
+    """
+    Look up the default retry settings of a source: its project's settings in
+    a batch run, or the configured run-wide defaults.
+
+    Args:
+        source (dict): Config for external data source.
+
+    Returns:
+        dict: Default retry settings, overridden by the source's 'retry' block.
+    """
+    entry = _project_defaults.get(id(source))
+    if entry is not None and entry[0] is source:
+        return entry[1]
+    return _retry_defaults
+
+
+def get_retry_policy(source: dict, defaults: Optional[dict] = None) -> RetryPolicy:
+    """
+    Build the retry policy of a source from the default settings and the
+    source's own 'retry' block.
+
+    Args:
+        source (dict): Config for external data source.
+        defaults (Optional[dict]): Default retry settings; the configured
+            run-wide defaults if None.
+
+    Returns:
+        RetryPolicy: Retry policy drawing on the run-wide retry budget.
+    """
+    if defaults is None:
+        defaults = _retry_defaults
+    settings = {**defaults, **source.get("retry", {})}
+    return RetryPolicy(
+        source.get("name", ""),
+        retry_budget,
+        settings.get("max_retries", DEFAULT_MAX_RETRIES),
+        settings.get("backoff_base", DEFAULT_BACKOFF_BASE),
+        settings.get("backoff_max", DEFAULT_BACKOFF_MAX),
+    )
+
+
+def call_with_retries(
+    source: dict,
+    url: str,
+    attempt_fn: Callable[[], Any],
+    retry_errors: tuple,
+) -> Any:
+    """
+    Call a request function, retrying on the given errors and on retryable
+    response statuses according to the source's retry policy.
+
+    Args:
+        source (dict): Config for external data source.
+        url (str): Request URL, used for logging.
+        attempt_fn (Callable[[], Any]): Sends the request and returns a response
+            with 'status_code' and 'headers'.
+        retry_errors (tuple): Exception types worth retrying (e.g. timeouts and
+            connection errors).
+
+    Returns:
+        Any: The first response that is not retried.
+
+    Raises:
+        Exception: The last error from attempt_fn once retries are exhausted.
+    """
+    policy = get_retry_policy(source, get_retry_defaults(source))
+    attempt = 0
+    while True:
+        try:
+            response = attempt_fn()
+        except retry_errors as e:
+            delay = policy.next_delay(url, attempt, _describe_error(e))
+            if delay is None:
+                raise
+        else:
+            delay = _get_status_delay(policy, url, attempt, response)
+            if delay is None:
+                return response
+            _close(response)
+        time.sleep(delay)
+        attempt += 1
+
+
+async def call_with_retries_async(
+    source: dict,
+    url: str,
+    attempt_fn: Callable[[], Awaitable[Any]],
+    retry_errors: tuple,
+) -> Any:
+    """
+    Async counterpart of call_with_retries.
+
+    Args:
+        source (dict): Config for external data source.
+        url (str): Request URL, used for logging.
+        attempt_fn (Callable[[], Awaitable[Any]]): Sends the request and returns
+            a response with 'status_code' and 'headers'.
+        retry_errors (tuple): Exception types worth retrying.
+
+    Returns:
+        Any: The first response that is not retried.
+
+    Raises:
+        Exception: The last error from attempt_fn once retries are exhausted.
+    """
+    policy = get_retry_policy(source, get_retry_defaults(source))
+    attempt = 0
+    while True:
+        try:
+            response = await attempt_fn()
+        except retry_errors as e:
+            delay = policy.next_delay(url, attempt, _describe_error(e))
+            if delay is None:
+                raise
+        else:
+            delay = _get_status_delay(policy, url, attempt, response)
+            if delay is None:
+                return response
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def _get_status_delay(
+    policy: RetryPolicy, url: str, attempt: int, response: Any
+) -> Optional[float]:
+    """
+    Decide whether a response with a retryable status is retried.
+
+    Args:
+        policy (RetryPolicy): Retry policy of the source.
+        url (str): Request URL.
+        attempt (int): Number of retries already made for the request.
+        response (Any): Response to check.
+
+    Returns:
+        Optional[float]: Delay before retrying in seconds, or None if the
+        response should be returned as-is.
+    """
+    if response.status_code not in RETRY_STATUSES:
+        return None
+    return policy.next_delay(
+        url,
+        attempt,
+        f"HTTP {response.status_code} {response.reason}",
+        response.headers.get("Retry-After"),
+    )
+
+
+def _describe_error(error: Exception) -> str:
+    """
+    Describe a request error for logging.
+
+    Args:
+        error (Exception): Request error.
+
+    Returns:
+        str: Error type and message.
+    """
+    message = str(error)
+    name = type(error).__name__
+    return f"{name}: {message}" if message else name
+
+
+def _close(response: Any) -> None:
+    """
+    Release the connection of a response that is being retried.
+
+    Args:
+        response (Any): Response to close.
+    """
+    close = getattr(response, "close", None)
+    if callable(close):
+        close()
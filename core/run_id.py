@@ -0,0 +1,13 @@
+import uuid
+from datetime import datetime, timezone
+
+
+def new_run_id() -> str:
+    """
+    Generate a unique, chronologically sortable run id.
+
+    Returns:
+        str: Run id in the form 'YYYYMMDDTHHMMSSZ-xxxxxx'.
+    """
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return f"{timestamp}-{uuid.uuid4().hex[:6]}"
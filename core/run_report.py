@@ -0,0 +1,220 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+from core.run_id import new_run_id
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_REPORT_DIR = "reports"
+
+
+class RunReport:
+    """
+    Structured record of the stages of one project run (config load, per-source
+    fetch, per-source matching, writer steps per host and notification), saved
+    as a JSON file per run.
+
+    Each stage record holds its wall time, the CPU time of the thread running
+    it, the process peak RSS at its end, input/output record counts where they
+    apply, and whether it completed. Concurrent stages run by the async fetch
+    engine share one thread, so their CPU times overlap.
+    """
+
+    def __init__(self, project: Optional[str] = None):
+        """
+        Initialize an empty RunReport and start its run clock.
+
+        Args:
+            project (Optional[str]): Project name, if already known.
+        """
+        self.project = project
+        self.run_id = new_run_id()
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self._started = time.perf_counter()
+        self._stages = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, **fields) -> Iterator[dict]:
+        """
+        Time a stage and add its record to the report when it ends. The caller
+        may set 'records_in', 'records_out' or 'status' on the yielded record.
+
+        Args:
+            name (str): Stage name, e.g. 'fetch' or 'write_bulk'.
+            fields: Identifying fields of the stage, e.g. source or host.
+
+        Yields:
+            dict: The stage record.
+        """
+        record = {"stage": name, **fields}
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        status = "ok"
+        try:
+            yield record
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            record.setdefault("status", status)
+            record["wall_seconds"] = round(time.perf_counter() - started, 3)
+            record["cpu_seconds"] = round(time.thread_time() - cpu_started, 3)
+            record["peak_rss_mb"] = get_peak_rss_mb()
+            with self._lock:
+                self._stages.append(record)
+
+    def get_stages(self) -> list:
+        """
+        Collect the stage records in completion order.
+
+        Returns:
+            list: Stage record dicts.
+        """
+        with self._lock:
+            return list(self._stages)
+
+    def to_dict(self) -> dict:
+        """
+        Build the JSON-ready report.
+
+        Returns:
+            dict: Run details and stage records.
+        """
+        return {
+            "project": self.project,
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "wall_seconds": round(time.perf_counter() - self._started, 3),
+            "peak_rss_mb": get_peak_rss_mb(),
+            "stages": self.get_stages(),
+        }
+
+    def summarize(self) -> list:
+        """
+        Summarize the report per stage name, for notifications.
+
+        Returns:
+            list: One line for the run and one per stage name, in the order the
+            stages first completed.
+        """
+        report = self.to_dict()
+        lines = [
+            f"Run {report['run_id']}: {report['wall_seconds']:.1f}s"
+            + RunReport._format_rss(report["peak_rss_mb"])
+        ]
+        groups = {}
+        for record in report["stages"]:
+            groups.setdefault(record["stage"], []).append(record)
+        for name, records in groups.items():
+            slowest = max(records, key=lambda record: record["wall_seconds"])
+            line = (
+                f"{name}: {len(records)}x, "
+                f"{sum(record['wall_seconds'] for record in records):.1f}s total"
+            )
+            label = slowest.get("source") or slowest.get("host")
+            if len(records) > 1 and label:
+                line += f", slowest {label} ({slowest['wall_seconds']:.1f}s)"
+            failed = sum(record["status"] != "ok" for record in records)
+            if failed:
+                line += f", {failed} failed"
+            lines.append(line)
+        return lines
+
+    def save(self, report_dir: str = DEFAULT_REPORT_DIR) -> Optional[str]:
+        """
+        Write the report to '<report_dir>/<project>-<run id>.json'. Failures are
+        logged and otherwise ignored.
+
+        Args:
+            report_dir (str): Directory holding run reports.
+
+        Returns:
+            Optional[str]: Path of the report file, or None if it was not saved.
+        """
+        path = os.path.join(
+            report_dir, f"{self.project or 'unknown'}-{self.run_id}.json"
+        )
+        try:
+            os.makedirs(report_dir, exist_ok=True)
+            with open(path, "w") as file:
+                json.dump(self.to_dict(), file, indent=2, default=str)
+        except OSError as e:
+            logger.warning(f"Failed to save run report to {path}: {e}")
+            return None
+        logger.info(f"Run report saved to {path}")
+        return path
+
+    @staticmethod
+    def _format_rss(peak_rss_mb: Optional[float]) -> str:
+        """
+        Format the peak RSS for the summary.
+
+        Args:
+            peak_rss_mb (Optional[float]): Peak RSS in MB, if known.
+
+        Returns:
+            str: ', peak RSS <n> MB', or '' if unknown.
+        """
+        return "" if peak_rss_mb is None else f", peak RSS {peak_rss_mb:.0f} MB"
+
+
+def get_peak_rss_mb() -> Optional[float]:
+    """
+    Return the peak resident set size of this process so far.
+
+    Returns:
+        Optional[float]: Peak RSS in MB, or None where it is not available.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def report_stage(report: Optional[RunReport], name: str, **fields):
+    """
+    Time a stage in a report, if there is one.
+
+    Args:
+        report (Optional[RunReport]): Report of the run, or None.
+        name (str): Stage name.
+        fields: Identifying fields of the stage, e.g. source or host.
+
+    Returns:
+        ContextManager[dict]: Context yielding the stage record (a throwaway
+        dict without a report).
+    """
+    if report is None:
+        return nullcontext({})
+    return report.stage(name, **fields)
+
+
+def count_records(data: Any) -> Optional[int]:
+    """
+    Count the records in fetched or mapped data.
+
+    Args:
+        data (Any): List of records, a single record, or None.
+
+    Returns:
+        Optional[int]: Number of records, or None if there is no data.
+    """
+    if data is None:
+        return None
+    return len(data) if isinstance(data, list) else 1
@@ -0,0 +1,307 @@
+import copy
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RUN_STATE_DIR = ".cache/run_state"
+
+# top-level document keys set anew on every run (e.g. by format_for_icdc and
+# format_for_ccdi), left out of document fingerprints
+VOLATILE_DOCUMENT_KEYS = ("timestamp",)
+
+
+class RunState:
+    """
+    Content fingerprints from a project's previous run, used by incremental runs
+    to skip work whose inputs did not change:
+
+    - mappings of a source are reused if the source's config, its fetched data
+      and the entities are unchanged, instead of rerunning collect_mappings
+    - documents are only written if they differ from the version last written
+      to the same index and hosts
+    - the write is skipped entirely if the config and the data fetched from
+      every source match a run whose documents were all written
+
+    The state is kept in one gzip-compressed JSON file per project.
+    """
+
+    def __init__(self, path: str, full_refresh: bool = False):
+        """
+        Initialize RunState and load the state saved by the previous run.
+
+        Args:
+            path (str): Path of the state file.
+            full_refresh (bool): Ignore the saved state, so every source is
+                mapped and every document written again.
+        """
+        self.path = path
+        self.inputs = None
+        self.unchanged = False
+        self._source_fingerprints = {}
+        self._pending_documents = None
+        self._pending_target = None
+        self._lock = threading.Lock()
+
+        state = {} if full_refresh else self._read()
+        self._mappings = state.get("mappings", {})
+        self._documents = state.get("documents", {})
+        self._document_target = state.get("document_target")
+        self._written_inputs = state.get("written_inputs")
+
+    @staticmethod
+    def fingerprint(value: Any) -> str:
+        """
+        Build the content fingerprint of a JSON-like value.
+
+        Args:
+            value (Any): Value to fingerprint.
+
+        Returns:
+            str: Hex digest, equal for equal values regardless of key order.
+        """
+        raw = json.dumps(value, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def add_source(self, source_name: str, data: Any) -> None:
+        """
+        Fingerprint the data fetched from a source in this run.
+
+        Args:
+            source_name (str): Name of the source.
+            data (Any): Data fetched from the source (None if the fetch failed).
+
+        Returns:
+            None
+        """
+        fingerprint = RunState.fingerprint(data)
+        with self._lock:
+            self._source_fingerprints[source_name] = fingerprint
+
+    def check_unchanged(self, config: dict, fetched_data: dict) -> bool:
+        """
+        Fingerprint the inputs of this run and compare them with the last run
+        whose documents were all written.
+
+        Args:
+            config (dict): Config dict.
+            fetched_data (dict): Mapping of source names to fetched data.
+
+        Returns:
+            bool: True if the config and all fetched data are unchanged, so
+            writing can be skipped.
+        """
+        for source_name, data in fetched_data.items():
+            if source_name not in self._source_fingerprints:
+                self.add_source(source_name, data)
+        self.inputs = RunState.fingerprint(
+            [config, sorted(self._source_fingerprints.items())]
+        )
+        self.unchanged = self.inputs == self._written_inputs
+        if self.unchanged:
+            logger.info("Config and fetched data are unchanged since the last run")
+        return self.unchanged
+
+    def get_mappings(self, source: dict, entity_source_name: str) -> Optional[list]:
+        """
+        Return the mappings saved for a source if its inputs are unchanged.
+
+        Args:
+            source (dict): External data source config.
+            entity_source_name (str): Name of source providing entities.
+
+        Returns:
+            Optional[list]: Copy of the saved mappings, or None if the source
+            must be mapped again.
+        """
+        name = source.get("name")
+        key = self._mapping_key(source, entity_source_name)
+        with self._lock:
+            saved = self._mappings.get(name)
+            if key is None or saved is None or saved["inputs"] != key:
+                return None
+            logger.info(f"Reusing mappings for unchanged source: {name}")
+            return copy.deepcopy(saved["mappings"])
+
+    def set_mappings(
+        self, source: dict, entity_source_name: str, mappings: list
+    ) -> None:
+        """
+        Save the mappings created for a source in this run.
+
+        Args:
+            source (dict): External data source config.
+            entity_source_name (str): Name of source providing entities.
+            mappings (list): Mappings created from the source.
+
+        Returns:
+            None
+        """
+        key = self._mapping_key(source, entity_source_name)
+        if key is None:
+            return
+        with self._lock:
+            self._mappings[source.get("name")] = {
+                "inputs": key,
+                "mappings": copy.deepcopy(mappings),
+            }
+
+    def filter_changed_documents(self, actions: list, index: str, hosts: list) -> list:
+        """
+        Keep the bulk actions whose document differs from the version written
+        by a previous run, ignoring VOLATILE_DOCUMENT_KEYS. Documents written to
+        a different index or set of hosts count as changed. The documents are
+        added to those recorded by the next commit_documents call, so the
+        documents of a run may be filtered in several chunks.
+
+        Args:
+            actions (list): Bulk index actions with '_id' and '_source'.
+            index (str): Index the documents are written to.
+            hosts (list): OpenSearch hosts the documents are written to.
+
+        Returns:
+            list: Actions whose document is new or changed.
+        """
+        target = RunState.fingerprint([index, sorted(hosts)])
+        fingerprints = {
+            action["_id"]: RunState._document_fingerprint(action["_source"])
+            for action in actions
+        }
+        with self._lock:
+            if self._pending_documents is None:
+                self._pending_documents = {}
+            self._pending_documents.update(fingerprints)
+            self._pending_target = target
+            written = self._documents if target == self._document_target else {}
+            return [
+                action
+                for action in actions
+                if written.get(action["_id"]) != fingerprints[action["_id"]]
+            ]
+
+    def commit_documents(self) -> None:
+        """
+        Record the documents passed to filter_changed_documents since the last
+        commit as written, along with the inputs of this run. Call only once the
+        documents were written to every host.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._pending_documents is None:
+                return
+            self._documents = self._pending_documents
+            self._document_target = self._pending_target
+            self._pending_documents = None
+            self._written_inputs = self.inputs
+
+    def save(self) -> None:
+        """
+        Atomically write the state file. Failures are logged and otherwise
+        ignored, since the next run then only does more work.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            state = {
+                "mappings": self._mappings,
+                "documents": self._documents,
+                "document_target": self._document_target,
+                "written_inputs": self._written_inputs,
+            }
+            try:
+                state_dir = os.path.dirname(self.path) or "."
+                os.makedirs(state_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=state_dir, suffix=".tmp")
+                with os.fdopen(fd, "wb") as raw_file, gzip.open(
+                    raw_file, "wt", encoding="utf-8"
+                ) as file:
+                    json.dump(state, file)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Failed to save run state to {self.path}: {e}")
+
+    def _mapping_key(self, source: dict, entity_source_name: str) -> Optional[str]:
+        """
+        Build the fingerprint of the inputs of a source's mappings.
+
+        Args:
+            source (dict): External data source config.
+            entity_source_name (str): Name of source providing entities.
+
+        Returns:
+            Optional[str]: Fingerprint of the source config, its data and the
+            entities, or None if either data is not fingerprinted yet.
+        """
+        with self._lock:
+            data = self._source_fingerprints.get(source.get("name"))
+            entities = self._source_fingerprints.get(entity_source_name)
+        if data is None or entities is None:
+            return None
+        return RunState.fingerprint([source, entities, data])
+
+    @staticmethod
+    def _document_fingerprint(document: dict) -> str:
+        """
+        Build the fingerprint of a document without its volatile keys.
+
+        Args:
+            document (dict): Document to index.
+
+        Returns:
+            str: Fingerprint of the document.
+        """
+        return RunState.fingerprint(
+            {
+                key: value
+                for key, value in document.items()
+                if key not in VOLATILE_DOCUMENT_KEYS
+            }
+        )
+
+    def _read(self) -> dict:
+        """
+        Load the state file.
+
+        Returns:
+            dict: Saved state, or an empty dict if there is none.
+        """
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning(f"Ignoring unreadable run state file {self.path}: {e}")
+            return {}
+
+        if not isinstance(state, dict):
+            logger.warning(f"Ignoring invalid run state file {self.path}")
+            return {}
+        return state
+
+
+def open_run_state(config: dict, full_refresh: bool = False) -> RunState:
+    """
+    Open the run state of a project, kept under the config 'run_state_dir'.
+
+    Args:
+        config (dict): Config dict.
+        full_refresh (bool): Ignore the state saved by the previous run.
+
+    Returns:
+        RunState: The project's run state.
+    """
+    state_dir = config.get("run_state_dir", DEFAULT_RUN_STATE_DIR)
+    file_name = re.sub(r"[^A-Za-z0-9._-]", "_", str(config["project"]))
+    return RunState(os.path.join(state_dir, f"{file_name}.json.gz"), full_refresh)
@@ -0,0 +1,185 @@
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SNAPSHOT_DIR = "snapshots"
+MANIFEST_FILE = "manifest.json"
+LATEST_RUN = "latest"
+
+
+class SnapshotStore:
+    """
+    Saves and loads the data fetched from each source as gzip-compressed JSON
+    files, grouped by run id:
+
+        <base_dir>/<run_id>/manifest.json
+        <base_dir>/<run_id>/<source_name>.json.gz
+    """
+
+    def __init__(self, base_dir: str = DEFAULT_SNAPSHOT_DIR):
+        """
+        Initialize SnapshotStore.
+
+        Args:
+            base_dir (str): Directory holding one subdirectory per run.
+        """
+        self.base_dir = base_dir
+
+    def save(self, run_id: str, fetched_data: dict) -> str:
+        """
+        Save the data fetched from every source for a run.
+
+        Args:
+            run_id (str): Run id the snapshot is saved under.
+            fetched_data (dict): Mapping of source names to fetched data (None
+                for sources that failed to fetch).
+
+        Returns:
+            str: Path of the run's snapshot directory.
+        """
+        writer = self.open_run(run_id)
+        for source_name, data in fetched_data.items():
+            writer.add(source_name, data)
+        return writer.commit()
+
+    def open_run(self, run_id: str) -> "SnapshotWriter":
+        """
+        Start saving a run's snapshot one source at a time.
+
+        Args:
+            run_id (str): Run id the snapshot is saved under.
+
+        Returns:
+            SnapshotWriter: Writer for the run's snapshot.
+        """
+        return SnapshotWriter(os.path.join(self.base_dir, run_id), run_id)
+
+    def load(self, run_id: str) -> dict:
+        """
+        Load the data fetched from every source in a run.
+
+        Args:
+            run_id (str): Run id to load, or 'latest' for the most recent run.
+
+        Returns:
+            dict: Mapping of source names to fetched data.
+
+        Raises:
+            FileNotFoundError: If the run has no snapshot.
+        """
+        if run_id == LATEST_RUN:
+            run_id = self.get_latest_run_id()
+            if run_id is None:
+                raise FileNotFoundError(f"No fetch snapshots found in {self.base_dir}")
+
+        run_dir = os.path.join(self.base_dir, run_id)
+        manifest_path = os.path.join(run_dir, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No fetch snapshot found for run id: {run_id}")
+
+        with open(manifest_path, "r") as file:
+            manifest = json.load(file)
+
+        fetched_data = {}
+        for source_name, file_name in manifest["sources"].items():
+            with gzip.open(os.path.join(run_dir, file_name), "rt") as file:
+                fetched_data[source_name] = json.load(file)
+
+        logger.info(
+            f"Loaded fetch snapshot for {len(fetched_data)} sources from {run_dir}"
+        )
+        return fetched_data
+
+    def get_latest_run_id(self) -> Optional[str]:
+        """
+        Find the most recent run with a complete snapshot.
+
+        Returns:
+            Optional[str]: Latest run id, or None if there are no snapshots.
+        """
+        if not os.path.isdir(self.base_dir):
+            return None
+        run_ids = [
+            run_id
+            for run_id in os.listdir(self.base_dir)
+            if os.path.exists(os.path.join(self.base_dir, run_id, MANIFEST_FILE))
+        ]
+        return max(run_ids, default=None)
+
+
+class SnapshotWriter:
+    """
+    Saves a run's snapshot one source at a time. The run only becomes loadable
+    once the manifest is written by commit().
+    """
+
+    def __init__(self, run_dir: str, run_id: str):
+        """
+        Initialize SnapshotWriter and create the run directory.
+
+        Args:
+            run_dir (str): Directory of the run's snapshot.
+            run_id (str): Run id the snapshot is saved under.
+        """
+        self.run_dir = run_dir
+        self.run_id = run_id
+        self._files = {}
+        os.makedirs(run_dir, exist_ok=True)
+
+    def add(self, source_name: str, data: Any) -> None:
+        """
+        Save the data fetched from one source.
+
+        Args:
+            source_name (str): Name of the source.
+            data (Any): Fetched data (None if the source failed to fetch).
+        """
+        file_name = f"{SnapshotWriter._safe_name(source_name)}.json.gz"
+        if file_name in self._files.values():
+            file_name = (
+                f"{SnapshotWriter._safe_name(source_name)}-{len(self._files)}.json.gz"
+            )
+        with gzip.open(os.path.join(self.run_dir, file_name), "wt") as file:
+            json.dump(data, file, separators=(",", ":"))
+        self._files[source_name] = file_name
+
+    def commit(self) -> str:
+        """
+        Write the manifest listing every saved source.
+
+        Returns:
+            str: Path of the run's snapshot directory.
+        """
+        manifest = {
+            "run_id": self.run_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "sources": self._files,
+        }
+        with open(os.path.join(self.run_dir, MANIFEST_FILE), "w") as file:
+            json.dump(manifest, file, indent=2)
+
+        logger.info(
+            f"Saved fetch snapshot for {len(self._files)} sources to {self.run_dir} "
+            f"(run id: {self.run_id})"
+        )
+        return self.run_dir
+
+    @staticmethod
+    def _safe_name(source_name: Any) -> str:
+        """
+        Make a source name safe to use as a file name.
+
+        Args:
+            source_name (Any): Source name.
+
+        Returns:
+            str: Name with characters outside [A-Za-z0-9._-] replaced.
+        """
+        return re.sub(r"[^A-Za-z0-9._-]", "_", str(source_name))
@@ -0,0 +1,181 @@
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_STATS_FILE = ".cache/source_stats.json"
+
+# weight of the latest run in a source's smoothed fetch duration
+DURATION_SMOOTHING = 0.5
+
+# one lock per stats file, so projects of a batch run sharing a file in this
+# process do not overwrite each other's durations
+_file_locks: dict = {}
+_file_locks_lock = threading.Lock()
+
+
+def _get_file_lock(path: str) -> threading.Lock:
+    """
+    Return the process-wide lock guarding a stats file.
+
+    Args:
+        path (str): Path of the stats file.
+
+    Returns:
+        threading.Lock: Lock shared by all SourceStats using the file.
+    """
+    with _file_locks_lock:
+        return _file_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+class SourceStats:
+    """
+    Per-source fetch durations from previous runs, kept in a small JSON file
+    and used to start the longest-running sources first.
+
+    Durations are smoothed across runs, so one unusually slow or fast run does
+    not reorder the schedule on its own.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATS_FILE):
+        """
+        Initialize SourceStats and load the durations saved by previous runs.
+
+        Args:
+            path (str): Path of the stats file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._durations = self._read()
+        # sources recorded in this run; only these are merged into the file
+        self._recorded = set()
+
+    def get_duration(self, source_name: str) -> Optional[float]:
+        """
+        Return the smoothed fetch duration of a source.
+
+        Args:
+            source_name (str): Name of the source.
+
+        Returns:
+            Optional[float]: Duration in seconds, or None if the source has no
+            recorded runs.
+        """
+        with self._lock:
+            return self._durations.get(source_name)
+
+    def record(self, source_name: str, seconds: float) -> None:
+        """
+        Record the fetch duration of a source in this run.
+
+        Args:
+            source_name (str): Name of the source.
+            seconds (float): Time spent fetching the source.
+        """
+        with self._lock:
+            self._recorded.add(source_name)
+            previous = self._durations.get(source_name)
+            if previous is None:
+                self._durations[source_name] = seconds
+            else:
+                self._durations[source_name] = (
+                    DURATION_SMOOTHING * seconds + (1 - DURATION_SMOOTHING) * previous
+                )
+
+    def order_longest_first(self, sources: list) -> list:
+        """
+        Order sources by their recorded fetch duration, longest first
+        (longest-processing-time scheduling). Sources without recorded runs
+        are started first; ties keep config order.
+
+        Args:
+            sources (list): List of source config dicts.
+
+        Returns:
+            list: Sources in scheduling order.
+        """
+        names = [source.get("name", "<unknown>") for source in sources]
+        durations = [self.get_duration(name) for name in names]
+        order = sorted(
+            range(len(sources)),
+            key=lambda i: -(math.inf if durations[i] is None else durations[i]),
+        )
+        logger.debug(
+            "Source schedule (longest first): "
+            + ", ".join(
+                SourceStats._format_entry(names[i], durations[i]) for i in order
+            )
+        )
+        ordered = [sources[i] for i in order]
+        return ordered
+
+    def save(self) -> None:
+        """
+        Atomically write the durations recorded in this run to the stats file,
+        merged into the file's current contents so durations saved meanwhile
+        by other projects sharing the file are kept. Failures are logged and
+        otherwise ignored, since the stats only affect scheduling.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            recorded = {name: self._durations[name] for name in self._recorded}
+
+        with _get_file_lock(self.path):
+            durations = self._read()
+            durations.update(recorded)
+            try:
+                stats_dir = os.path.dirname(self.path) or "."
+                os.makedirs(stats_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=stats_dir, suffix=".tmp")
+                with os.fdopen(fd, "w") as file:
+                    json.dump(durations, file, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Failed to save source stats to {self.path}: {e}")
+
+    def _read(self) -> dict:
+        """
+        Load the durations from the stats file.
+
+        Returns:
+            dict: Mapping of source name to smoothed duration in seconds.
+        """
+        try:
+            with open(self.path, "r") as file:
+                durations = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable source stats file {self.path}: {e}")
+            return {}
+
+        if not isinstance(durations, dict):
+            logger.warning(f"Ignoring invalid source stats file {self.path}")
+            return {}
+        return {
+            name: float(seconds)
+            for name, seconds in durations.items()
+            if isinstance(seconds, (int, float)) and not isinstance(seconds, bool)
+        }
+
+    @staticmethod
+    def _format_entry(source_name: str, seconds: Optional[float]) -> str:
+        """
+        Format a source and its duration for the schedule log.
+
+        Args:
+            source_name (str): Name of the source.
+            seconds (Optional[float]): Duration in seconds, or None if unknown.
+
+        Returns:
+            str: 'name (12.3s)' or 'name (new)'.
+        """
+        return f"{source_name} ({'new' if seconds is None else f'{seconds:.1f}s'})"
@@ -1,12 +1,17 @@
 import hashlib
+import itertools
 import json
 import logging
 import os
+import threading
+from typing import Callable, Iterable, Optional
 
 from core.processor.post_processor_registry import (
     get_post_processor,
     apply_post_processor,
 )
+from core.run_report import RunReport, report_stage
+from core.run_state import RunState
 
 from opensearchpy import OpenSearch
 from opensearchpy.exceptions import OpenSearchException
@@ -15,23 +20,81 @@ from opensearchpy.helpers import bulk
 logger = logging.getLogger(__name__)
 
 
+# documents read, processed and written at a time by stream_write_documents
+DEFAULT_STREAM_CHUNK_SIZE = 500
+
+
+class OpenSearchClientRegistry:
+    """
+    Shares one OpenSearch client per host and connection settings between the
+    writers of a batch run, so projects writing to the same cluster reuse its
+    connections.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty OpenSearchClientRegistry.
+        """
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get_client(
+        self, key: tuple, make_client: Callable[[], OpenSearch]
+    ) -> OpenSearch:
+        """
+        Return the shared client for a host and its connection settings,
+        creating it on first use.
+
+        Args:
+            key (tuple): Host and connection settings identifying the client.
+            make_client (Callable[[], OpenSearch]): Creates the client.
+
+        Returns:
+            OpenSearch: Shared OpenSearch client.
+        """
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = make_client()
+                self._clients[key] = client
+            return client
+
+    def close(self) -> None:
+        """
+        Close all shared clients and their connections.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
 class OpenSearchWriter:
     """
     Handles connection to OpenSearch host and writing documents to indices.
     """
 
-    def __init__(self, config: dict):
+    def __init__(
+        self, config: dict, client_registry: Optional[OpenSearchClientRegistry] = None
+    ):
         """
         Initialize OpenSearchWriter and connect to host(s) using data provided in the
         'output' config block.
 
         Args:
             config (dict): App config data.
+            client_registry (Optional[OpenSearchClientRegistry]): Registry of
+                clients shared with other writers; by default the writer creates
+                its own clients.
 
         Raises:
             ConnectionError: If client cannot connect to OpenSearch host.
         """
         self.config = config
+        self.client_registry = client_registry
         self.output_config = self.config.get("output", {}).get("config", {})
 
         self.index = self.output_config["index"]
@@ -88,7 +151,25 @@ class OpenSearchWriter:
 
     def _make_client(self, host) -> OpenSearch:
         """
-        Create and return an OpenSearch client instance.
+        Create and return an OpenSearch client instance, or the shared client
+        for the host if the writer has a client registry.
+
+        Args:
+            host (str): The OpenSearch host to connect to.
+
+        Returns:
+            OpenSearch: An instance of the OpenSearch client.
+        """
+        if self.client_registry is not None:
+            return self.client_registry.get_client(
+                (host, self.auth, self.use_ssl, self.verify_certs),
+                lambda: self._new_client(host),
+            )
+        return self._new_client(host)
+
+    def _new_client(self, host) -> OpenSearch:
+        """
+        Create a new OpenSearch client instance.
 
         Args:
             host (str): The OpenSearch host to connect to.
@@ -105,117 +186,288 @@ class OpenSearchWriter:
             verify_certs=self.verify_certs,
         )
 
-    def bulk_write_documents(self, documents: list) -> dict:
+    def bulk_write_documents(
+        self,
+        documents: list,
+        run_state: Optional[RunState] = None,
+        report: Optional[RunReport] = None,
+    ) -> dict:
         """
         Bulk write documents to an OpenSearch index.
 
         Args:
             documents (list): A list of documents containing data.
+            run_state (Optional[RunState]): Fingerprints of the documents written
+                by the previous run; unchanged documents are skipped, and the
+                written ones recorded once every host accepted them.
+            report (Optional[RunReport]): Report to record the flatten,
+                validate, post-process and bulk stages of each host to, if any.
 
         Returns:
-            dict: Summary of bulk write results (successful / attempted).
+            dict: Summary of bulk write results (successful / attempted, and
+            unchanged with a run state).
 
         Raises:
             RuntimeError: If bulk write to index fails.
         """
         total_attempted = 0
         total_success = 0
+        total_unchanged = None
+        failed_hosts = 0
 
         for client in self.clients:
+            host = client.transport.hosts[0]["host"]
             try:
-                project = self.config.get("project")
-                actions = []
-
                 # flatten list of documents in case any fetchers returned lists
                 # use generator if documents can be large
-                flat_docs = []
-                for doc in documents:
-                    if isinstance(doc, list):
-                        flat_docs.extend(doc)
-                    else:
-                        flat_docs.append(doc)
+                with report_stage(report, "write_flatten", host=host) as record:
+                    flat_docs = []
+                    for doc in documents:
+                        if isinstance(doc, list):
+                            flat_docs.extend(doc)
+                        else:
+                            flat_docs.append(doc)
+                    record["records_in"] = len(documents)
+                    record["records_out"] = len(flat_docs)
 
                 if not flat_docs:
                     logger.warning("No documents to index after flattening input.")
                     return {"success": 0, "attempted": 0}
 
-                non_empty_docs = [doc for doc in flat_docs if doc]
-                skipped_empty = len(flat_docs) - len(non_empty_docs)
-
-                serializable_docs = OpenSearchWriter._ensure_json_serializable(
-                    non_empty_docs
-                )
-                skipped_unserializable = len(non_empty_docs) - len(serializable_docs)
-
-                valid_docs = [doc for doc in serializable_docs if isinstance(doc, dict)]
-                skipped_non_dict = len(serializable_docs) - len(valid_docs)
-
-                # defensive check for empty individual fetch results
-                if not valid_docs:
-                    logger.warning("No valid documents to index.")
-                    return {"success": 0, "attempted": 0}
-
-                if self.post_processor:
-                    pre_post_processor_count = len(valid_docs)
-                    valid_docs = apply_post_processor(self.post_processor, valid_docs)
-                    valid_docs = valid_docs or []
-                    skipped_post_processor = pre_post_processor_count - len(valid_docs)
-                else:
-                    skipped_post_processor = 0
-
-                for doc in valid_docs:
-                    doc_id = OpenSearchWriter._build_doc_id(doc, project)
-                    actions.append(
-                        {
-                            "_index": self.index,
-                            "_id": doc_id,
-                            "_source": doc,
-                        }
-                    )
-
-                skipped = (
-                    skipped_empty
-                    + skipped_unserializable
-                    + skipped_non_dict
-                    + skipped_post_processor
-                )
-                if skipped:
-                    reasons = []
-                    if skipped_empty:
-                        reasons.append(f"{skipped_empty} empty/null")
-                    if skipped_unserializable:
-                        reasons.append(f"{skipped_unserializable} unserializable")
-                    if skipped_non_dict:
-                        reasons.append(f"{skipped_non_dict} non-dict")
-                    if skipped_post_processor:
-                        reasons.append(
-                            f"{skipped_post_processor} filtered by post-processor"
-                        )
-                    logger.warning(
-                        f"Skipped {skipped} flattened document(s) before indexing ({', '.join(reasons)})."
-                    )
+                actions = self._build_actions(flat_docs, report, host)
 
                 if not actions:
                     logger.warning("No valid documents remained after validation.")
                     return {"success": 0, "attempted": 0}
 
-                success, _ = bulk(client, actions)
+                if run_state is not None:
+                    changed_actions = run_state.filter_changed_documents(
+                        actions, self.index, self.hosts
+                    )
+                    # every host gets the same documents, so count them once
+                    if total_unchanged is None:
+                        total_unchanged = len(actions) - len(changed_actions)
+                        if total_unchanged:
+                            logger.info(
+                                f"Skipping {total_unchanged} document(s) unchanged since the last run"
+                            )
+                    actions = changed_actions
+                    if not actions:
+                        continue
+
+                with report_stage(report, "write_bulk", host=host) as record:
+                    record["records_in"] = len(actions)
+                    success, _ = bulk(client, actions)
+                    record["records_out"] = success
                 total_attempted += len(actions)
                 total_success += success
                 logger.info(
-                    f"Wrote {success} out of {len(actions)} documents to index {self.index} on {client.transport.hosts[0]['host']}"
+                    f"Wrote {success} out of {len(actions)} documents to index {self.index} on {host}"
                 )
             except OpenSearchException as e:
                 logger.error(
-                    f"Write failed on {client.transport.hosts[0]['host']}: {e}",
+                    f"Write failed on {host}: {e}",
                     exc_info=True,
                 )
+                failed_hosts += 1
                 continue
 
-        if total_success == 0:
+        total_unchanged = total_unchanged or 0
+        if total_success == 0 and (failed_hosts or not total_unchanged):
+            raise RuntimeError("Bulk write failed on all configured OpenSearch hosts.")
+
+        results = {"success": total_success, "attempted": total_attempted}
+        if run_state is not None:
+            results["unchanged"] = total_unchanged
+            if not failed_hosts:
+                run_state.commit_documents()
+        return results
+
+    def stream_write_documents(
+        self,
+        documents: Iterable,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        run_state: Optional[RunState] = None,
+        report: Optional[RunReport] = None,
+    ) -> dict:
+        """
+        Bulk write documents to an OpenSearch index as they arrive, one chunk at
+        a time, so that only one chunk of documents is held in memory. Each
+        chunk is validated, post-processed and written to every host before the
+        next one is read. The post-processor must therefore handle each
+        document independently (e.g. format_for_ccdi).
+
+        A host whose write fails is not written to again; the stream stops
+        early once every host has failed.
+
+        Args:
+            documents (Iterable): Documents (or lists of documents) to index.
+            chunk_size (int): Documents read, processed and written at a time.
+            run_state (Optional[RunState]): Fingerprints of the documents written
+                by the previous run; unchanged documents are skipped, and the
+                written ones recorded once every host accepted them.
+            report (Optional[RunReport]): Report to record the write stage to,
+                if any.
+
+        Returns:
+            dict: Summary of bulk write results (successful / attempted, and
+            unchanged with a run state).
+
+        Raises:
+            RuntimeError: If bulk write to index fails.
+        """
+        total_read = 0
+        total_attempted = 0
+        total_success = 0
+        total_unchanged = 0
+        hosts = {client.transport.hosts[0]["host"]: client for client in self.clients}
+        failed_hosts = set()
+
+        with report_stage(report, "write_stream") as record:
+            iterator = iter(documents)
+            while len(failed_hosts) < len(hosts):
+                chunk = []
+                for doc in itertools.islice(iterator, chunk_size):
+                    if isinstance(doc, list):
+                        chunk.extend(doc)
+                    else:
+                        chunk.append(doc)
+                if not chunk:
+                    break
+                total_read += len(chunk)
+
+                actions = self._build_actions(chunk)
+                del chunk
+                if run_state is not None and actions:
+                    changed_actions = run_state.filter_changed_documents(
+                        actions, self.index, self.hosts
+                    )
+                    total_unchanged += len(actions) - len(changed_actions)
+                    actions = changed_actions
+                if not actions:
+                    continue
+
+                for host, client in hosts.items():
+                    if host in failed_hosts:
+                        continue
+                    try:
+                        success, _ = bulk(client, actions)
+                    except OpenSearchException as e:
+                        logger.error(f"Write failed on {host}: {e}", exc_info=True)
+                        failed_hosts.add(host)
+                        continue
+                    total_attempted += len(actions)
+                    total_success += success
+                logger.debug(
+                    f"Streamed {total_read} documents to index {self.index} so far"
+                )
+            record["records_in"] = total_read
+            record["records_out"] = total_success
+
+        if total_read == 0:
+            logger.warning("No documents to index from stream.")
+            return {"success": 0, "attempted": 0}
+        if total_unchanged:
+            logger.info(
+                f"Skipped {total_unchanged} document(s) unchanged since the last run"
+            )
+        logger.info(
+            f"Wrote {total_success} out of {total_attempted} streamed documents to index {self.index} "
+            f"on {len(hosts) - len(failed_hosts)} of {len(hosts)} host(s)"
+        )
+
+        if total_success == 0 and (failed_hosts or not total_unchanged):
             raise RuntimeError("Bulk write failed on all configured OpenSearch hosts.")
 
-        return {"success": total_success, "attempted": total_attempted}
+        results = {"success": total_success, "attempted": total_attempted}
+        if run_state is not None:
+            results["unchanged"] = total_unchanged
+            if not failed_hosts:
+                run_state.commit_documents()
+        return results
+
+    def _build_actions(
+        self,
+        documents: list,
+        report: Optional[RunReport] = None,
+        host: Optional[str] = None,
+    ) -> list:
+        """
+        Validate and post-process flattened documents and build their bulk
+        index actions. Skipped documents are counted and logged.
+
+        Args:
+            documents (list): Flattened documents.
+            report (Optional[RunReport]): Report to record the validate and
+                post-process stages to, if any.
+            host (Optional[str]): Host the actions are built for, recorded in
+                the report.
+
+        Returns:
+            list: Bulk index actions, possibly empty.
+        """
+        with report_stage(report, "write_validate", host=host) as record:
+            non_empty_docs = [doc for doc in documents if doc]
+            skipped_empty = len(documents) - len(non_empty_docs)
+
+            serializable_docs = OpenSearchWriter._ensure_json_serializable(
+                non_empty_docs
+            )
+            skipped_unserializable = len(non_empty_docs) - len(serializable_docs)
+
+            valid_docs = [doc for doc in serializable_docs if isinstance(doc, dict)]
+            skipped_non_dict = len(serializable_docs) - len(valid_docs)
+            record["records_in"] = len(documents)
+            record["records_out"] = len(valid_docs)
+
+        # defensive check for empty individual fetch results
+        if not valid_docs:
+            return []
+
+        if self.post_processor:
+            pre_post_processor_count = len(valid_docs)
+            with report_stage(report, "write_post_process", host=host) as record:
+                valid_docs = apply_post_processor(self.post_processor, valid_docs)
+                valid_docs = valid_docs or []
+                record["records_in"] = pre_post_processor_count
+                record["records_out"] = len(valid_docs)
+            skipped_post_processor = pre_post_processor_count - len(valid_docs)
+        else:
+            skipped_post_processor = 0
+
+        project = self.config.get("project")
+        actions = []
+        for doc in valid_docs:
+            doc_id = OpenSearchWriter._build_doc_id(doc, project)
+            actions.append(
+                {
+                    "_index": self.index,
+                    "_id": doc_id,
+                    "_source": doc,
+                }
+            )
+
+        skipped = (
+            skipped_empty
+            + skipped_unserializable
+            + skipped_non_dict
+            + skipped_post_processor
+        )
+        if skipped:
+            reasons = []
+            if skipped_empty:
+                reasons.append(f"{skipped_empty} empty/null")
+            if skipped_unserializable:
+                reasons.append(f"{skipped_unserializable} unserializable")
+            if skipped_non_dict:
+                reasons.append(f"{skipped_non_dict} non-dict")
+            if skipped_post_processor:
+                reasons.append(f"{skipped_post_processor} filtered by post-processor")
+            logger.warning(
+                f"Skipped {skipped} flattened document(s) before indexing ({', '.join(reasons)})."
+            )
+
+        return actions
 
     @staticmethod
     def _ensure_json_serializable(documents: list) -> list:
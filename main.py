@@ -3,21 +3,39 @@ Main entry point for the Data Retriever Service.
 
 Loads configuration file, orchestrates data fetching and entity mapping,
 writes results to OpenSearch and sends success/failure notifications.
+Several configuration files can be run concurrently as one batch, and runs
+can be repeated on a schedule by a long-running process.
 """
 
 import argparse
 import logging
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-from config_loader import ConfigHandler
+from config_loader import ConfigWatcher
 import core.dispatcher as dispatcher
+from core.http_session import session_pool
+from core.rate_limiter import rate_limiters
+from core.run_report import DEFAULT_REPORT_DIR, RunReport
+from core.run_state import RunState, open_run_state
 from core.sns_notifier import SNSNotifier
-from core.writer.opensearch_writer import OpenSearchWriter
+from core.writer.opensearch_writer import (
+    DEFAULT_STREAM_CHUNK_SIZE,
+    OpenSearchClientRegistry,
+    OpenSearchWriter,
+)
 from utils.logging_utils import setup_logging
 from utils.notification_utils import build_notification_message
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_SERVE_INTERVAL = 3600
+
+
 def parse_args(args=None):
     """
     Parses command-line arguments for the application.
@@ -30,8 +48,9 @@ def parse_args(args=None):
     parser.add_argument(
         "--config",
         type=str,
-        default="config.yaml",
-        help="Path to config file (default: config.yaml).",
+        nargs="+",
+        default=["config.yaml"],
+        help="Path to config file (default: config.yaml). Several config files are run as one batch in this process.",
     )
     parser.add_argument(
         "--log-level",
@@ -50,67 +69,399 @@ def parse_args(args=None):
         action="store_true",
         help="Enable multithreaded fetching of source data.",
     )
+    parser.add_argument(
+        "--fetch-engine",
+        type=str,
+        choices=["threaded", "async"],
+        default=None,
+        help="Fetch engine to use; overrides the config 'fetch_engine' key (default: threaded).",
+    )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=None,
+        help="Worker threads for parallel fetching; overrides the config 'fetch_workers' key (default: 8).",
+    )
+    parser.add_argument(
+        "--map-workers",
+        type=int,
+        default=None,
+        help="Worker processes for entity mapping; overrides the config 'map_workers' key (default: 1).",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Map each source as soon as it is fetched instead of after all fetches; overrides the config 'pipeline' key.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the mappings of unchanged sources and skip unchanged documents; overrides the config 'incremental' key.",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Ignore the state of previous incremental runs: map every source and write every document.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="For configs with only 'rest_raw' sources, write records to OpenSearch in chunks as pages are fetched; overrides the config 'stream' key.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep running and rerun the pipeline every --interval seconds, reloading changed config files.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=None,
+        help=f"Seconds between the starts of scheduled runs with --serve (default: {DEFAULT_SERVE_INTERVAL}).",
+    )
+    snapshot_group = parser.add_mutually_exclusive_group()
+    snapshot_group.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Save fetched source data to the snapshot store under a new run id.",
+    )
+    snapshot_group.add_argument(
+        "--from-snapshot",
+        type=str,
+        metavar="RUN_ID",
+        default=None,
+        help="Skip fetching and reuse source data saved by a --snapshot run ('latest' for the most recent).",
+    )
 
-    return parser.parse_args()
+    parsed = parser.parse_args(args)
+    for flag in ("fetch_workers", "map_workers", "interval"):
+        value = getattr(parsed, flag)
+        if value is not None and value < 1:
+            parser.error(f"--{flag.replace('_', '-')} must be a positive integer")
+    if parsed.interval is not None and not parsed.serve:
+        parser.error("--interval requires --serve")
+    if parsed.interval is None:
+        parsed.interval = DEFAULT_SERVE_INTERVAL
+    return parsed
 
 
 def main():
     """
-    Runs the data retriever pipeline.
+    Runs the data retriever pipeline for the given config file, or for all of
+    them as one batch if several are given, once or on a schedule.
+
+    Returns:
+        None
+    """
+    args = parse_args()
+    setup_logging(level=getattr(logging, args.log_level))
+
+    config_watchers = [ConfigWatcher(config_path) for config_path in args.config]
+    if args.serve:
+        serve(config_watchers, args)
+    else:
+        run_once(config_watchers, args)
+
+
+def run_once(
+    config_watchers: list,
+    args: argparse.Namespace,
+    client_registry: Optional[OpenSearchClientRegistry] = None,
+) -> None:
+    """
+    Runs the pipeline once for every project.
+
+    Args:
+        config_watchers (list): ConfigWatcher of each project's config file.
+        args (argparse.Namespace): Parsed command-line arguments.
+        client_registry (Optional[OpenSearchClientRegistry]): OpenSearch
+            clients kept between runs, if any.
+
+    Returns:
+        None
+    """
+    if len(config_watchers) > 1:
+        run_batch(config_watchers, args, client_registry)
+    else:
+        run_project(config_watchers[0], args, client_registry)
+
+
+def serve(config_watchers: list, args: argparse.Namespace) -> None:
+    """
+    Keeps the process alive and reruns the pipeline every --interval seconds
+    until interrupted or terminated. Pooled HTTP connections, OpenSearch
+    clients, post-processors and the HTTP cache stay warm between runs, and
+    config files are reloaded when they change, rebuilding per-host rate
+    limiters and sessions so their new settings apply.
+
+    Args:
+        config_watchers (list): ConfigWatcher of each project's config file.
+        args (argparse.Namespace): Parsed command-line arguments.
+
+    Returns:
+        None
+    """
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    client_registry = OpenSearchClientRegistry()
+    logger.info(
+        f"Serving {len(config_watchers)} project(s), running every {args.interval}s"
+    )
+
+    try:
+        while not stop.is_set():
+            started = time.monotonic()
+            if any(watcher.has_changed() for watcher in config_watchers):
+                reset_host_state()
+            try:
+                run_once(config_watchers, args, client_registry)
+            except Exception as e:
+                logger.exception(f"Scheduled run failed: {e}")
+
+            delay = max(args.interval - (time.monotonic() - started), 0)
+            logger.info(f"Next run in {delay:.0f}s")
+            stop.wait(delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client_registry.close()
+        session_pool.close()
+        logger.info("Stopped serving")
+
+
+def reset_host_state() -> None:
+    """
+    Drops the per-host token buckets and pooled sessions between scheduled
+    runs, so 'rate_limit' and 'pool_size' changes in a reloaded config take
+    effect. Both are recreated from the new settings on first use.
+
+    Returns:
+        None
+    """
+    logger.info("Config changed: resetting rate limiters and pooled sessions")
+    rate_limiters.clear()
+    session_pool.close()
+
+
+def run_project(
+    config_watcher: ConfigWatcher,
+    args: argparse.Namespace,
+    client_registry: Optional[OpenSearchClientRegistry] = None,
+) -> bool:
+    """
+    Runs the data retriever pipeline for one project.
 
     Steps:
-        - Loads the configuration file
+        - Loads the configuration file (if it changed since the last run)
         - Fetches external data
-        - Maps data to project entities
-        - Writes data to OpenSearch
+        - Maps data to project entities (only changed sources, if incremental)
+        - Writes data to OpenSearch (only changed documents, if incremental),
+          or streams raw records to OpenSearch as they are fetched
         - Sends success/failure SNS notification
+        - Saves the run report with the timings of each stage
+
+    Args:
+        config_watcher (ConfigWatcher): Watcher of the project's config file.
+        args (argparse.Namespace): Parsed command-line arguments.
+        client_registry (Optional[OpenSearchClientRegistry]): OpenSearch
+            clients shared with other projects or runs.
 
     Returns:
-        None
+        bool: True if documents were written to OpenSearch.
     """
     success = False
     mappings = []
     config = {}
     project = "<unknown>"
-
-    args = parse_args()
-    setup_logging(level=getattr(logging, args.log_level))
+    run_state = None
+    report = RunReport()
 
     try:
-        config_handler = ConfigHandler.load_config_with_env_vars(args.config)
-        config = config_handler.config
-        project = config["project"]
-
-        mappings = dispatcher.run_dispatcher(config, args.parallel_fetch)
-        if mappings:
-            if args.dry_run:
-                logger.info(
-                    "Dry run mode enabled: skipping OpenSearch write and notifications"
-                )
-            else:
-                writer = OpenSearchWriter(config=config)
-                write_results = writer.bulk_write_documents(mappings)
+        with report.stage("config_load", path=config_watcher.config_path):
+            config = config_watcher.load()
+        project = report.project = config["project"]
+        if args.incremental or args.full_refresh or config.get("incremental"):
+            run_state = open_run_state(config, args.full_refresh)
+        if use_streaming(config, args):
+            success = run_stream(config, args, run_state, report, client_registry)
+        else:
+            mappings = dispatcher.run_dispatcher(
+                config,
+                args.parallel_fetch,
+                args.fetch_engine,
+                save_snapshot=args.snapshot,
+                from_snapshot=args.from_snapshot,
+                pipeline=args.pipeline,
+                fetch_workers=args.fetch_workers,
+                map_workers=args.map_workers,
+                run_state=run_state,
+                report=report,
+            )
+            if run_state is not None and run_state.unchanged and not args.dry_run:
+                logger.info("No changes since the last run: skipping OpenSearch write")
+                success = True
+            elif mappings:
+                if args.dry_run:
+                    logger.info(
+                        "Dry run mode enabled: skipping OpenSearch write and notifications"
+                    )
+                else:
+                    writer = OpenSearchWriter(
+                        config=config, client_registry=client_registry
+                    )
+                    write_results = writer.bulk_write_documents(
+                        mappings, run_state, report
+                    )
 
-                written = write_results.get("success", 0)
-                if written > 0:
-                    success = True
+                    written = write_results.get("success", 0)
+                    if written > 0 or write_results.get("unchanged", 0) > 0:
+                        success = True
 
     except Exception as e:
         logger.exception(f"Data Retriever Service pipeline failed: {e}")
 
     finally:
+        if run_state is not None:
+            run_state.save()
         if config.get("notifications") and not args.dry_run:
             try:
-                topic_arn = config["notifications"]["config"]["topic_arn"]
-                region = config["notifications"]["config"]["region"]
+                with report.stage("notification"):
+                    topic_arn = config["notifications"]["config"]["topic_arn"]
+                    region = config["notifications"]["config"]["region"]
 
-                notifier = SNSNotifier(topic_arn=topic_arn, region=region)
-                message = build_notification_message(
-                    success=success, mappings=mappings, project=project
-                )
-                notifier.notify(subject="Data Retriever Service", message=message)
+                    notifier = SNSNotifier(topic_arn=topic_arn, region=region)
+                    message = build_notification_message(
+                        success=success,
+                        mappings=mappings,
+                        project=project,
+                        report_summary=report.summarize(),
+                    )
+                    notifier.notify(subject="Data Retriever Service", message=message)
             except Exception as notify_err:
                 logger.error(f"Failed to send SNS notification: {notify_err}")
+        report.save(config.get("run_report_dir", DEFAULT_REPORT_DIR))
+
+    return success
+
+
+def use_streaming(config: dict, args: argparse.Namespace) -> bool:
+    """
+    Decides whether a project is written in streaming mode (--stream or the
+    config 'stream' key), which requires a config with only 'rest_raw'
+    sources and no snapshot options.
+
+    Args:
+        config (dict): Config dict.
+        args (argparse.Namespace): Parsed command-line arguments.
+
+    Returns:
+        bool: True if the project's records are streamed to OpenSearch.
+    """
+    if not (args.stream or config.get("stream")):
+        return False
+    if not dispatcher.is_raw_config(config):
+        logger.warning(
+            "Streaming requires all sources to be of type 'rest_raw': running without streaming"
+        )
+        return False
+    if args.snapshot or args.from_snapshot:
+        logger.warning(
+            "Streaming does not support snapshots: running without streaming"
+        )
+        return False
+    return True
+
+
+def run_stream(
+    config: dict,
+    args: argparse.Namespace,
+    run_state: Optional[RunState] = None,
+    report: Optional[RunReport] = None,
+    client_registry: Optional[OpenSearchClientRegistry] = None,
+) -> bool:
+    """
+    Streams the records of a raw config from its sources through the
+    post-processor into chunked bulk writes, so memory use is bounded by the
+    chunk size ('stream_chunk_size') rather than the size of the sources.
+
+    Args:
+        config (dict): Config dict; every source must be of type 'rest_raw'.
+        args (argparse.Namespace): Parsed command-line arguments.
+        run_state (Optional[RunState]): Fingerprints of the documents written
+            by the previous run, to skip unchanged documents (incremental runs
+            only).
+        report (Optional[RunReport]): Report to record the fetch and write
+            stages to, if any.
+        client_registry (Optional[OpenSearchClientRegistry]): OpenSearch
+            clients shared with other projects or runs.
+
+    Returns:
+        bool: True if documents were written to OpenSearch.
+    """
+    records = dispatcher.iter_raw_records(config, report)
+    if args.dry_run:
+        logger.info("Dry run mode enabled: skipping OpenSearch write and notifications")
+        record_count = sum(1 for _ in records)
+        logger.info(f"Streamed {record_count} raw records.")
+        return False
+
+    writer = OpenSearchWriter(config=config, client_registry=client_registry)
+    write_results = writer.stream_write_documents(
+        records,
+        config.get("stream_chunk_size", DEFAULT_STREAM_CHUNK_SIZE),
+        run_state,
+        report,
+    )
+    return write_results.get("success", 0) > 0 or write_results.get("unchanged", 0) > 0
+
+
+def run_batch(
+    config_watchers: list,
+    args: argparse.Namespace,
+    client_registry: Optional[OpenSearchClientRegistry] = None,
+) -> dict:
+    """
+    Runs several projects concurrently in this process. The projects share
+    pooled HTTP connections, one OpenSearch client per host and a retry budget,
+    and identical upstream requests in flight at once (e.g. to a source used by
+    several projects) are sent once.
+
+    Args:
+        config_watchers (list): ConfigWatcher of each project's config file.
+        args (argparse.Namespace): Parsed command-line arguments.
+        client_registry (Optional[OpenSearchClientRegistry]): OpenSearch
+            clients kept between runs; by default the batch creates and closes
+            its own.
+
+    Returns:
+        dict: Mapping of config path to whether the project wrote documents.
+    """
+    logger.info(f"Running batch of {len(config_watchers)} projects")
+    batch_registry = client_registry or OpenSearchClientRegistry()
+    try:
+        with dispatcher.batch_fetch_run(), ThreadPoolExecutor(
+            max_workers=len(config_watchers), thread_name_prefix="project"
+        ) as executor:
+            results = list(
+                executor.map(
+                    lambda watcher: run_project(watcher, args, batch_registry),
+                    config_watchers,
+                )
+            )
+    finally:
+        if client_registry is None:
+            batch_registry.close()
+
+    outcomes = {
+        watcher.config_path: success
+        for watcher, success in zip(config_watchers, results)
+    }
+    for config_path, success in outcomes.items():
+        logger.info(
+            f"Batch project {config_path}: "
+            + ("documents written" if success else "no documents written")
+        )
+    return outcomes
 
 
 if __name__ == "__main__":
@@ -2,7 +2,12 @@ from unittest.mock import patch
 
 import pytest
 
-from core.processor.mapper import map_matches_to_entity, collect_mappings
+from core.processor.mapper import (
+    CandidateTable,
+    map_matches_to_entity,
+    collect_mappings,
+)
+from utils.mapping_utils import extract_first_valid_match
 
 
 @pytest.fixture
@@ -75,3 +80,151 @@ def test_collect_mappings(_mock_mapper, test_entity, source_config, dataset_para
     assert len(result) == 1
     assert result[0]["entity_id"] == "GLIOMA01"
     assert "CRDCLinks" in result[0]
+
+
+def test_collect_mappings_matches_entities_against_indexed_groups(
+    source_config, dataset_params
+):
+    entities = [
+        {"clinical_study_designation": "GLIOMA01"},
+        {"clinical_study_designation": "OSA01"},
+        {"clinical_study_designation": "NOMATCH99"},
+    ]
+    source_data = [
+        [{"collection_id": "icdc_glioma"}],
+        [{"other": "x"}],
+        [{"collection_id": "icdc_osa"}],
+        [{"collection_id": "tcga_brca"}],
+    ]
+
+    result = collect_mappings(
+        entities=entities,
+        source_config=source_config,
+        matched_source_data=source_data,
+        post_processor=None,
+        **dataset_params,
+    )
+
+    assert [mapping["entity_id"] for mapping in result] == ["GLIOMA01", "OSA01"]
+    assert [link["url"] for link in result[0]["CRDCLinks"]] == [
+        "https://data.example.org/icdc_glioma"
+    ]
+    assert [link["url"] for link in result[1]["CRDCLinks"]] == [
+        "https://data.example.org/icdc_osa"
+    ]
+
+
+def test_candidate_table_rows(dataset_params):
+    table = CandidateTable(
+        [
+            [{"collection_id": "ICDC_Glioma"}],
+            [{"other": "x"}],
+            [{"collection_id": ""}, {"collection_id": "icdc_osa"}],
+        ],
+        dataset_params["match_key"],
+        dataset_params["dataset_base_url"],
+        dataset_params["dataset_base_url_param"],
+    )
+
+    assert len(table) == 2
+    assert table.group_indices == (0, 2)
+    assert table.match_ids == ("ICDC_Glioma", "icdc_osa")
+    assert table.urls == (
+        "https://data.example.org/ICDC_Glioma",
+        "https://data.example.org/icdc_osa",
+    )
+    assert table.match(["GLIOMA01", "OSA01", ""]) == [[0], [1], []]
+
+
+@patch(
+    "core.processor.mapper.extract_first_valid_match",
+    wraps=extract_first_valid_match,
+)
+def test_collect_mappings_scans_source_data_once(
+    mock_extract, source_config, dataset_params
+):
+    entities = [{"clinical_study_designation": f"GLIOMA0{i}"} for i in range(5)]
+    source_data = [
+        [{"collection_id": "icdc_glioma"}],
+        [{"collection_id": "tcga_brca"}],
+    ]
+
+    result = collect_mappings(
+        entities=entities,
+        source_config=source_config,
+        matched_source_data=source_data,
+        post_processor=None,
+        **dataset_params,
+    )
+
+    assert len(result) == 5
+    assert mock_extract.call_count == 2
+
+
+def test_collect_mappings_post_processes_each_group_once(source_config, dataset_params):
+    calls = []
+
+    def summarize(metadata):
+        calls.append(metadata)
+        return {"collections": len(metadata)}
+
+    entities = [{"clinical_study_designation": f"GLIOMA0{i}"} for i in range(3)]
+    result = collect_mappings(
+        entities=entities,
+        source_config=source_config,
+        matched_source_data=[[{"collection_id": "icdc_glioma"}]],
+        post_processor=summarize,
+        **dataset_params,
+    )
+
+    assert [link["metadata"] for m in result for link in m["CRDCLinks"]] == [
+        {"collections": 1}
+    ] * 3
+    assert len(calls) == 1
+
+
+def _count_collections(metadata):
+    return {"collections": len(metadata)}
+
+
+def test_collect_mappings_process_executor_keeps_sequential_output(
+    source_config, dataset_params
+):
+    entities = [
+        {"clinical_study_designation": name}
+        for name in ["OSA01", "NOMATCH99", "GLIOMA01", "GLIOMA02", "OSA02"]
+    ]
+    source_data = [
+        [{"collection_id": "icdc_glioma"}],
+        [{"collection_id": "icdc_osa"}, {"collection_id": "icdc_osa"}],
+    ]
+    kwargs = {
+        "entities": entities,
+        "source_config": source_config,
+        "matched_source_data": source_data,
+        "post_processor": _count_collections,
+        **dataset_params,
+    }
+
+    sequential = collect_mappings(**kwargs)
+    parallel = collect_mappings(executor="process", processes=2, chunk_size=1, **kwargs)
+
+    assert parallel == sequential
+    assert [mapping["entity_id"] for mapping in parallel] == [
+        "OSA01",
+        "GLIOMA01",
+        "GLIOMA02",
+        "OSA02",
+    ]
+
+
+def test_collect_mappings_rejects_unknown_executor(source_config, dataset_params):
+    with pytest.raises(ValueError, match="Unknown map executor 'threads'"):
+        collect_mappings(
+            entities=[],
+            source_config=source_config,
+            matched_source_data=[],
+            post_processor=None,
+            executor="threads",
+            **dataset_params,
+        )
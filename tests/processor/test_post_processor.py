@@ -2,6 +2,7 @@ import pytest
 
 from core.processor.post_processor import (
     aggregate_tcia_series_data,
+    apply_tcia_entity_overrides,
     clean_idc_metadata,
     transform_html,
     post_processor,
@@ -29,6 +30,30 @@ def test_post_processor_sets_attribute():
     assert function._is_post_processor is True
 
 
+def test_post_processor_with_entity_overrides_sets_attributes():
+    def overrides(result, entity, entity_id_key):
+        return result
+
+    @post_processor(entity_overrides=overrides)
+    def function():
+        pass
+
+    assert function._is_post_processor is True
+    assert function._entity_overrides is overrides
+
+
+def test_apply_tcia_entity_overrides_copies_result():
+    result = {"Aggregate_ImageCount": 10, "Aggregate_Modality": ["MR"]}
+    entity = {"clinical_study_designation": "GLIOMA01"}
+
+    merged = apply_tcia_entity_overrides(result, entity, "clinical_study_designation")
+
+    assert merged["Aggregate_ImageCount"] == 94
+    assert merged["Aggregate_Modality"] == ["Histopathology", "MR"]
+    assert result == {"Aggregate_ImageCount": 10, "Aggregate_Modality": ["MR"]}
+    assert apply_tcia_entity_overrides(result, {"id": "X"}, "id") is result
+
+
 @pytest.mark.parametrize(
     "metadata, expected",
     [
@@ -1,6 +1,8 @@
 import pytest
 
+from core.processor.post_processor import post_processor
 from core.processor.post_processor_registry import (
+    PostProcessorCache,
     get_post_processor,
     apply_post_processor,
 )
@@ -36,3 +38,55 @@ def test_apply_post_processor_without_kwargs():
         dummy_processor_no_kwargs, metadata, ignore_kwarg=True
     )
     assert result == {"field": "data", "static": True}
+
+
+def test_post_processor_cache_shares_results_per_group():
+    calls = []
+
+    def clean(metadata):
+        calls.append(metadata)
+        metadata[0]["description"] = metadata[0]["description"].strip()
+        return metadata
+
+    group = [{"description": " text "}]
+    cache = PostProcessorCache(clean)
+    first = cache.apply(0, group, entity={"id": "A"}, collection_id="c1")
+    second = cache.apply(0, group, entity={"id": "B"}, collection_id="c1")
+
+    assert first is second
+    assert first == [{"description": "text"}]
+    assert len(calls) == 1
+    assert group == [{"description": " text "}]
+
+
+def test_post_processor_cache_keys_on_entity_when_used():
+    def tag(metadata, entity):
+        return {"entity": entity["id"]}
+
+    cache = PostProcessorCache(tag)
+    assert cache.apply(0, [], entity={"id": "A"}) == {"entity": "A"}
+    assert cache.apply(0, [], entity={"id": "B"}) == {"entity": "B"}
+
+
+def test_post_processor_cache_applies_entity_overrides_to_shared_result():
+    calls = []
+
+    def add_bonus(result, entity, entity_id_key):
+        if entity[entity_id_key] != "A":
+            return result
+        return {**result, "count": result["count"] + 10}
+
+    @post_processor(entity_overrides=add_bonus)
+    def count(metadata, entity=None, entity_id_key=None):
+        calls.append(entity)
+        return {"count": len(metadata)}
+
+    cache = PostProcessorCache(count)
+    context = {"entity_id_key": "id", "collection_id": "c1"}
+    results = [
+        cache.apply(0, [1, 2], entity={"id": entity_id}, **context)
+        for entity_id in ("A", "B", "C")
+    ]
+
+    assert results == [{"count": 12}, {"count": 2}, {"count": 2}]
+    assert calls == [None]
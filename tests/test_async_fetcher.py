@@ -0,0 +1,399 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from core.async_fetcher import (
+    AsyncResponse,
+    fetch_from_source_async,
+    fetch_direct_async,
+    fetch_raw_async,
+    do_discovery_then_fetch_async,
+    fetch_graphql_async,
+    fetch_all_async,
+    fetch_each_async,
+    gather_ordered,
+    iter_fetch_all_async,
+)
+from core.http_cache import HttpCache
+
+
+class FakeClient:
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    async def request(
+        self, source, method, url, extractor=None, sink=None, timer=None, **kwargs
+    ):
+        self.calls.append((method, url, kwargs))
+        route = self.routes[url]
+        if isinstance(route, Exception):
+            raise route
+        body, headers = route if isinstance(route, tuple) else (route, {})
+        etag = headers.get("ETag")
+        if etag and kwargs.get("headers", {}).get("If-None-Match") == etag:
+            return AsyncResponse(304, "Not Modified", {}, b"")
+        body = json.dumps(body).encode()
+        if extractor is None:
+            return AsyncResponse(200, "OK", headers, body)
+        for i in range(0, len(body), 7):
+            if sink is not None:
+                sink(body[i : i + 7])
+            extractor.feed(body[i : i + 7])
+        return AsyncResponse(200, "OK", headers, b"", extractor.close())
+
+
+@pytest.fixture
+def discovery_source():
+    return {
+        "name": "discoverer",
+        "type": "rest",
+        "api_base_url": "http://mock-api",
+        "discovery": {
+            "endpoint": "/discovery",
+            "match_key": "id",
+            "filter_prefix": "abc",
+        },
+        "fetch": {"endpoint_template": "/details/{id}", "key_param": "id"},
+        "response_data_key": "data",
+    }
+
+
+def test_fetch_direct_async_filters_records():
+    source = {
+        "name": "filtered",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/data",
+        "match_key": "id",
+        "filter_prefix": "match",
+        "response_data_key": "items",
+    }
+    client = FakeClient(
+        {"http://mock-api/data": {"items": [{"id": "match_1"}, {"id": "---"}]}}
+    )
+    assert asyncio.run(fetch_direct_async(client, source)) == [{"id": "match_1"}]
+
+
+def test_fetch_graphql_async_posts_query():
+    source = {
+        "name": "graphql_source",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/graphql",
+        "query": "{ data }",
+        "response_data_key": "data.items",
+    }
+    client = FakeClient({"http://mock-api/graphql": {"data": {"items": [1, 2]}}})
+    assert asyncio.run(fetch_graphql_async(client, source)) == [1, 2]
+    assert client.calls[0][0] == "POST"
+    assert client.calls[0][2] == {"json": {"query": "{ data }"}}
+
+
+def test_fetch_raw_async_follows_link_header():
+    source = {
+        "name": "raw",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/p1",
+        "retry": {"max_retries": 0},
+    }
+    client = FakeClient(
+        {
+            "http://mock-api/p1": (
+                [1, 2],
+                {"Link": '<http://mock-api/p2>; rel="next"'},
+            ),
+            "http://mock-api/p2": ([3], {}),
+        }
+    )
+    assert asyncio.run(fetch_raw_async(client, source)) == [1, 2, 3]
+
+
+def test_fetch_raw_async_returns_partial_on_timeout():
+    source = {
+        "name": "raw",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/p1",
+        "retry": {"max_retries": 0},
+    }
+    client = FakeClient(
+        {
+            "http://mock-api/p1": ([1], {"Link": '<http://mock-api/p2>; rel="next"'}),
+            "http://mock-api/p2": asyncio.TimeoutError(),
+        }
+    )
+    assert asyncio.run(fetch_raw_async(client, source)) == [1]
+
+
+def test_do_discovery_then_fetch_async_keeps_order_and_skips_timeouts(
+    discovery_source,
+):
+    discovery_source["retry"] = {"max_retries": 0}
+    client = FakeClient(
+        {
+            "http://mock-api/discovery": {
+                "data": [{"id": "abc1"}, {"id": "xyz"}, {"id": "abc2"}, {"id": "abc3"}]
+            },
+            "http://mock-api/details/abc1": {"data": "one"},
+            "http://mock-api/details/abc2": asyncio.TimeoutError(),
+            "http://mock-api/details/abc3": {"data": "three"},
+        }
+    )
+    result = asyncio.run(do_discovery_then_fetch_async(client, discovery_source))
+    assert result == ["one", "three"]
+
+
+def test_fetch_each_async_targets_discovery_to_entities(discovery_source):
+    discovery_source["discovery"]["targeted"] = True
+    discovery_source["entity_id_key"] = "study"
+    entity_source = {
+        "name": "entities",
+        "type": "rest",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/studies",
+        "response_data_key": "data",
+    }
+    client = FakeClient(
+        {
+            "http://mock-api/studies": {"data": [{"study": "GLIOMA01"}]},
+            "http://mock-api/discovery": {
+                "data": [{"id": "abc-GLIOMA01"}, {"id": "abc-UNMAPPED"}]
+            },
+            "http://mock-api/details/abc-GLIOMA01": {"data": "glioma"},
+        }
+    )
+    fetched = []
+
+    asyncio.run(
+        fetch_each_async(
+            client,
+            [discovery_source, entity_source],
+            lambda name, data: fetched.append(name),
+            "entities",
+        )
+    )
+    assert fetched == ["entities", "discoverer"]
+    assert [url for _, url, _ in client.calls] == [
+        "http://mock-api/studies",
+        "http://mock-api/discovery",
+        "http://mock-api/details/abc-GLIOMA01",
+    ]
+
+
+def test_fetch_from_source_async_tags_repository():
+    source = {
+        "name": "rest_source",
+        "type": "rest",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/data",
+    }
+    client = FakeClient({"http://mock-api/data": [{"id": "A"}]})
+    result = asyncio.run(fetch_from_source_async(client, source))
+    assert result == [{"id": "A", "repository": "rest_source"}]
+
+
+def test_fetch_from_source_async_returns_none_on_error():
+    source = {
+        "name": "rest_source",
+        "type": "rest",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/data",
+    }
+    client = FakeClient({})
+    assert asyncio.run(fetch_from_source_async(client, source)) is None
+
+
+def test_gather_ordered_cancels_on_failure():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(gather_ordered([slow(), fail()]))
+    assert cancelled == [True]
+
+
+@patch("core.async_fetcher.fetch_from_source_async")
+def test_fetch_all_async(mock_fetch):
+    async def fake_fetch(client, source):
+        return f"data_for_{source['name']}"
+
+    mock_fetch.side_effect = fake_fetch
+    sources = [{"name": "test_source_1"}, {"name": "test_source_2"}]
+    results = asyncio.run(fetch_all_async(sources, max_requests=4))
+    assert results == {
+        "test_source_1": "data_for_test_source_1",
+        "test_source_2": "data_for_test_source_2",
+    }
+
+
+@patch("core.async_fetcher.fetch_from_source_async")
+def test_iter_fetch_all_async_yields_in_completion_order(mock_fetch):
+    async def fake_fetch(client, source):
+        await asyncio.sleep(source["delay"])
+        return f"data_for_{source['name']}"
+
+    mock_fetch.side_effect = fake_fetch
+    sources = [
+        {"name": "slow_source", "delay": 0.2},
+        {"name": "fast_source", "delay": 0},
+    ]
+    assert list(iter_fetch_all_async(sources, max_requests=4)) == [
+        ("fast_source", "data_for_fast_source"),
+        ("slow_source", "data_for_slow_source"),
+    ]
+
+
+def test_fetch_raw_async_prefetches_pages_in_order():
+    source = {
+        "name": "raw",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/items",
+        "prefetch_pages": True,
+    }
+    routes = {
+        f"http://mock-api/items?page={page}": (
+            [page],
+            {"X-Wp-TotalPages": "3"},
+        )
+        for page in (2, 3)
+    }
+    routes["http://mock-api/items"] = (
+        [1],
+        {"X-Wp-TotalPages": "3", "Link": '<http://mock-api/items?page=2>; rel="next"'},
+    )
+    client = FakeClient(routes)
+    assert asyncio.run(fetch_raw_async(client, source)) == [1, 2, 3]
+
+
+def _prefetch_routes(total_pages):
+    routes = {
+        f"http://mock-api/items?page={page}": (
+            [page],
+            {"X-Wp-TotalPages": str(total_pages)},
+        )
+        for page in range(2, total_pages + 1)
+    }
+    routes["http://mock-api/items"] = (
+        [1],
+        {
+            "X-Wp-TotalPages": str(total_pages),
+            "Link": '<http://mock-api/items?page=2>; rel="next"',
+        },
+    )
+    return routes
+
+
+def test_fetch_raw_async_prefetch_stops_at_timed_out_page():
+    source = {
+        "name": "raw",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/items",
+        "prefetch_pages": True,
+        "max_concurrency": 3,
+        "retry": {"max_retries": 0},
+    }
+    routes = _prefetch_routes(5)
+    routes["http://mock-api/items?page=3"] = asyncio.TimeoutError()
+    client = FakeClient(routes)
+    assert asyncio.run(fetch_raw_async(client, source)) == [1, 2]
+
+
+def test_fetch_raw_async_prefetch_honours_max_concurrency():
+    source = {
+        "name": "raw",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/items",
+        "prefetch_pages": True,
+        "max_concurrency": 2,
+    }
+
+    class SlowClient(FakeClient):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def request(self, *args, **kwargs):
+            SlowClient.in_flight += 1
+            SlowClient.max_in_flight = max(SlowClient.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            SlowClient.in_flight -= 1
+            return await super().request(*args, **kwargs)
+
+    client = SlowClient(_prefetch_routes(8))
+    assert asyncio.run(fetch_raw_async(client, source)) == list(range(1, 9))
+    assert SlowClient.max_in_flight == 2
+
+
+def test_do_discovery_then_fetch_async_streaming(discovery_source):
+    discovery_source["stream_response"] = True
+    client = FakeClient(
+        {
+            "http://mock-api/discovery": {
+                "data": [{"id": "abc1"}, {"id": "xyz"}, {"id": "abc2"}]
+            },
+            "http://mock-api/details/abc1": {"data": [{"n": 1}]},
+            "http://mock-api/details/abc2": {"data": [{"n": 2}]},
+        }
+    )
+    result = asyncio.run(do_discovery_then_fetch_async(client, discovery_source))
+    assert result == [[{"n": 1}], [{"n": 2}]]
+
+
+def test_fetch_raw_async_serves_not_modified_pages_from_cache(tmp_path):
+    source = {
+        "name": "cached",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/items",
+        "response_data_key": "items",
+        "stream_response": True,
+        "cache": True,
+    }
+    client = FakeClient(
+        {"http://mock-api/items": ({"items": [{"id": 1}]}, {"ETag": '"v1"'})}
+    )
+    with patch("core.http_cache.http_cache", HttpCache(str(tmp_path))):
+        first = asyncio.run(fetch_raw_async(client, source))
+        second = asyncio.run(fetch_raw_async(client, source))
+
+    assert first == second == [{"id": 1}]
+    assert "headers" not in client.calls[0][2]
+    assert client.calls[1][2]["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_fetch_raw_async_requests_again_if_cached_body_was_evicted(tmp_path):
+    source = {
+        "name": "cached",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/items",
+        "response_data_key": "items",
+        "stream_response": True,
+        "cache": True,
+    }
+
+    class EvictingClient(FakeClient):
+        async def request(self, source, method, url, **kwargs):
+            # another request evicts the entry while this one is in flight
+            if kwargs.get("headers", {}).get("If-None-Match"):
+                for path in tmp_path.glob("*.body"):
+                    path.unlink()
+            return await super().request(source, method, url, **kwargs)
+
+    client = EvictingClient(
+        {"http://mock-api/items": ({"items": [{"id": 1}]}, {"ETag": '"v1"'})}
+    )
+    with patch("core.http_cache.http_cache", HttpCache(str(tmp_path))):
+        first = asyncio.run(fetch_raw_async(client, source))
+        second = asyncio.run(fetch_raw_async(client, source))
+
+    assert first == second == [{"id": 1}]
+    assert client.calls[1][2]["headers"] == {"If-None-Match": '"v1"'}
+    assert client.calls[2][2]["headers"] == {}
+    assert list(tmp_path.glob("*.body"))
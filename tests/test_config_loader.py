@@ -3,8 +3,9 @@ import os
 from unittest.mock import patch, mock_open
 
 import pytest
+import yaml
 
-from config_loader import ConfigHandler
+from config_loader import ConfigHandler, ConfigWatcher
 
 
 @pytest.fixture
@@ -96,7 +97,124 @@ def test_validate_missing_source_fields(valid_config):
         ConfigHandler(invalid_config).validate()
 
 
+def test_validate_invalid_pool_size(valid_config):
+    invalid_config = copy.deepcopy(valid_config)
+    invalid_config["sources"][0]["pool_size"] = 0
+    with pytest.raises(ValueError, match="Invalid 'pool_size' value in 'source'"):
+        ConfigHandler(invalid_config).validate()
+
+
+def test_validate_invalid_retry(valid_config):
+    invalid_config = copy.deepcopy(valid_config)
+    invalid_config["sources"][0]["retry"] = {"backoff_base": 0}
+    with pytest.raises(ValueError, match="Invalid 'backoff_base' value in 'retry'"):
+        ConfigHandler(invalid_config).validate()
+
+
+def test_validate_invalid_rate_limit(valid_config):
+    invalid_config = copy.deepcopy(valid_config)
+    invalid_config["sources"][0]["rate_limit"] = {"burst": 5}
+    with pytest.raises(
+        ValueError, match="Invalid 'requests_per_second' value in 'rate_limit'"
+    ):
+        ConfigHandler(invalid_config).validate()
+
+
+def test_validate_invalid_http_cache(valid_config):
+    invalid_config = copy.deepcopy(valid_config)
+    invalid_config["http_cache"] = {"max_size_mb": -1}
+    with pytest.raises(ValueError, match="Invalid 'max_size_mb' value in 'http_cache'"):
+        ConfigHandler(invalid_config).validate()
+
+
 @patch.dict(os.environ, {}, clear=True)
+def test_validate_invalid_fetch_workers(valid_config):
+    invalid_config = copy.deepcopy(valid_config)
+    invalid_config["fetch_workers"] = 0
+    with pytest.raises(ValueError, match="Invalid 'fetch_workers' value in 'config'"):
+        ConfigHandler(invalid_config).validate()
+
+
+def test_validate_invalid_map_workers(valid_config):
+    invalid_config = copy.deepcopy(valid_config)
+    invalid_config["map_workers"] = "4"
+    with pytest.raises(ValueError, match="Invalid 'map_workers' value in 'config'"):
+        ConfigHandler(invalid_config).validate()
+
+
+def test_validate_invalid_incremental(valid_config):
+    invalid_config = copy.deepcopy(valid_config)
+    invalid_config["incremental"] = "yes"
+    with pytest.raises(ValueError, match="'incremental' in config must be true"):
+        ConfigHandler(invalid_config).validate()
+
+
+def test_validate_invalid_stream_settings(valid_config):
+    invalid_config = copy.deepcopy(valid_config)
+    invalid_config["stream"] = "yes"
+    with pytest.raises(ValueError, match="'stream' in config must be true"):
+        ConfigHandler(invalid_config).validate()
+
+    invalid_config["stream"] = True
+    invalid_config["stream_chunk_size"] = 0
+    with pytest.raises(ValueError, match="Invalid 'stream_chunk_size' value"):
+        ConfigHandler(invalid_config).validate()
+
+
+@pytest.mark.parametrize("match_workers", [0, -2, "4", True])
+def test_validate_invalid_match_workers(valid_config, match_workers):
+    invalid_config = copy.deepcopy(valid_config)
+    invalid_config["sources"][0]["match_workers"] = match_workers
+    with pytest.raises(ValueError, match="Invalid 'match_workers' value"):
+        ConfigHandler(invalid_config).validate()
+
+
+@pytest.mark.parametrize(
+    "match_strategy",
+    [
+        "exact",
+        ["exact", "fuzzy"],
+        {"order": ["normalized"], "strip_prefixes": ["icdc_"]},
+    ],
+)
+def test_validate_match_strategy(valid_config, match_strategy):
+    config = copy.deepcopy(valid_config)
+    config["sources"][0]["match_strategy"] = match_strategy
+    ConfigHandler(config).validate()
+
+
+@pytest.mark.parametrize(
+    "match_strategy, message",
+    [
+        ("soundex", "Invalid match strategy 'soundex'"),
+        ([], "Invalid 'match_strategy'"),
+        (["exact", "exact"], "Duplicate strategy"),
+        ({"strip_prefixes": "icdc_"}, "Invalid 'strip_prefixes' value"),
+        ({"fuzzy_threshold": 0}, "Invalid 'fuzzy_threshold' value"),
+    ],
+)
+def test_validate_invalid_match_strategy(valid_config, match_strategy, message):
+    invalid_config = copy.deepcopy(valid_config)
+    invalid_config["sources"][0]["match_strategy"] = match_strategy
+    with pytest.raises(ValueError, match=message):
+        ConfigHandler(invalid_config).validate()
+
+
+@pytest.mark.parametrize(
+    "key, value, message",
+    [
+        ("map_executor", "threads", "Invalid 'map_executor' value"),
+        ("map_processes", 0, "map_processes"),
+        ("map_chunk_size", "64", "map_chunk_size"),
+    ],
+)
+def test_validate_invalid_map_executor(valid_config, key, value, message):
+    invalid_config = copy.deepcopy(valid_config)
+    invalid_config["sources"][0][key] = value
+    with pytest.raises(ValueError, match=message):
+        ConfigHandler(invalid_config).validate()
+
+
 def test_env_var_fallback(yaml_with_env_var):
     config_yaml = mock_open(read_data=yaml_with_env_var)
     with patch("builtins.open", config_yaml):
@@ -110,3 +228,25 @@ def test_env_var_override(yaml_with_env_var):
     with patch("builtins.open", config_yaml):
         handler = ConfigHandler.load_config_with_env_vars("dummy-config.yaml")
     assert handler.config["project"] == "FromEnvVar"
+
+
+def test_config_watcher_reloads_changed_file(tmp_path, valid_config):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(valid_config))
+    watcher = ConfigWatcher(str(config_path))
+
+    first = watcher.load()
+    first["project"] = "MODIFIED_DURING_RUN"
+    with patch.object(ConfigHandler, "load_config_with_env_vars") as mock_load:
+        assert watcher.load()["project"] == "TEST_PROJECT"
+        mock_load.assert_not_called()
+
+    config_path.write_text(yaml.safe_dump(dict(valid_config, project="RELOADED")))
+    os.utime(config_path, ns=(0, 1))
+    assert watcher.has_changed()
+    assert watcher.load()["project"] == "RELOADED"
+    assert not watcher.has_changed()
+
+    config_path.write_text("project: [unclosed")
+    os.utime(config_path, ns=(0, 2))
+    assert watcher.load()["project"] == "RELOADED"
@@ -1,4 +1,5 @@
 import copy
+import threading
 from unittest.mock import patch
 
 import pytest
@@ -20,6 +21,13 @@ FETCHED_DATA = {
 }
 
 
+@pytest.fixture(autouse=True)
+def stats_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "core.dispatcher.DEFAULT_STATS_FILE", str(tmp_path / "source_stats.json")
+    )
+
+
 @pytest.fixture
 def config():
     return {"entity_source": "source_A", "sources": SOURCE_CONFIG}
@@ -51,6 +59,27 @@ def test_fetch_all_parallel(mock_fetch):
     }
 
 
+def test_batch_fetch_run_rejects_different_http_cache_settings(tmp_path):
+    from core import http_cache
+    from core.dispatcher import batch_fetch_run, prepare_fetch
+
+    def project(name, cache_dir):
+        return {
+            "project": name,
+            "sources": [{"name": name, "cache": True}],
+            "http_cache": {"dir": str(tmp_path / cache_dir)},
+        }
+
+    with patch("core.http_cache.http_cache", None), batch_fetch_run():
+        prepare_fetch(project("first", "shared"))
+        shared = http_cache.http_cache
+        prepare_fetch(project("second", "shared"))
+        with pytest.raises(ValueError, match="Project 'third' uses different"):
+            prepare_fetch(project("third", "other"))
+        assert http_cache.http_cache is shared
+        assert shared.cache_dir == str(tmp_path / "shared")
+
+
 @patch("core.dispatcher.collect_mappings")
 @patch("core.dispatcher.get_post_processor")
 def test_match_all(mock_get_pp, mock_collect):
@@ -99,3 +128,443 @@ def test_run_dispatcher_missing_entities(mock_fetch_all, config):
 
     result = run_dispatcher(config, parallel=False)
     assert result == []
+
+
+@patch("core.dispatcher.run_fetch_all_async")
+@patch("core.dispatcher.match_all")
+def test_run_dispatcher_async_engine(mock_match_all, mock_fetch_async, config):
+    mock_fetch_async.return_value = FETCHED_DATA
+    mock_match_all.return_value = ["test_mapping_1"]
+    from core.dispatcher import run_dispatcher
+
+    result = run_dispatcher(config, fetch_engine="async")
+    assert result == ["test_mapping_1"]
+    mock_fetch_async.assert_called_once()
+
+
+@patch("core.dispatcher.fetch_all")
+@patch("core.dispatcher.match_all")
+def test_run_dispatcher_replays_saved_snapshot(
+    mock_match_all, mock_fetch_all, config, tmp_path
+):
+    mock_fetch_all.return_value = FETCHED_DATA
+    mock_match_all.return_value = ["test_mapping_1"]
+    config["snapshot_dir"] = str(tmp_path)
+    from core.dispatcher import run_dispatcher
+
+    run_dispatcher(config, save_snapshot=True)
+    mock_fetch_all.reset_mock()
+
+    result = run_dispatcher(config, from_snapshot="latest")
+    assert result == ["test_mapping_1"]
+    mock_fetch_all.assert_not_called()
+    assert mock_match_all.call_args.args[2] == FETCHED_DATA
+
+
+PIPELINE_SOURCES = SOURCE_CONFIG + [
+    {
+        "name": "source_C",
+        "dataset_base_url": "https://mock-data-url/{id}",
+        "dataset_base_url_param": "id",
+    },
+]
+
+
+@patch("core.dispatcher.fetch_from_source")
+@patch("core.dispatcher.collect_mappings")
+@patch("core.dispatcher.get_post_processor")
+def test_run_dispatcher_pipeline_maps_before_slow_fetch_completes(
+    mock_get_pp, mock_collect, mock_fetch, config
+):
+    mapped_b = threading.Event()
+
+    def fetch(source):
+        if source["name"] == "source_C":
+            # only finishes once source_B was mapped
+            assert mapped_b.wait(timeout=5)
+        return FETCHED_DATA.get(source["name"], [{"entity_id": 2}])
+
+    def collect(**kwargs):
+        if kwargs["repository_name"] == "source_B":
+            mapped_b.set()
+        return [f"mapping_from_{kwargs['repository_name']}"]
+
+    mock_get_pp.return_value = None
+    mock_fetch.side_effect = fetch
+    mock_collect.side_effect = collect
+    config["sources"] = PIPELINE_SOURCES
+    from core.dispatcher import run_dispatcher
+
+    result = run_dispatcher(config, pipeline=True)
+    assert result == ["mapping_from_source_B", "mapping_from_source_C"]
+    assert mock_collect.call_args_list[0].kwargs["entities"] == ENTITIES
+
+
+@patch("core.dispatcher.fetch_from_source")
+@patch("core.dispatcher.collect_mappings")
+def test_run_dispatcher_pipeline_missing_entities(mock_collect, mock_fetch, config):
+    mock_fetch.side_effect = lambda s: None if s["name"] == "source_A" else []
+    from core.dispatcher import run_dispatcher
+
+    config["pipeline"] = True
+    result = run_dispatcher(config)
+    assert result == []
+    mock_collect.assert_not_called()
+
+
+@patch("core.dispatcher.iter_fetch_all_async")
+@patch("core.dispatcher.match_all")
+@patch("core.dispatcher.collect_mappings")
+@patch("core.dispatcher.get_post_processor")
+def test_run_dispatcher_pipeline_saves_snapshot(
+    mock_get_pp, mock_collect, mock_match_all, mock_fetch_async, config, tmp_path
+):
+    mock_get_pp.return_value = None
+    mock_fetch_async.return_value = iter(reversed(list(FETCHED_DATA.items())))
+    mock_collect.return_value = ["test_mapping_1"]
+    config["snapshot_dir"] = str(tmp_path)
+    from core.dispatcher import run_dispatcher
+
+    result = run_dispatcher(
+        config, fetch_engine="async", save_snapshot=True, pipeline=True
+    )
+    assert result == ["test_mapping_1"]
+    mock_collect.assert_called_once()
+
+    run_dispatcher(config, from_snapshot="latest", pipeline=True)
+    assert mock_match_all.call_args.args[2] == FETCHED_DATA
+
+
+@patch("core.dispatcher.fetch_from_source")
+def test_fetch_all_parallel_starts_longest_sources_first(mock_fetch, tmp_path):
+    started = []
+
+    def fetch(source):
+        started.append(source["name"])
+        return [source["name"]]
+
+    mock_fetch.side_effect = fetch
+    from core.dispatcher import fetch_all_parallel
+    from core.source_stats import SourceStats
+
+    stats = SourceStats(str(tmp_path / "stats.json"))
+    stats.record("test_source_1", 1.0)
+    stats.record("test_source_2", 60.0)
+    test_sources = [{"name": "test_source_1"}, {"name": "test_source_2"}]
+
+    results = fetch_all_parallel(test_sources, max_workers=1, source_stats=stats)
+    assert started == ["test_source_2", "test_source_1"]
+    assert results == {
+        "test_source_1": ["test_source_1"],
+        "test_source_2": ["test_source_2"],
+    }
+    assert stats.get_duration("test_source_1") < 1.0
+
+
+@patch("core.dispatcher.fetch_all_parallel")
+@patch("core.dispatcher.match_all")
+def test_run_dispatcher_uses_configured_fetch_workers(
+    mock_match_all, mock_fetch_parallel, config
+):
+    mock_fetch_parallel.return_value = FETCHED_DATA
+    config["fetch_workers"] = 3
+    from core.dispatcher import run_dispatcher
+
+    run_dispatcher(config, parallel=True)
+    assert mock_fetch_parallel.call_args.args[1] == 3
+
+    run_dispatcher(config, parallel=True, fetch_workers=5)
+    assert mock_fetch_parallel.call_args.args[1] == 5
+
+
+def test_match_all_in_processes_matches_serial_order():
+    names = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf"]
+    entities = [{"study": name.upper()} for name in names]
+    mapped_source = {
+        "name": "source_B",
+        "entity_id_key": "study",
+        "match_key": "collection_id",
+        "dataset_base_url": "https://mock-data-url/{id}",
+        "dataset_base_url_param": "id",
+        "post_processor": "clean_idc_metadata",
+    }
+    sources = [
+        {"name": "source_A"},
+        mapped_source,
+        dict(mapped_source, name="source_C", post_processor=None),
+        dict(mapped_source, name="source_D"),
+    ]
+    fetched_data = {
+        "source_A": entities,
+        "source_B": [
+            [{"collection_id": name, "description": f"<p>B {name}</p>"}]
+            for name in names[::2]
+        ],
+        "source_C": [[{"collection_id": "delta", "description": "<b>C</b>"}]],
+        "source_D": None,
+    }
+    from core.dispatcher import match_all
+    from core.run_report import RunReport
+
+    serial_report, parallel_report = RunReport(), RunReport()
+    serial = match_all(
+        entities,
+        sources,
+        copy.deepcopy(fetched_data),
+        "source_A",
+        map_workers=1,
+        report=serial_report,
+    )
+    parallel = match_all(
+        entities,
+        sources,
+        copy.deepcopy(fetched_data),
+        "source_A",
+        map_workers=3,
+        report=parallel_report,
+    )
+    assert parallel == serial
+    # both modes count the source records going into matching
+    assert [s["records_in"] for s in serial_report.get_stages()] == [4, 1, None]
+    assert [s["records_in"] for s in parallel_report.get_stages()] == [5]
+    assert [m["entity_id"] for m in parallel] == [
+        "ALPHA",
+        "CHARLIE",
+        "ECHO",
+        "GOLF",
+        "DELTA",
+    ]
+    assert parallel[0]["CRDCLinks"][0]["metadata"][0]["description"] == "B alpha"
+
+
+@patch("core.dispatcher.collect_source_mappings")
+@patch("core.dispatcher.ProcessPoolExecutor")
+def test_map_sources_in_processes_skips_pool_without_parallel_work(
+    mock_pool, mock_collect
+):
+    from core.dispatcher import map_sources_in_processes
+
+    mock_collect.return_value = [{"entity_id": 1, "CRDCLinks": []}]
+    source = SOURCE_CONFIG[1]
+
+    assert map_sources_in_processes(
+        ENTITIES, [source], {"source_B": None}, map_workers=4
+    ) == [[]]
+    assert map_sources_in_processes([], [source], FETCHED_DATA, map_workers=4) == [[]]
+    mock_collect.assert_not_called()
+
+    results = map_sources_in_processes(
+        ENTITIES[:1], [source], FETCHED_DATA, map_workers=4
+    )
+    assert results == [[{"entity_id": 1, "CRDCLinks": []}]]
+    mock_collect.assert_called_once_with(
+        ENTITIES[:1], source, FETCHED_DATA["source_B"], map_executor="sequential"
+    )
+    mock_pool.assert_not_called()
+
+
+@patch("core.dispatcher.fetch_all")
+@patch("core.dispatcher.match_all")
+def test_run_dispatcher_passes_map_workers(mock_match_all, mock_fetch_all, config):
+    mock_fetch_all.return_value = FETCHED_DATA
+    config["map_workers"] = 4
+    from core.dispatcher import run_dispatcher
+
+    run_dispatcher(config)
+    assert mock_match_all.call_args.args[4] == 4
+
+
+TARGETED_SOURCE = {
+    "name": "targeted",
+    "type": "rest",
+    "entity_id_key": "id",
+    "discovery": {"targeted": True},
+}
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+@patch("core.dispatcher.fetch_from_source")
+def test_fetch_targeted_source_after_entities(mock_fetch, parallel):
+    calls = []
+
+    def fetch(source, entity_ids=None):
+        calls.append((source["name"], entity_ids))
+        return ENTITIES if source["name"] == "source_A" else ["data"]
+
+    mock_fetch.side_effect = fetch
+    from core.dispatcher import fetch_all, fetch_all_parallel
+
+    sources = [TARGETED_SOURCE, {"name": "source_A"}]
+    if parallel:
+        results = fetch_all_parallel(sources, 2, entity_source_name="source_A")
+    else:
+        results = fetch_all(sources, entity_source_name="source_A")
+
+    assert calls == [("source_A", None), ("targeted", [1, 2])]
+    assert results == {"targeted": ["data"], "source_A": ENTITIES}
+
+
+@patch("core.dispatcher.fetch_from_source")
+def test_fetch_targeted_source_skipped_without_entities(mock_fetch):
+    mock_fetch.return_value = None
+    from core.dispatcher import fetch_all_parallel
+
+    results = fetch_all_parallel(
+        [{"name": "source_A"}, TARGETED_SOURCE], 2, entity_source_name="source_A"
+    )
+    assert results == {"source_A": None, "targeted": None}
+    mock_fetch.assert_called_once()
+
+
+def test_batch_fetch_run_shares_retry_budget_and_dedup():
+    from core.dispatcher import batch_fetch_run, prepare_fetch
+    from core.request_dedup import request_dedup
+    from core.retry import DEFAULT_RETRY_BUDGET, get_retry_defaults, get_retry_policy
+
+    first = {"sources": [{"name": "a"}], "retry": {"budget": 5, "max_retries": 1}}
+    second = {
+        "sources": [{"name": "b", "retry": {"max_retries": 4}}, {"name": "c"}],
+        "retry": {"max_retries": 2},
+    }
+
+    with batch_fetch_run() as budget:
+        assert prepare_fetch(first) is budget
+        assert prepare_fetch(second) is budget
+        assert request_dedup.active
+        max_retries = [
+            get_retry_policy(source, get_retry_defaults(source)).max_retries
+            for source in first["sources"] + second["sources"]
+        ]
+        assert max_retries == [1, 4, 2]
+        assert get_retry_defaults({"name": "a"}) == {}
+
+    assert budget.total == 5 + DEFAULT_RETRY_BUDGET
+    assert first["sources"] == [{"name": "a"}]
+    assert second["sources"] == [
+        {"name": "b", "retry": {"max_retries": 4}},
+        {"name": "c"},
+    ]
+    assert get_retry_defaults(first["sources"][0]) == {}
+    assert not request_dedup.active
+    assert prepare_fetch({"sources": []}) is not budget
+
+
+@patch("core.dispatcher.collect_mappings")
+def test_match_all_reuses_mappings_of_unchanged_sources(mock_collect, tmp_path):
+    from core.dispatcher import match_all
+    from core.run_state import RunState
+
+    mock_collect.return_value = [{"entity_id": 1, "CRDCLinks": []}]
+    path = str(tmp_path / "state.json.gz")
+    config = {"entity_source": "source_A", "sources": SOURCE_CONFIG}
+
+    for expected_calls in (1, 1):
+        run_state = RunState(path)
+        run_state.check_unchanged(config, FETCHED_DATA)
+        results = match_all(
+            ENTITIES, SOURCE_CONFIG, FETCHED_DATA, "source_A", run_state=run_state
+        )
+        run_state.save()
+        assert results == [{"entity_id": 1, "CRDCLinks": []}]
+        assert mock_collect.call_count == expected_calls
+
+
+@patch("core.dispatcher.fetch_from_source")
+@patch("core.dispatcher.collect_mappings")
+@patch("core.dispatcher.get_post_processor")
+def test_run_dispatcher_pipeline_detects_unchanged_run(
+    mock_get_pp, mock_collect, mock_fetch, config, tmp_path
+):
+    from core.dispatcher import run_dispatcher
+    from core.run_state import RunState
+
+    mock_get_pp.return_value = None
+    mock_fetch.side_effect = lambda source: FETCHED_DATA[source["name"]]
+    mock_collect.return_value = [{"entity_id": 1, "CRDCLinks": []}]
+    path = str(tmp_path / "state.json.gz")
+
+    run_state = RunState(path)
+    run_dispatcher(config, pipeline=True, run_state=run_state)
+    assert run_state.inputs is not None and not run_state.unchanged
+    # as the writer does once every document was written
+    run_state.filter_changed_documents([], "test-index", ["https://mock-host"])
+    run_state.commit_documents()
+    run_state.save()
+
+    run_state = RunState(path)
+    run_dispatcher(config, pipeline=True, run_state=run_state)
+    assert run_state.unchanged
+
+    # a non-pipelined run of the same inputs short-circuits too
+    run_state = RunState(path)
+    run_dispatcher(config, run_state=run_state)
+    assert run_state.unchanged
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+@patch("core.dispatcher.match_all")
+@patch("core.dispatcher.fetch_from_source")
+def test_run_dispatcher_records_fetch_stages(mock_fetch, mock_match_all, parallel):
+    from core.dispatcher import run_dispatcher
+    from core.run_report import RunReport
+
+    mock_fetch.side_effect = lambda source: FETCHED_DATA[source["name"]]
+    report = RunReport("TEST")
+    config = {"entity_source": "source_A", "sources": SOURCE_CONFIG}
+
+    run_dispatcher(config, parallel=parallel, report=report)
+
+    stages = sorted(report.get_stages(), key=lambda record: record["source"])
+    assert [(s["stage"], s["source"], s["records_out"]) for s in stages] == [
+        ("fetch", "source_A", 2),
+        ("fetch", "source_B", 2),
+    ]
+    assert mock_match_all.call_args.args[-1] is report
+
+
+@patch("core.dispatcher.iter_raw_pages")
+def test_iter_raw_records_streams_and_skips_failed_sources(mock_pages):
+    from core.dispatcher import iter_raw_records
+    from core.run_report import RunReport
+
+    def pages(source):
+        if source["name"] == "broken":
+            yield [{"id": "b1"}]
+            raise RuntimeError("Request failed")
+        yield [{"id": "a1"}, {"id": "a2", "repository": "IDC"}]
+        yield {"id": "a3"}
+
+    mock_pages.side_effect = pages
+    config = {
+        "sources": [
+            {"name": "broken", "type": "rest_raw"},
+            {"name": "TCIA", "type": "rest_raw"},
+        ]
+    }
+    report = RunReport()
+
+    records = list(iter_raw_records(config, report))
+
+    assert records == [
+        {"id": "b1", "repository": "broken"},
+        {"id": "a1", "repository": "TCIA"},
+        {"id": "a2", "repository": "IDC"},
+        {"id": "a3", "repository": "TCIA"},
+    ]
+    assert [stage["records_out"] for stage in report.get_stages()] == [1, 3]
+
+
+@patch("core.dispatcher.finish_fetch")
+@patch("core.dispatcher.iter_raw_pages")
+def test_iter_raw_records_finishes_fetch_when_closed_early(mock_pages, mock_finish):
+    from core.dispatcher import iter_raw_records
+
+    mock_pages.return_value = iter([[{"id": "a1"}, {"id": "a2"}]])
+    records = iter_raw_records({"sources": [{"name": "TCIA", "type": "rest_raw"}]})
+
+    assert next(records) == {"id": "a1", "repository": "TCIA"}
+    mock_finish.assert_not_called()
+    records.close()
+
+    mock_finish.assert_called_once()
+    assert mock_finish.call_args.args[0] == "threaded"
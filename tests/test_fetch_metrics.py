@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+from core.fetch_metrics import FetchMetrics, RequestTimer, get_active_timer, percentile
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 21))
+    assert percentile(values, 50) == 10
+    assert percentile(values, 95) == 19
+    assert percentile(values, 100) == 20
+    assert percentile([], 50) is None
+
+
+def test_timer_records_request():
+    metrics = FetchMetrics()
+    timer = RequestTimer("IDC", "https://api.example.org/collections?page=2")
+    timer.attempts = 2
+    timer.ttfb = 0.2
+    timer.add_connect(0.05)
+    timer.add_response(1000, 250)
+    with timer.time_decode():
+        pass
+    timer.finish([1, 2, 3], metrics)
+
+    summary = metrics.summarize("endpoint")
+    stats = summary["IDC https://api.example.org/collections"]
+    assert stats["requests"] == 1
+    assert stats["attempts"] == 2
+    assert stats["records"]["max"] == 3
+    assert stats["wire_bytes"]["max"] == 250
+    assert stats["decoded_bytes"]["max"] == 1000
+    assert stats["connect"]["max"] == 0.05
+    assert stats["dns"] is None
+
+
+def test_activate_sets_thread_timer():
+    timer = RequestTimer("IDC", "https://api.example.org/collections")
+    assert get_active_timer() is None
+    with timer.activate():
+        assert get_active_timer() is timer
+    assert get_active_timer() is None
+
+
+def test_format_summary_per_source():
+    metrics = FetchMetrics()
+    for total in (0.1, 0.2, 0.3):
+        metrics.record(
+            "TCIA",
+            "https://api.example.org/values",
+            {
+                "total": total,
+                "ttfb": None,
+                "connect": None,
+                "dns": None,
+                "decode": 0.01,
+                "wire_bytes": 2048,
+                "decoded_bytes": 4096,
+                "records": 10,
+                "attempts": 1,
+            },
+        )
+
+    lines = metrics.format_summary().splitlines()
+    assert lines[0].split()[:3] == ["source", "reqs", "tries"]
+    row = lines[2].split()
+    assert row[:3] == ["TCIA", "3", "3"]
+    assert "0.200/0.300/0.300" in row
+    assert "2.0/2.0/2.0" in row
+    assert row.count("-") == 3
+
+
+def test_log_summary_skips_empty_metrics():
+    with patch("core.fetch_metrics.logger") as mock_logger:
+        FetchMetrics().log_summary()
+    mock_logger.info.assert_not_called()
@@ -1,14 +1,27 @@
+import json
 from unittest.mock import patch, Mock
 
 import pytest
+import requests
 
 from core.fetcher import (
     fetch_from_source,
     fetch_direct,
     fetch_graphql,
+    fetch_raw,
     do_discovery_then_fetch,
+    filter_discovery_matches,
+    get_deferred_sources,
+    build_prefetch_urls,
     extract_response_data,
+    iter_ordered,
+    iter_raw_pages,
+    map_ordered,
 )
+from core.fetch_metrics import FetchMetrics
+from core.http_cache import HttpCache
+from core.rate_limiter import RateLimiterRegistry
+from core.retry import RetryBudget
 
 
 @pytest.fixture
@@ -96,7 +109,7 @@ def test_fetch_from_source_unknown_type():
     assert result is None
 
 
-@patch("core.fetcher.requests.get")
+@patch("core.fetcher.send_request")
 def test_fetch_direct_success(mock_get, rest_source):
     mock_get.return_value.ok = True
     mock_get.return_value.json.return_value = {"test_data": [{"id": "A"}]}
@@ -104,7 +117,7 @@ def test_fetch_direct_success(mock_get, rest_source):
     assert data == [{"id": "A"}]
 
 
-@patch("core.fetcher.requests.get")
+@patch("core.fetcher.send_request")
 def test_fetch_direct_with_filtering(mock_get):
     test_source = {
         "name": "filtered",
@@ -123,7 +136,7 @@ def test_fetch_direct_with_filtering(mock_get):
     assert data == [{"id": "match_1"}]
 
 
-@patch("core.fetcher.requests.post")
+@patch("core.fetcher.send_request")
 def test_fetch_graphql_success(mock_post, graphql_source):
     mock_post.return_value.ok = True
     mock_post.return_value.json.return_value = {"data": {"items": [1, 2, 3]}}
@@ -131,7 +144,7 @@ def test_fetch_graphql_success(mock_post, graphql_source):
     assert result == [1, 2, 3]
 
 
-@patch("core.fetcher.requests.get")
+@patch("core.fetcher.send_request")
 def test_do_discovery_then_fetch_success(mock_get, rest_source_discovery):
     discovery_response = Mock()
     discovery_response.ok = True
@@ -160,3 +173,350 @@ def test_extract_response_data_no_key():
     response_json = {"hello": "world"}
     result = extract_response_data(test_source, response_json)
     assert result == {"hello": "world"}
+
+
+@patch("core.fetcher.send_request")
+def test_do_discovery_then_fetch_concurrent_keeps_order(
+    mock_send, rest_source_discovery
+):
+    rest_source_discovery["max_concurrency"] = 4
+    discovery_ids = [f"abc{i}" for i in range(6)]
+
+    def respond(source, method, url, **kwargs):
+        response = Mock()
+        response.ok = True
+        if url.endswith("/discovery"):
+            response.json.return_value = {
+                "data": [{"id": i} for i in discovery_ids + ["xyz"]]
+            }
+        else:
+            response.json.return_value = {"data": {"val": url.rsplit("/", 1)[-1]}}
+        return response
+
+    mock_send.side_effect = respond
+    result = do_discovery_then_fetch(rest_source_discovery)
+    assert result == [{"val": i} for i in discovery_ids]
+
+
+@patch("core.fetcher.send_request")
+def test_do_discovery_then_fetch_concurrent_skips_timeouts(
+    mock_send, rest_source_discovery
+):
+    rest_source_discovery["max_concurrency"] = 3
+    rest_source_discovery["retry"] = {"max_retries": 0}
+
+    def respond(source, method, url, **kwargs):
+        if url.endswith("/abc2"):
+            raise requests.exceptions.Timeout()
+        response = Mock()
+        response.ok = True
+        if url.endswith("/discovery"):
+            response.json.return_value = {
+                "data": [{"id": "abc1"}, {"id": "abc2"}, {"id": "abc3"}]
+            }
+        else:
+            response.json.return_value = {"data": url.rsplit("/", 1)[-1]}
+        return response
+
+    mock_send.side_effect = respond
+    result = do_discovery_then_fetch(rest_source_discovery)
+    assert result == ["abc1", "abc3"]
+
+
+def test_map_ordered_sequential_and_concurrent():
+    args = [(i,) for i in range(10)]
+    assert map_ordered(lambda x: x * 2, args) == [i * 2 for i in range(10)]
+    assert map_ordered(lambda x: x * 2, args, 4) == [i * 2 for i in range(10)]
+
+
+def test_iter_ordered_bounds_calls_started_ahead():
+    started = []
+
+    def work(x):
+        started.append(x)
+        return x * 2
+
+    results = iter_ordered(work, [(i,) for i in range(20)], 2)
+    assert next(results) == 0
+    assert len(started) <= 5
+    assert list(results) == [i * 2 for i in range(1, 20)]
+
+
+@pytest.fixture
+def prefetch_source():
+    return {
+        "name": "raw_source",
+        "type": "rest_raw",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/items?per_page=2",
+        "prefetch_pages": True,
+        "max_concurrency": 3,
+    }
+
+
+def _page_response(page, total_pages=4):
+    response = Mock()
+    response.ok = True
+    response.json.return_value = [f"p{page}_a", f"p{page}_b"]
+    response.headers = {
+        "X-Wp-TotalPages": str(total_pages),
+        "Link": f'<http://mock-api/items?per_page=2&page={page + 1}>; rel="next"',
+    }
+    return response
+
+
+def test_build_prefetch_urls(prefetch_source):
+    urls = build_prefetch_urls(
+        prefetch_source, "http://mock-api/items?per_page=2&page=2", 4
+    )
+    assert urls == [
+        "http://mock-api/items?per_page=2&page=2",
+        "http://mock-api/items?per_page=2&page=3",
+        "http://mock-api/items?per_page=2&page=4",
+    ]
+
+
+def test_build_prefetch_urls_disabled_or_unknown_param(prefetch_source):
+    next_url = "http://mock-api/items?per_page=2&offset=2"
+    assert build_prefetch_urls(prefetch_source, next_url, 4) == []
+    prefetch_source["prefetch_pages"] = False
+    assert build_prefetch_urls(prefetch_source, next_url + "&page=2", 4) == []
+
+
+@patch("core.fetcher.send_request")
+def test_fetch_raw_prefetch_keeps_page_order(mock_send, prefetch_source):
+    def respond(source, method, url, **kwargs):
+        page = int(url.rsplit("&page=", 1)[-1]) if "&page=" in url else 1
+        return _page_response(page)
+
+    mock_send.side_effect = respond
+    result = fetch_raw(prefetch_source)
+    assert result == [f"p{page}_{x}" for page in range(1, 5) for x in "ab"]
+    assert mock_send.call_count == 4
+
+
+@patch("core.fetcher.send_request")
+def test_fetch_raw_prefetch_stops_at_timed_out_page(mock_send, prefetch_source):
+    prefetch_source["retry"] = {"max_retries": 0}
+
+    def respond(source, method, url, **kwargs):
+        if url.endswith("page=3"):
+            raise requests.exceptions.Timeout()
+        page = int(url.rsplit("&page=", 1)[-1]) if "&page=" in url else 1
+        return _page_response(page, total_pages=5)
+
+    mock_send.side_effect = respond
+    result = fetch_raw(prefetch_source)
+    assert result == ["p1_a", "p1_b", "p2_a", "p2_b"]
+
+
+@patch("core.fetcher.send_request")
+def test_iter_raw_pages_fetches_pages_lazily(mock_send, prefetch_source):
+    prefetch_source["prefetch_pages"] = False
+    mock_send.side_effect = lambda source, method, url, **kwargs: _page_response(
+        int(url.rsplit("&page=", 1)[-1]) if "&page=" in url else 1
+    )
+
+    pages = iter_raw_pages(prefetch_source)
+    assert next(pages) == ["p1_a", "p1_b"]
+    assert mock_send.call_count == 1
+    assert list(pages) == [[f"p{page}_a", f"p{page}_b"] for page in range(2, 5)]
+    assert mock_send.call_count == 4
+
+
+@patch("core.fetcher.send_request")
+def test_fetch_direct_streaming_filters_records(mock_send):
+    test_source = {
+        "name": "streamed",
+        "type": "rest",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/data",
+        "match_key": "id",
+        "filter_prefix": "match",
+        "response_data_key": "test_data",
+        "stream_response": True,
+    }
+    body = b'{"test_data": [{"id": "match_1"}, {"id": "---"}, {"id": "match_2"}]}'
+    mock_send.return_value.ok = True
+    mock_send.return_value.iter_content.return_value = [body[:20], body[20:]]
+    data = fetch_direct(test_source)
+    assert data == [{"id": "match_1"}, {"id": "match_2"}]
+    mock_send.return_value.json.assert_not_called()
+
+
+@patch("core.fetcher.send_request")
+def test_fetch_direct_revalidates_cached_response(mock_send, rest_source, tmp_path):
+    rest_source["cache"] = True
+    fresh = Mock(ok=True, status_code=200, headers={"ETag": '"v1"'})
+    fresh.content = b'{"test_data": [{"id": 1}]}'
+    fresh.json.return_value = {"test_data": [{"id": 1}]}
+    not_modified = Mock(ok=False, status_code=304)
+    mock_send.side_effect = [fresh, not_modified]
+
+    with patch("core.http_cache.http_cache", HttpCache(str(tmp_path))):
+        first = fetch_direct(rest_source)
+        second = fetch_direct(rest_source)
+
+    assert first == second == [{"id": 1}]
+    assert "headers" not in mock_send.call_args_list[0].kwargs
+    assert mock_send.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+    not_modified.json.assert_not_called()
+
+
+@patch("core.fetcher.send_request")
+def test_fetch_direct_reextracts_cached_body_for_new_settings(
+    mock_send, rest_source, tmp_path
+):
+    rest_source["cache"] = True
+    fresh = Mock(ok=True, status_code=200, headers={"ETag": '"v1"'})
+    fresh.content = b'{"test_data": [1], "other": [2]}'
+    fresh.json.return_value = {"test_data": [1], "other": [2]}
+    mock_send.side_effect = [fresh, Mock(ok=False, status_code=304)]
+
+    with patch("core.http_cache.http_cache", HttpCache(str(tmp_path))):
+        assert fetch_direct(rest_source) == [1]
+        rest_source["response_data_key"] = "other"
+        assert fetch_direct(rest_source) == [2]
+
+
+@pytest.mark.parametrize("cache", [False, True])
+@patch("core.fetcher.send_request")
+def test_fetch_direct_closes_error_responses(mock_send, cache, rest_source, tmp_path):
+    rest_source["cache"] = cache
+    rest_source["stream_response"] = True
+    not_found = Mock(ok=False, status_code=404, reason="Not Found", headers={})
+    mock_send.return_value = not_found
+
+    with patch("core.http_cache.http_cache", HttpCache(str(tmp_path))):
+        with pytest.raises(RuntimeError, match="Fetch failed: 404"):
+            fetch_direct(rest_source)
+
+    not_found.close.assert_called_once()
+    not_found.iter_content.assert_not_called()
+
+
+@patch("core.fetcher.send_request")
+def test_fetch_direct_requests_again_if_cached_body_was_evicted(
+    mock_send, rest_source, tmp_path
+):
+    rest_source["cache"] = True
+
+    def fresh(items):
+        response = Mock(ok=True, status_code=200, headers={"ETag": '"v1"'})
+        response.content = json.dumps({"test_data": items}).encode()
+        response.json.return_value = {"test_data": items}
+        return response
+
+    def evict_then_not_modified():
+        # another request evicts the entry while this one is in flight
+        for path in tmp_path.glob("*.body"):
+            path.unlink()
+        return Mock(ok=False, status_code=304)
+
+    responses = iter([fresh([1]), None, fresh([2])])
+    mock_send.side_effect = lambda *args, **kwargs: (
+        next(responses) or evict_then_not_modified()
+    )
+
+    with patch("core.http_cache.http_cache", HttpCache(str(tmp_path))):
+        assert fetch_direct(rest_source) == [1]
+        assert fetch_direct(rest_source) == [2]
+
+    assert mock_send.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert mock_send.call_args_list[2].kwargs["headers"] == {}
+
+
+@patch("core.retry.time.sleep")
+@patch("core.fetcher.send_request")
+def test_fetch_direct_retries_timeouts_and_retryable_statuses(
+    mock_send, mock_sleep, rest_source
+):
+    unavailable = Mock(ok=False, status_code=503, reason="Service Unavailable")
+    unavailable.headers = {"Retry-After": "2"}
+    success = Mock(ok=True, status_code=200)
+    success.json.return_value = {"test_data": [1]}
+    mock_send.side_effect = [requests.exceptions.Timeout(), unavailable, success]
+
+    with patch("core.retry.retry_budget", RetryBudget()) as budget:
+        assert fetch_direct(rest_source) == [1]
+
+    assert mock_send.call_count == 3
+    assert mock_sleep.call_args_list[-1].args == (2.0,)
+    unavailable.close.assert_called_once()
+    assert budget.get_stats() == {"rest_source": 2}
+
+
+@patch("core.retry.time.sleep")
+@patch("core.fetcher.send_request")
+def test_fetch_direct_stops_retrying_when_budget_exhausted(
+    mock_send, mock_sleep, rest_source
+):
+    mock_send.side_effect = requests.exceptions.ConnectionError("refused")
+
+    with patch("core.retry.retry_budget", RetryBudget(total=1)):
+        with pytest.raises(RuntimeError, match="Request failed"):
+            fetch_direct(rest_source)
+
+    assert mock_send.call_count == 2
+
+
+@patch("core.fetcher.send_request")
+def test_fetch_direct_waits_for_rate_limiter(mock_send, rest_source):
+    rest_source["rate_limit"] = {"requests_per_second": 10}
+    mock_send.return_value.ok = True
+    mock_send.return_value.json.return_value = {"test_data": [1]}
+
+    with patch("core.fetcher.rate_limiters", RateLimiterRegistry()) as registry:
+        fetch_direct(rest_source)
+        bucket = registry.get_limiter(rest_source, "http://mock-api/data")
+
+    assert bucket.reserve() > 0
+
+
+@patch("core.fetcher.send_request")
+def test_fetch_direct_records_fetch_metrics(mock_send):
+    test_source = {
+        "name": "streamed",
+        "api_base_url": "http://mock-api",
+        "endpoint": "/data?page=1",
+        "response_data_key": "test_data",
+        "stream_response": True,
+    }
+    body = b'{"test_data": [{"id": 1}, {"id": 2}]}'
+    mock_send.return_value.ok = True
+    mock_send.return_value.iter_content.return_value = [body[:10], body[10:]]
+    mock_send.return_value.raw.tell.return_value = 20
+
+    with patch("core.fetch_metrics.fetch_metrics", FetchMetrics()) as metrics:
+        fetch_direct(test_source)
+
+    stats = metrics.summarize("endpoint")["streamed http://mock-api/data"]
+    assert stats["records"]["max"] == 2
+    assert stats["decoded_bytes"]["max"] == len(body)
+    assert stats["wire_bytes"]["max"] == 20
+    assert stats["attempts"] == 1
+
+
+def test_filter_discovery_matches_targets_known_entities(discovery_source):
+    discovery_data = [
+        {"id": "abc-GLIOMA01"},
+        {"id": "abc-OSA02"},
+        {"id": "abc-UNMAPPED"},
+        {"id": "xyz-GLIOMA01"},
+    ]
+    assert filter_discovery_matches(discovery_source, discovery_data) == [
+        "abc-GLIOMA01",
+        "abc-OSA02",
+        "abc-UNMAPPED",
+    ]
+    assert filter_discovery_matches(
+        discovery_source, discovery_data, ["GLIOMA01", "OSA02"]
+    ) == ["abc-GLIOMA01", "abc-OSA02"]
+
+
+def test_get_deferred_sources(discovery_source):
+    discovery_source["discovery"]["targeted"] = True
+    entity_source = {"name": "ICDC", "type": "graphql"}
+    sources = [entity_source, discovery_source]
+    assert get_deferred_sources(sources, "ICDC") == [discovery_source]
+    assert get_deferred_sources(sources, "missing") == []
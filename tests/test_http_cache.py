@@ -0,0 +1,108 @@
+import json
+import os
+
+from core.http_cache import MISSING, HttpCache
+
+
+def store(cache, url, body, headers, data, signature="sig"):
+    key = cache.make_key("GET", url)
+    writer = cache.open_writer(key)
+    writer.write(body)
+    writer.commit(url, headers, signature, data)
+    return key
+
+
+def test_store_and_load_entry(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    key = store(
+        cache,
+        "http://mock-api/data",
+        b'{"items": [1]}',
+        {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        [1],
+    )
+
+    entry = cache.get_entry(key)
+    assert cache.conditional_headers(entry) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert cache.load_data(key, "sig") == [1]
+    assert cache.load_data(key, "other") is MISSING
+    assert cache.load_body(key) == b'{"items": [1]}'
+
+
+def test_index_persists_across_instances(tmp_path):
+    key = store(
+        HttpCache(str(tmp_path)), "http://mock-api/data", b"[]", {"ETag": "e"}, []
+    )
+    assert HttpCache(str(tmp_path)).get_entry(key)["headers"] == {"ETag": "e"}
+
+
+def test_make_key_includes_method_and_payload():
+    get_key = HttpCache.make_key("GET", "http://mock-api/graphql")
+    post_key = HttpCache.make_key("POST", "http://mock-api/graphql", {"query": "a"})
+    other_key = HttpCache.make_key("POST", "http://mock-api/graphql", {"query": "b"})
+    assert len({get_key, post_key, other_key}) == 3
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = HttpCache(str(tmp_path), max_size_mb=150 / (1024 * 1024))
+    body = json.dumps(["x" * 50]).encode()
+    first = store(cache, "http://mock-api/1", body, {"ETag": "1"}, None)
+    second = store(cache, "http://mock-api/2", body, {"ETag": "2"}, None)
+
+    # using the first entry makes the second the least recently used
+    cache.load_body(first)
+    third = store(cache, "http://mock-api/3", body, {"ETag": "3"}, None)
+
+    assert cache.get_entry(first) is not None
+    assert cache.get_entry(second) is None
+    assert cache.get_entry(third) is not None
+    assert not os.path.exists(tmp_path / f"{second}.body")
+
+
+def test_discarded_writer_leaves_no_entry(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    key = cache.make_key("GET", "http://mock-api/data")
+    writer = cache.open_writer(key)
+    writer.write(b"partial")
+    writer.discard()
+    assert cache.get_entry(key) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_access_times_are_written_on_flush(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    key = store(cache, "http://mock-api/data", b"[]", {"ETag": "e"}, [])
+    index_path = tmp_path / HttpCache.INDEX_FILE
+    written = json.loads(index_path.read_text())[key]["last_access"]
+
+    cache.load_data(key, "sig")
+    cache.load_body(key)
+    assert json.loads(index_path.read_text())[key]["last_access"] == written
+
+    cache.flush()
+    assert json.loads(index_path.read_text())[key]["last_access"] > written
+
+
+def test_extracted_data_is_stored_as_json(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    key = store(cache, "http://mock-api/data", b"[]", {"ETag": "e"}, {"ids": [1]})
+    assert json.loads((tmp_path / f"{key}.data").read_text()) == {"ids": [1]}
+
+    # data JSON cannot hold is not kept, so the body is re-extracted instead
+    other = store(cache, "http://mock-api/other", b"[]", {"ETag": "e"}, {1, 2})
+    assert cache.load_data(other, "sig") is MISSING
+    assert cache.load_body(other) == b"[]"
+
+
+def test_extracted_data_is_replaced_atomically(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    key = store(cache, "http://mock-api/data", b"[]", {"ETag": "e"}, {"ids": [1]})
+    store(cache, "http://mock-api/data", b"[]", {"ETag": "f"}, {"ids": [2]})
+    cache.save_data(key, "sig2", {"ids": [3]})
+
+    assert cache.load_data(key, "sig2") == {"ids": [3]}
+    # no temporary files are left behind next to the entry
+    assert not list(tmp_path.glob("*.tmp"))
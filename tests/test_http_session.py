@@ -0,0 +1,66 @@
+from unittest.mock import patch, Mock
+
+from core.fetch_metrics import TimedHTTPSConnectionPool
+from core.http_session import SessionPool, get_host_key, send_request
+
+
+def test_get_session_reuses_session_per_host():
+    pool = SessionPool()
+    first = pool.get_session("https://mock-api.gov/v1/collections")
+    second = pool.get_session("https://MOCK-API.gov/v2/other", pool_size=4)
+    other = pool.get_session("https://other-api.gov/data")
+    assert first is second
+    assert first is not other
+    pool.close()
+
+
+def test_get_session_applies_pool_size():
+    pool = SessionPool()
+    session = pool.get_session("https://mock-api.gov/data", pool_size=3)
+    adapter = session.get_adapter("https://mock-api.gov")
+    assert adapter._pool_maxsize == 3
+    pool.close()
+
+
+def test_get_session_times_connections():
+    pool = SessionPool()
+    session = pool.get_session("https://mock-api.gov/data")
+    adapter = session.get_adapter("https://mock-api.gov")
+    conn_pool = adapter.poolmanager.connection_from_url("https://mock-api.gov/data")
+    assert isinstance(conn_pool, TimedHTTPSConnectionPool)
+    pool.close()
+
+
+def test_get_stats_counts_hits_and_misses():
+    pool = SessionPool()
+    session = pool.get_session("https://mock-api.gov/data")
+    adapter = session.get_adapter("https://mock-api.gov")
+    conn_pool = adapter.poolmanager.connection_from_url("https://mock-api.gov/data")
+    conn_pool.num_requests = 5
+    conn_pool.num_connections = 2
+
+    stats = pool.get_stats()
+    assert stats["https://mock-api.gov"] == {"requests": 5, "hits": 3, "misses": 2}
+    pool.close()
+
+
+@patch("core.http_session.session_pool")
+def test_send_request_uses_source_pool_size(mock_pool):
+    session = Mock()
+    mock_pool.get_session.return_value = session
+    source = {"name": "mock", "pool_size": 2}
+
+    send_request(source, "GET", "https://mock-api.gov/data", timeout=(1, 1))
+
+    mock_pool.get_session.assert_called_once_with("https://mock-api.gov/data", 2)
+    session.request.assert_called_once_with(
+        "GET", "https://mock-api.gov/data", timeout=(1, 1), stream=False
+    )
+
+
+def test_get_host_key_keeps_scheme_host_and_port():
+    assert get_host_key("https://MOCK-API.gov/v1/data?x=1") == "https://mock-api.gov"
+    assert get_host_key("http://mock-api.gov:8080/data") == "http://mock-api.gov:8080"
+    assert get_host_key("https://mock-api.gov/a") != get_host_key(
+        "http://mock-api.gov/a"
+    )
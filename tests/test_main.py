@@ -0,0 +1,72 @@
+import os
+from unittest.mock import patch
+
+import yaml
+
+import main
+from config_loader import ConfigWatcher
+from core.rate_limiter import rate_limiters
+
+
+def write_config(path, requests_per_second, mtime_ns):
+    path.write_text(
+        yaml.safe_dump(
+            {
+                "project": "TEST_PROJECT",
+                "entity_source": "source1",
+                "sources": [
+                    {
+                        "name": "source1",
+                        "type": "graphql",
+                        "api_base_url": "https://mock-api.gov",
+                        "entity_id_key": "id",
+                        "endpoint": "/graphql",
+                        "query": "{ testQuery }",
+                        "rate_limit": {"requests_per_second": requests_per_second},
+                    }
+                ],
+                "output": {
+                    "destination": "opensearch",
+                    "config": {"host": "https://mock-host:9200", "index": "test-index"},
+                },
+            }
+        )
+    )
+    os.utime(path, ns=(0, mtime_ns))
+
+
+class StopAfterRuns:
+    """Stand-in for the serve loop's stop event, changing the config between runs."""
+
+    def __init__(self, config_path, rates):
+        self.config_path = config_path
+        self.rates = rates
+
+    def is_set(self):
+        return len(self.rates) >= 2
+
+    def set(self):
+        pass
+
+    def wait(self, timeout):
+        write_config(self.config_path, 2, 2)
+
+
+def test_serve_applies_rate_limit_changes_between_runs(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    write_config(config_path, 5, 1)
+    args = main.parse_args(["--config", str(config_path), "--serve"])
+    rates = []
+
+    def run_once(config_watchers, args, client_registry=None):
+        source = config_watchers[0].load()["sources"][0]
+        rates.append(rate_limiters.get_limiter(source, source["api_base_url"]).rate)
+
+    rate_limiters.clear()
+    with patch("main.run_once", side_effect=run_once), patch(
+        "main.threading.Event", return_value=StopAfterRuns(config_path, rates)
+    ), patch("main.signal.signal"):
+        main.serve([ConfigWatcher(str(config_path))], args)
+
+    assert rates == [5, 2]
+    rate_limiters.clear()
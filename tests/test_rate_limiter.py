@@ -0,0 +1,50 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from core.rate_limiter import RateLimiterRegistry, TokenBucket
+
+
+@pytest.fixture
+def clock():
+    now = [100.0]
+    with patch("core.rate_limiter.time.monotonic", side_effect=lambda: now[0]):
+        yield now
+
+
+def test_reserve_allows_burst_then_spaces_requests(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert [bucket.reserve() for _ in range(3)] == [0.5, 1.0, 1.5]
+
+
+def test_reserve_refills_up_to_burst(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+    clock[0] += 10
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_acquire_and_acquire_async_wait_for_tokens(clock):
+    bucket = TokenBucket(rate=4)
+    with patch("core.rate_limiter.time.sleep") as mock_sleep:
+        assert bucket.acquire() == 0.0
+        assert bucket.acquire() == 0.25
+    mock_sleep.assert_called_once_with(0.25)
+
+    async def sleep(delay):
+        clock[0] += delay
+
+    with patch("core.rate_limiter.asyncio.sleep", side_effect=sleep):
+        assert asyncio.run(bucket.acquire_async()) == 0.5
+
+
+def test_registry_shares_bucket_per_host():
+    registry = RateLimiterRegistry()
+    limited = {"rate_limit": {"requests_per_second": 5, "burst": 2}}
+    bucket = registry.get_limiter(limited, "https://api.example.org/a")
+    assert bucket.rate == 5 and bucket.burst == 2
+    assert registry.get_limiter({}, "https://API.example.org/b") is bucket
+    assert registry.get_limiter({}, "https://other.example.org/a") is None
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.request_dedup import RequestDeduplicator
+
+
+def test_call_is_passthrough_when_inactive():
+    dedup = RequestDeduplicator()
+    data = [{"id": 1}]
+
+    assert dedup.call("key", lambda: (data, "response"))[0] is data
+    assert dedup.get_stats() == {"sent": 0, "shared": 0}
+
+
+def test_call_shares_concurrent_requests_with_private_copies():
+    dedup = RequestDeduplicator()
+    dedup.activate()
+    release = threading.Event()
+    sent = []
+
+    def send():
+        sent.append(1)
+        release.wait(5)
+        return [{"id": 1}], "response"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(dedup.call("key", send)))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    while dedup.get_stats()["shared"] < 2:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(sent) == 1
+    assert [data for data, _ in results] == [[{"id": 1}]] * 3
+    results[0][0][0]["repository"] = "IDC"
+    assert "repository" not in results[1][0][0]
+    assert dedup.get_stats() == {"sent": 1, "shared": 2}
+
+
+def test_completed_request_is_not_kept():
+    dedup = RequestDeduplicator()
+    dedup.activate()
+    sent = []
+
+    def send():
+        sent.append(1)
+        return [{"id": len(sent)}], "response"
+
+    assert dedup.call("key", send)[0] == [{"id": 1}]
+    assert dedup.call("key", send)[0] == [{"id": 2}]
+    assert dedup._results == {}
+    assert dedup.get_stats() == {"sent": 2, "shared": 0}
+
+
+def test_failed_request_is_sent_again():
+    dedup = RequestDeduplicator()
+    dedup.activate()
+
+    def fail():
+        raise RuntimeError("Fetch failed: 503")
+
+    with pytest.raises(RuntimeError):
+        dedup.call("key", fail)
+    assert dedup.call("key", lambda: ([1], None)) == ([1], None)
+    assert dedup.get_stats() == {"sent": 2, "shared": 0}
+
+
+def test_call_async_shares_requests_across_threads():
+    dedup = RequestDeduplicator()
+    dedup.activate()
+    started = threading.Event()
+    release = threading.Event()
+    sent = []
+
+    async def send():
+        sent.append(1)
+        started.set()
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        return {"records": [1, 2]}, "response"
+
+    async def fetch_twice():
+        return await asyncio.gather(
+            dedup.call_async("key", send), dedup.call_async("key", send)
+        )
+
+    results = []
+    thread = threading.Thread(target=lambda: results.extend(asyncio.run(fetch_twice())))
+    thread.start()
+    assert started.wait(5)
+    threaded = []
+    waiter = threading.Thread(
+        target=lambda: threaded.append(
+            dedup.call("key", lambda: pytest.fail("request sent again"))
+        )
+    )
+    waiter.start()
+    while dedup.get_stats()["shared"] < 2:
+        pass
+    release.set()
+    thread.join()
+    waiter.join()
+    dedup.deactivate()
+
+    assert len(sent) == 1
+    assert [data for data, _ in results] == [{"records": [1, 2]}] * 2
+    assert threaded == [({"records": [1, 2]}, "response")]
+    assert not dedup.active
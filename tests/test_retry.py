@@ -0,0 +1,88 @@
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, AsyncMock, Mock
+
+import pytest
+
+from core.retry import (
+    RetryBudget,
+    RetryPolicy,
+    call_with_retries_async,
+    configure_retries,
+    get_retry_policy,
+    parse_retry_after,
+)
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+    assert 50 < parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 60
+
+
+def test_get_delay_uses_capped_exponential_backoff():
+    policy = RetryPolicy("source", RetryBudget(), backoff_base=1, backoff_max=5)
+    with patch("core.retry.random.uniform", side_effect=lambda low, high: high):
+        assert [policy.get_delay(attempt) for attempt in range(4)] == [1, 2, 4, 5]
+    assert policy.get_delay(0, retry_after="60") == 5
+
+
+def test_next_delay_respects_max_retries_and_budget():
+    budget = RetryBudget(total=3)
+    first = RetryPolicy("first", budget, max_retries=2)
+    second = RetryPolicy("second", budget, max_retries=2)
+
+    assert first.next_delay("url", 0, "timeout") is not None
+    assert first.next_delay("url", 1, "timeout") is not None
+    assert first.next_delay("url", 2, "timeout") is None
+    assert second.next_delay("url", 0, "timeout") is not None
+    assert second.next_delay("url", 1, "timeout") is None
+    assert budget.get_stats() == {"first": 2, "second": 1}
+
+
+def test_get_retry_policy_merges_defaults_and_source_settings():
+    configure_retries({"max_retries": 5, "backoff_max": 10, "budget": 7})
+    try:
+        policy = get_retry_policy({"name": "source", "retry": {"max_retries": 1}})
+        assert policy.max_retries == 1
+        assert policy.backoff_max == 10
+        assert policy.budget.total == 7
+    finally:
+        configure_retries(None)
+
+
+@patch("core.retry.asyncio.sleep", new_callable=AsyncMock)
+def test_call_with_retries_async_retries_errors(mock_sleep):
+    responses = [asyncio.TimeoutError(), Mock(status_code=200)]
+
+    async def attempt():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    with patch("core.retry.retry_budget", RetryBudget()):
+        response = asyncio.run(
+            call_with_retries_async(
+                {"name": "source"}, "url", attempt, (asyncio.TimeoutError,)
+            )
+        )
+    assert response.status_code == 200
+    assert mock_sleep.call_count == 1
+
+
+@patch("core.retry.asyncio.sleep", new_callable=AsyncMock)
+def test_call_with_retries_async_raises_when_retries_exhausted(mock_sleep):
+    async def attempt():
+        raise asyncio.TimeoutError()
+
+    source = {"name": "source", "retry": {"max_retries": 2}}
+    with patch("core.retry.retry_budget", RetryBudget()) as budget:
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(
+                call_with_retries_async(source, "url", attempt, (asyncio.TimeoutError,))
+            )
+    assert budget.get_stats() == {"source": 2}
@@ -0,0 +1,10 @@
+import re
+
+from core.run_id import new_run_id
+
+
+def test_new_run_id_is_unique_and_timestamped():
+    first, second = new_run_id(), new_run_id()
+
+    assert first != second
+    assert re.fullmatch(r"\d{8}T\d{6}Z-[0-9a-f]{6}", first)
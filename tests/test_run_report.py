@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from core.run_report import RunReport, count_records, report_stage
+
+
+def test_stage_records_timings_counts_and_status():
+    report = RunReport("TEST")
+    with report.stage("fetch", source="IDC") as record:
+        record["records_out"] = 3
+    with pytest.raises(RuntimeError):
+        with report.stage("fetch", source="TCIA"):
+            raise RuntimeError("Fetch failed")
+
+    first, second = report.get_stages()
+    assert first["stage"] == "fetch" and first["source"] == "IDC"
+    assert first["records_out"] == 3 and first["status"] == "ok"
+    assert first["wall_seconds"] >= 0 and first["cpu_seconds"] >= 0
+    assert second["status"] == "error"
+
+
+def test_summarize_groups_stages():
+    report = RunReport("TEST")
+    for source in ("IDC", "TCIA"):
+        with report.stage("fetch", source=source):
+            pass
+    with report.stage("notification"):
+        pass
+
+    lines = report.summarize()
+    assert lines[0].startswith(f"Run {report.run_id}: ")
+    assert lines[1].startswith("fetch: 2x, ") and "slowest" in lines[1]
+    assert lines[2].startswith("notification: 1x, ")
+
+
+def test_save_writes_json(tmp_path):
+    report = RunReport("TEST")
+    with report.stage("config_load", path="config.yaml"):
+        pass
+
+    path = report.save(str(tmp_path))
+    with open(path) as file:
+        saved = json.load(file)
+    assert path.endswith(f"TEST-{report.run_id}.json")
+    assert saved["project"] == "TEST"
+    assert [stage["stage"] for stage in saved["stages"]] == ["config_load"]
+
+
+def test_report_stage_without_report():
+    with report_stage(None, "fetch", source="IDC") as record:
+        record["records_out"] = 1
+    assert count_records(None) is None
+    assert count_records({"id": 1}) == 1
+    assert count_records([1, 2]) == 2
@@ -0,0 +1,85 @@
+from core.run_state import RunState, open_run_state
+
+CONFIG = {"project": "TEST", "entity_source": "entities", "sources": []}
+SOURCE = {"name": "source_B", "entity_id_key": "id"}
+INDEX = "test-index"
+HOSTS = ["https://mock-host:9200"]
+FETCHED_DATA = {"entities": [{"id": "A"}], "source_B": [{"id": "A", "n": 1}]}
+
+
+def make_actions(**documents):
+    return [{"_id": doc_id, "_source": doc} for doc_id, doc in documents.items()]
+
+
+def test_mappings_reused_only_for_unchanged_inputs(tmp_path):
+    path = str(tmp_path / "state.json.gz")
+    state = RunState(path)
+    state.check_unchanged(CONFIG, FETCHED_DATA)
+    assert state.get_mappings(SOURCE, "entities") is None
+    state.set_mappings(SOURCE, "entities", [{"entity_id": "A"}])
+    state.save()
+
+    state = RunState(path)
+    state.check_unchanged(CONFIG, FETCHED_DATA)
+    assert state.get_mappings(SOURCE, "entities") == [{"entity_id": "A"}]
+    assert state.get_mappings(dict(SOURCE, post_processor="x"), "entities") is None
+
+    state = RunState(path)
+    state.check_unchanged(CONFIG, {**FETCHED_DATA, "source_B": [{"id": "A", "n": 2}]})
+    assert state.get_mappings(SOURCE, "entities") is None
+
+    assert RunState(path, full_refresh=True).get_mappings(SOURCE, "entities") is None
+
+
+def test_documents_written_once_and_run_unchanged_after_commit(tmp_path):
+    path = str(tmp_path / "state.json.gz")
+    state = RunState(path)
+    assert not state.check_unchanged(CONFIG, FETCHED_DATA)
+    actions = make_actions(a={"x": 1, "timestamp": "t1"}, b={"x": 2})
+    assert state.filter_changed_documents(actions, INDEX, HOSTS) == actions
+    state.commit_documents()
+    state.save()
+
+    state = RunState(path)
+    assert state.check_unchanged(CONFIG, FETCHED_DATA)
+    actions = make_actions(a={"x": 1, "timestamp": "t2"}, b={"x": 3})
+    assert state.filter_changed_documents(actions, INDEX, HOSTS) == actions[1:]
+
+    state = RunState(path)
+    assert not state.check_unchanged(dict(CONFIG, project="OTHER"), FETCHED_DATA)
+
+
+def test_uncommitted_documents_are_written_again(tmp_path):
+    path = str(tmp_path / "state.json.gz")
+    state = RunState(path)
+    state.check_unchanged(CONFIG, FETCHED_DATA)
+    actions = make_actions(a={"x": 1})
+    state.filter_changed_documents(actions, INDEX, HOSTS)
+    state.save()
+
+    state = RunState(path)
+    assert not state.check_unchanged(CONFIG, FETCHED_DATA)
+    assert state.filter_changed_documents(actions, INDEX, HOSTS) == actions
+
+
+def test_changed_target_rewrites_every_document(tmp_path):
+    path = str(tmp_path / "state.json.gz")
+    state = RunState(path)
+    state.check_unchanged(CONFIG, FETCHED_DATA)
+    actions = make_actions(a={"x": 1}, b={"x": 2})
+    state.filter_changed_documents(actions, INDEX, HOSTS)
+    state.commit_documents()
+    state.save()
+
+    state = RunState(path)
+    assert state.filter_changed_documents(actions, INDEX, HOSTS[::-1]) == []
+    assert state.filter_changed_documents(actions, "new-index", HOSTS) == actions
+    assert (
+        state.filter_changed_documents(actions, INDEX, HOSTS + ["https://other:9200"])
+        == actions
+    )
+
+
+def test_open_run_state_uses_project_file(tmp_path):
+    state = open_run_state({"project": "CCDI hub", "run_state_dir": str(tmp_path)})
+    assert state.path == str(tmp_path / "CCDI_hub.json.gz")
@@ -0,0 +1,53 @@
+import gzip
+import json
+
+import pytest
+
+from core.run_id import new_run_id
+from core.snapshot_store import SnapshotStore
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    fetched_data = {"ICDC": [{"study": "A"}], "IDC/v2": {"n": 1}, "TCIA": None}
+
+    run_dir = store.save("run-1", fetched_data)
+
+    assert store.load("run-1") == fetched_data
+    with gzip.open(f"{run_dir}/IDC_v2.json.gz", "rt") as file:
+        assert json.load(file) == {"n": 1}
+
+
+def test_load_latest_run(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    first, second = new_run_id(), new_run_id()
+    store.save(min(first, second), {"source": [1]})
+    store.save(max(first, second), {"source": [2]})
+    (tmp_path / "incomplete").mkdir()
+
+    assert store.get_latest_run_id() == max(first, second)
+    assert store.load("latest") == {"source": [2]}
+
+
+def test_save_keeps_sources_with_colliding_file_names(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save("run-1", {"a b": [1], "a_b": [2]})
+    assert store.load("run-1") == {"a b": [1], "a_b": [2]}
+
+
+def test_load_missing_snapshot_raises(tmp_path):
+    store = SnapshotStore(str(tmp_path / "none"))
+    with pytest.raises(FileNotFoundError):
+        store.load("latest")
+    with pytest.raises(FileNotFoundError):
+        store.load("run-1")
+
+
+def test_open_run_is_loadable_only_after_commit(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    writer = store.open_run("run-1")
+    writer.add("ICDC", [{"study": "A"}])
+    assert store.get_latest_run_id() is None
+
+    writer.commit()
+    assert store.load("latest") == {"ICDC": [{"study": "A"}]}
@@ -0,0 +1,57 @@
+import json
+
+from core.source_stats import SourceStats
+
+SOURCES = [{"name": "fast"}, {"name": "new"}, {"name": "slow"}, {"name": "medium"}]
+
+
+def test_order_longest_first_starts_unknown_sources_first(tmp_path):
+    stats = SourceStats(str(tmp_path / "stats.json"))
+    stats.record("fast", 1.0)
+    stats.record("slow", 120.0)
+    stats.record("medium", 10.0)
+
+    ordered = stats.order_longest_first(SOURCES)
+    assert [source["name"] for source in ordered] == ["new", "slow", "medium", "fast"]
+
+
+def test_record_smooths_durations_across_runs(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = SourceStats(path)
+    stats.record("slow", 100.0)
+    stats.save()
+
+    stats = SourceStats(path)
+    stats.record("slow", 50.0)
+    assert stats.get_duration("slow") == 75.0
+
+
+def test_save_and_reload(tmp_path):
+    path = tmp_path / "nested" / "stats.json"
+    stats = SourceStats(str(path))
+    stats.record("TCIA", 42.5)
+    stats.save()
+
+    assert json.loads(path.read_text()) == {"TCIA": 42.5}
+    assert SourceStats(str(path)).get_duration("TCIA") == 42.5
+
+
+def test_unreadable_stats_file_is_ignored(tmp_path):
+    path = tmp_path / "stats.json"
+    path.write_text("{not json")
+    assert SourceStats(str(path)).get_duration("TCIA") is None
+
+
+def test_save_merges_durations_of_concurrent_projects(tmp_path):
+    path = str(tmp_path / "stats.json")
+    first = SourceStats(path)
+    second = SourceStats(path)
+    first.record("TCIA", 10.0)
+    second.record("IDC", 20.0)
+    first.save()
+    second.save()
+
+    assert json.loads((tmp_path / "stats.json").read_text()) == {
+        "IDC": 20.0,
+        "TCIA": 10.0,
+    }
@@ -1,6 +1,14 @@
+import random
+
 import pytest
 
-from utils.match_utils import is_fuzzy_match
+from utils import match_utils
+from utils.match_utils import (
+    FuzzyMatchIndex,
+    MatchStrategy,
+    is_fuzzy_match,
+    match_fuzzy_batch,
+)
 
 
 @pytest.mark.parametrize(
@@ -30,3 +38,151 @@ def test_exact_match():
 )
 def test_empty_string_match(str1, str2, threshold, expected):
     assert is_fuzzy_match(str1, str2, threshold) is expected
+
+
+def test_match_fuzzy_batch_agrees_with_is_fuzzy_match(monkeypatch):
+    monkeypatch.setattr(match_utils, "MATCH_BATCH_ROWS", 7)
+    rng = random.Random(21)
+
+    def random_id():
+        return "".join(rng.choice("abC1_-") for _ in range(rng.randint(0, 12)))
+
+    queries = [random_id() for _ in range(30)] + ["GLIOMA01", ""]
+    candidates = [random_id() for _ in range(40)] + ["icdc_glioma", ""]
+
+    matches = match_fuzzy_batch(queries, candidates, workers=2)
+
+    assert matches == [
+        [
+            position
+            for position, candidate in enumerate(candidates)
+            if is_fuzzy_match(query, candidate)
+        ]
+        for query in queries
+    ]
+    assert 40 in matches[-2]
+    assert matches[-1] == []
+
+
+def test_fuzzy_match_index_narrows_candidates():
+    candidates = ["icdc_glioma", "icdc_osa_cohort", "", "tcga_brca", "lung"]
+    index = FuzzyMatchIndex(candidates)
+
+    # 'lung' is too short to be blocked and is always a candidate
+    assert index.lookup("glioma01") == [0, 4]
+    assert index.lookup("zzzzzz") == [4]
+    assert index.lookup("zzz") == [0, 1, 3, 4]
+    assert index.lookup("") == []
+
+
+@pytest.mark.parametrize("threshold", [60, 75, 80, 90])
+def test_match_fuzzy_batch_blocking_keeps_every_match(threshold):
+    rng = random.Random(threshold)
+
+    def random_id():
+        return "".join(
+            rng.choice("abcdefghijklmnopqrstuvwxyz0123456789_-")
+            for _ in range(rng.randint(0, 14))
+        )
+
+    queries = [random_id() for _ in range(150)]
+    candidates = [random_id() for _ in range(150)]
+
+    assert match_fuzzy_batch(queries, candidates, threshold) == [
+        [
+            position
+            for position, candidate in enumerate(candidates)
+            if is_fuzzy_match(query, candidate, threshold)
+        ]
+        for query in queries
+    ]
+
+
+def record_cdist_calls(monkeypatch):
+    cdist = match_utils.process.cdist
+    calls = []
+
+    def record_cdist(queries, choices, **kwargs):
+        calls.append((list(queries), list(choices)))
+        return cdist(queries, choices, **kwargs)
+
+    monkeypatch.setattr(match_utils.process, "cdist", record_cdist)
+    return calls
+
+
+def test_match_fuzzy_batch_groups_queries_by_blocked_candidates(monkeypatch):
+    calls = record_cdist_calls(monkeypatch)
+    candidates = ["icdc_glioma", "icdc_osa_cohort", "tcga_brca", "lung"]
+
+    matches = match_fuzzy_batch(["GLIOMA01", "glioma02", "osa", ""], candidates)
+
+    assert matches == [[0], [0], [1], []]
+    # 'osa' is too short for blocking and is scored against every candidate
+    assert calls == [
+        (["osa"], candidates),
+        (["glioma01", "glioma02"], ["icdc_glioma", "lung"]),
+    ]
+
+
+def test_match_fuzzy_batch_scores_widely_blocked_queries_in_batch(monkeypatch):
+    calls = record_cdist_calls(monkeypatch)
+    candidates = ["icdc_glioma", "icdc_osa_cohort", "tcga_brca", "canine_lymphoma"]
+
+    # 'icdc_lymphoma' shares bigrams with 3 of the 4 candidates
+    assert match_fuzzy_batch(["icdc_lymphoma"], candidates) == [[3]]
+    assert calls == [(["icdc_lymphoma"], candidates)]
+
+
+def test_match_fuzzy_batch_blocking_scores_fewer_pairs(monkeypatch):
+    calls = record_cdist_calls(monkeypatch)
+    rng = random.Random(20)
+
+    def random_word(low, high):
+        length = rng.randint(low, high)
+        return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(length))
+
+    queries = [f"{random_word(4, 8)}{rng.randint(0, 99):02d}" for _ in range(300)]
+    candidates = [f"icdc_{random_word(4, 10)}_{random_word(3, 6)}" for _ in range(300)]
+
+    match_fuzzy_batch(queries, candidates)
+
+    scored = sum(len(rows) * len(choices) for rows, choices in calls)
+    assert scored < 0.25 * len(queries) * len(candidates)
+
+
+def test_match_strategy_cascade():
+    strategy = MatchStrategy(
+        ("exact", "normalized", "token", "fuzzy"), strip_prefixes=("icdc_", "icdc-")
+    )
+    matches = strategy.match(
+        ["GLIOMA01", "osa-canine", "ICDC-Glioma", "x", "", None],
+        ["icdc_glioma", "canine_osa", "Glioma01", "GLIOMA01"],
+    )
+    # exact wins over the normalized match of "Glioma01"
+    assert matches == [[3], [1], [0], [], [], []]
+
+
+def test_match_strategy_only_fuzzy_matches_unresolved(monkeypatch):
+    queries = []
+
+    def fake_batch(batch_queries, candidates, threshold, workers):
+        queries.extend(batch_queries)
+        return [[] for _ in batch_queries]
+
+    monkeypatch.setattr(match_utils, "match_fuzzy_batch", fake_batch)
+    strategy = MatchStrategy(("exact", "fuzzy"))
+    strategy.match(["A1", "B2"], ["A1", "C3"])
+    assert queries == ["B2"]
+
+
+def test_match_strategy_from_config():
+    assert MatchStrategy.from_config(None).order == ("fuzzy",)
+    assert MatchStrategy.from_config("exact").order == ("exact",)
+    assert MatchStrategy.from_config(["exact", "fuzzy"]).order == ("exact", "fuzzy")
+    strategy = MatchStrategy.from_config(
+        {"order": ["normalized"], "strip_suffixes": ["_v1"], "fuzzy_threshold": 90}
+    )
+    assert strategy.order == ("normalized",)
+    assert strategy.strip_suffixes == ("_v1",)
+    assert strategy.fuzzy_threshold == 90
+    assert strategy.match(["Case-1"], ["case1_v1"]) == [[0]]
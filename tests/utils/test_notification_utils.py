@@ -15,3 +15,10 @@ def test_build_notification_message(
 ):
     message = build_notification_message(success, mappings, project)
     assert ("Success" in message) == expected_contains_success
+
+
+def test_build_notification_message_with_report_summary():
+    message = build_notification_message(
+        True, [], "ICDC", report_summary=["Run 1: 2.0s", "fetch: 3x, 1.5s total"]
+    )
+    assert message.endswith("Run report:\nRun 1: 2.0s\nfetch: 3x, 1.5s total")
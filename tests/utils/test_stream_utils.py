@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from utils.stream_utils import ResponseStreamExtractor
+
+
+def _stream(extractor, document, chunk_size=5):
+    body = json.dumps(document).encode()
+    for i in range(0, len(body), chunk_size):
+        extractor.feed(body[i : i + chunk_size])
+    return extractor.close()
+
+
+@pytest.mark.parametrize(
+    "key, document, expected",
+    [
+        (None, [1, {"a": 2}], [1, {"a": 2}]),
+        ("collections", {"collections": [{"id": "x"}], "other": 1}, [{"id": "x"}]),
+        ("data.items", {"data": {"items": [1.5, "two"]}}, [1.5, "two"]),
+        (
+            "data.study",
+            {"data": {"study": {"id": "s", "n": [1]}}},
+            {"id": "s", "n": [1]},
+        ),
+        ("data.count", {"data": {"count": 3}}, 3),
+        ("missing", {"data": [1]}, {}),
+        ("data.items", {"data": [{"items": [1]}]}, {}),
+    ],
+)
+def test_extracts_response_data_key(key, document, expected):
+    assert _stream(ResponseStreamExtractor(key), document) == expected
+
+
+def test_filters_records_while_streaming():
+    document = {
+        "collections": [
+            {"name": "first", "collection_id": "icdc_glioma", "tags": ["a"]},
+            {"collection_id": "tcga_brca", "nested": {"collection_id": "icdc_x"}},
+            {"nested": {"collection_id": "icdc_y"}, "collection_id": "icdc_osa"},
+            {"name": "no id"},
+            {"collection_id": 5},
+            ["not", "a", "record"],
+        ]
+    }
+    extractor = ResponseStreamExtractor("collections", "collection_id", "icdc_")
+    assert _stream(extractor, document, chunk_size=3) == [
+        {"name": "first", "collection_id": "icdc_glioma", "tags": ["a"]},
+        {"nested": {"collection_id": "icdc_y"}, "collection_id": "icdc_osa"},
+    ]
+
+
+def test_invalid_json_raises_value_error():
+    extractor = ResponseStreamExtractor("data")
+    with pytest.raises(ValueError):
+        extractor.feed(b'{"data": [1, }')
+        extractor.close()
@@ -4,7 +4,7 @@ from unittest.mock import patch
 import pytest
 from opensearchpy.exceptions import OpenSearchException
 
-from core.writer.opensearch_writer import OpenSearchWriter
+from core.writer.opensearch_writer import OpenSearchClientRegistry, OpenSearchWriter
 
 
 @pytest.fixture
@@ -130,3 +130,133 @@ def test_build_doc_id_distinguishes_repository_sets():
     id_tcia = OpenSearchWriter._build_doc_id(doc_tcia, "TEST")
 
     assert id_idc != id_tcia
+
+
+@patch("core.writer.opensearch_writer.OpenSearch")
+def test_writers_share_clients_from_registry(mock_opensearch, mock_config):
+    mock_opensearch.return_value.ping.return_value = True
+    registry = OpenSearchClientRegistry()
+
+    first = OpenSearchWriter(mock_config, client_registry=registry)
+    second = OpenSearchWriter(
+        {**mock_config, "project": "OTHER"}, client_registry=registry
+    )
+    registry.close()
+
+    assert first.clients == second.clients
+    assert mock_opensearch.call_count == 1
+    mock_opensearch.return_value.close.assert_called_once()
+
+
+@patch("core.writer.opensearch_writer.bulk")
+@patch("core.writer.opensearch_writer.OpenSearch")
+def test_bulk_write_skips_unchanged_documents(
+    mock_opensearch, mock_bulk, mock_config, tmp_path
+):
+    from core.run_state import RunState
+
+    mock_opensearch.return_value.ping.return_value = True
+    mock_bulk.side_effect = lambda client, actions: (len(actions), [])
+    documents = [
+        {"entity_id": "TEST1", "CRDCLinks": [{"repository": "test_repo_1"}]},
+        {"entity_id": "TEST2", "CRDCLinks": [{"repository": "test_repo_2"}]},
+    ]
+    writer = OpenSearchWriter(mock_config)
+    run_state = RunState(str(tmp_path / "state.json.gz"))
+
+    assert writer.bulk_write_documents(documents, run_state)["success"] == 2
+
+    documents[1]["CRDCLinks"][0]["url"] = "https://changed"
+    result = writer.bulk_write_documents(documents, run_state)
+    assert result == {"success": 1, "attempted": 1, "unchanged": 1}
+
+    result = writer.bulk_write_documents(documents, run_state)
+    assert result == {"success": 0, "attempted": 0, "unchanged": 2}
+    assert mock_bulk.call_count == 2
+
+
+@patch("core.writer.opensearch_writer.bulk")
+@patch("core.writer.opensearch_writer.OpenSearch")
+def test_bulk_write_counts_unchanged_documents_once_across_hosts(
+    mock_opensearch, mock_bulk, mock_config, tmp_path
+):
+    from core.run_state import RunState
+
+    mock_opensearch.return_value.ping.return_value = True
+    mock_bulk.side_effect = lambda client, actions: (len(actions), [])
+    mock_config["output"]["config"]["host"] = ["https://host-1", "https://host-2"]
+    documents = [
+        {"entity_id": "TEST1", "CRDCLinks": [{"repository": "test_repo_1"}]},
+        {"entity_id": "TEST2", "CRDCLinks": [{"repository": "test_repo_2"}]},
+    ]
+    writer = OpenSearchWriter(mock_config)
+    run_state = RunState(str(tmp_path / "state.json.gz"))
+    writer.bulk_write_documents(documents, run_state)
+
+    documents[1]["CRDCLinks"][0]["url"] = "https://changed"
+    result = writer.bulk_write_documents(documents, run_state)
+    assert result == {"success": 2, "attempted": 2, "unchanged": 1}
+
+
+@patch("core.writer.opensearch_writer.bulk")
+@patch("core.writer.opensearch_writer.OpenSearch")
+def test_bulk_write_rewrites_documents_when_index_changes(
+    mock_opensearch, mock_bulk, mock_config, tmp_path
+):
+    from core.run_state import RunState
+
+    mock_opensearch.return_value.ping.return_value = True
+    mock_bulk.side_effect = lambda client, actions: (len(actions), [])
+    documents = [
+        {"entity_id": "TEST1", "CRDCLinks": [{"repository": "test_repo_1"}]},
+        {"entity_id": "TEST2", "CRDCLinks": [{"repository": "test_repo_2"}]},
+    ]
+    run_state = RunState(str(tmp_path / "state.json.gz"))
+    OpenSearchWriter(mock_config).bulk_write_documents(documents, run_state)
+
+    mock_config["output"]["config"]["index"] = "new-index"
+    result = OpenSearchWriter(mock_config).bulk_write_documents(documents, run_state)
+    assert result == {"success": 2, "attempted": 2, "unchanged": 0}
+    assert all(action["_index"] == "new-index" for action in mock_bulk.call_args[0][1])
+
+
+@patch("core.writer.opensearch_writer.bulk")
+@patch("core.writer.opensearch_writer.OpenSearch")
+def test_stream_write_documents_writes_in_chunks(
+    mock_opensearch, mock_bulk, mock_config
+):
+    mock_opensearch.return_value.ping.return_value = True
+    mock_bulk.side_effect = lambda client, actions: (len(actions), [])
+    mock_config["output"]["config"]["post_processor"] = "format_for_ccdi"
+    consumed = []
+
+    def records():
+        for i in range(5):
+            consumed.append(i)
+            yield {"id": i, "repository": "TCIA", "slug": f"c{i}"}
+
+    writer = OpenSearchWriter(mock_config)
+    result = writer.stream_write_documents(records(), chunk_size=2)
+
+    assert result == {"success": 5, "attempted": 5}
+    chunks = [call.args[1] for call in mock_bulk.call_args_list]
+    assert [len(actions) for actions in chunks] == [2, 2, 1]
+    assert chunks[0][0]["_id"] == "TEST_TCIA_c0"
+    assert chunks[0][0]["_source"]["data"]["id"] == 0
+    assert consumed == list(range(5))
+
+
+@patch("core.writer.opensearch_writer.bulk")
+@patch("core.writer.opensearch_writer.OpenSearch")
+def test_stream_write_documents_stops_when_all_hosts_fail(
+    mock_opensearch, mock_bulk, mock_config
+):
+    mock_opensearch.return_value.ping.return_value = True
+    mock_bulk.side_effect = OpenSearchException("Bulk write error")
+    records = iter([{"id": i} for i in range(5)])
+
+    writer = OpenSearchWriter(mock_config)
+    with pytest.raises(RuntimeError):
+        writer.stream_write_documents(records, chunk_size=2)
+    assert mock_bulk.call_count == 1
+    assert len(list(records)) == 3
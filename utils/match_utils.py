@@ -1,7 +1,29 @@
-from rapidfuzz import fuzz
+import logging
+import re
+from typing import Any, Callable, Optional, Union
 
+import numpy as np
+from rapidfuzz import fuzz, process
 
-def is_fuzzy_match(str1: str, str2: str, threshold: int = 75) -> bool:
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MATCH_THRESHOLD = 75
+
+MATCH_STRATEGIES = ("exact", "normalized", "token", "fuzzy")
+
+# query strings scored per cdist call, bounding the score matrix held at once
+MATCH_BATCH_ROWS = 1024
+
+# largest fraction of the candidates a query may be narrowed to by bigram
+# blocking and still be scored against its own candidates; above it, scoring
+# every candidate in a batch is cheaper than the lookup and the extra cdist call
+BLOCKING_MAX_COVERAGE = 0.5
+
+
+def is_fuzzy_match(
+    str1: str, str2: str, threshold: int = DEFAULT_MATCH_THRESHOLD
+) -> bool:
     """Checks if two strings are a fuzzy match based on a similarity threshold.
 
     Args:
@@ -16,3 +38,354 @@ def is_fuzzy_match(str1: str, str2: str, threshold: int = 75) -> bool:
         return False
 
     return fuzz.partial_ratio(str1.lower(), str2.lower()) >= threshold
+
+
+class FuzzyMatchIndex:
+    """Blocking index over candidate strings, narrowing the candidates a query
+    string must be scored against with is_fuzzy_match's predicate.
+
+    Candidates are indexed by their lowercase character bigrams. A query is
+    only paired with candidates sharing at least one bigram with it. The
+    filter never drops a match: a partial_ratio of at least the threshold
+    needs a longest common subsequence of at least threshold / 200 of the
+    combined lengths of the compared strings, and each character left out of
+    it or inserted into it breaks at most two of the aligned bigrams. Above a
+    threshold of 2/3, this leaves at least one shared bigram once both
+    strings reach a minimum length (6 for the default threshold of 75).
+    Shorter strings, and all strings at lower thresholds, are compared
+    against every candidate.
+    """
+
+    def __init__(self, candidates: list, threshold: int = DEFAULT_MATCH_THRESHOLD):
+        """Initialize FuzzyMatchIndex and index the candidates.
+
+        Args:
+            candidates (list): Candidate strings; empty ones never match.
+            threshold (int): Similarity threshold (0-100) the index is built for.
+        """
+        self.threshold = threshold
+        self.min_length = FuzzyMatchIndex._get_min_length(threshold)
+        self.texts = [
+            candidate.lower() if candidate else "" for candidate in candidates
+        ]
+        self.positions = [position for position, text in enumerate(self.texts) if text]
+        self._unblocked = []
+        self._bigrams = {}
+
+        for position in self.positions:
+            text = self.texts[position]
+            if not self.is_blocked(text):
+                self._unblocked.append(position)
+                continue
+            for bigram in FuzzyMatchIndex._get_bigrams(text):
+                self._bigrams.setdefault(bigram, []).append(position)
+
+    def is_blocked(self, text: str) -> bool:
+        """Check whether a string is long enough for bigram blocking.
+
+        Args:
+            text (str): Lowercase string.
+
+        Returns:
+            bool: True if a fuzzy match of the string must share a bigram.
+        """
+        return self.min_length is not None and len(text) >= self.min_length
+
+    def lookup(self, text: str) -> list[int]:
+        """Find the candidates a lowercase query string may fuzzy match.
+
+        Args:
+            text (str): Lowercase string to match, e.g. an entity ID.
+
+        Returns:
+            list[int]: Positions of the plausible candidates, in candidate
+            order. Each must still be scored.
+        """
+        if not text:
+            return []
+        if not self.is_blocked(text):
+            return list(self.positions)
+
+        positions = set(self._unblocked)
+        for bigram in FuzzyMatchIndex._get_bigrams(text):
+            positions.update(self._bigrams.get(bigram, ()))
+        return sorted(positions)
+
+    @staticmethod
+    def _get_bigrams(text: str) -> set:
+        """Collect the character bigrams of a string.
+
+        Args:
+            text (str): Lowercase string.
+
+        Returns:
+            set: Distinct bigrams of the string.
+        """
+        return {text[i : i + 2] for i in range(len(text) - 1)}
+
+    @staticmethod
+    def _get_min_length(threshold: int) -> Optional[int]:
+        """Compute the shortest string length for which a fuzzy match at the
+        threshold guarantees a shared bigram.
+
+        Args:
+            threshold (int): Similarity threshold (0-100).
+
+        Returns:
+            Optional[int]: Minimum length, or None if no length guarantees a
+            shared bigram at this threshold.
+        """
+        # a bigram is shared once (3 * threshold / 200 - 1) * (m + k) > 1, for
+        # the shorter string of length m aligned to k >= m * threshold /
+        # (200 - threshold) characters of the longer one
+        if 3 * threshold <= 200:
+            return None
+        return int((200 - threshold) // (3 * threshold - 200)) + 1
+
+
+def match_fuzzy_batch(
+    queries: list,
+    candidates: list,
+    threshold: int = DEFAULT_MATCH_THRESHOLD,
+    workers: int = 1,
+) -> list[list[int]]:
+    """Fuzzy matches every query string against the candidate strings, with
+    the same predicate as is_fuzzy_match. Each string is lowercased once, and
+    a FuzzyMatchIndex is built once over the candidates.
+
+    Queries whose plausible candidates (see FuzzyMatchIndex.lookup) are at
+    most BLOCKING_MAX_COVERAGE of all candidates are grouped by that
+    candidate set, and each group is scored by a single rapidfuzz cdist call
+    against only its candidates. The other queries are scored against every
+    candidate in batches of MATCH_BATCH_ROWS queries by a single cdist call
+    each.
+
+    Args:
+        queries (list): Strings to match, e.g. entity IDs.
+        candidates (list): Strings to match against; empty ones never match.
+        threshold (int): Similarity threshold (0-100) for fuzzy matching.
+        workers (int): Threads used by cdist (-1 for all cores).
+
+    Returns:
+        list[list[int]]: For each query, the positions of the candidates it
+        matches, in candidate order.
+    """
+    matches = [[] for _ in queries]
+    index = FuzzyMatchIndex(candidates, threshold)
+    query_texts = [query.lower() if query else "" for query in queries]
+    if not index.positions:
+        return matches
+
+    max_columns = BLOCKING_MAX_COVERAGE * len(index.positions)
+    unblocked = []
+    blocked = {}
+    for position, text in enumerate(query_texts):
+        if not text:
+            continue
+        columns = index.lookup(text) if index.is_blocked(text) else None
+        if columns is None or len(columns) > max_columns:
+            unblocked.append(position)
+        elif columns:
+            blocked.setdefault(tuple(columns), []).append(position)
+
+    batches = [(tuple(index.positions), unblocked)] + list(blocked.items())
+    for columns, positions in batches:
+        choices = [index.texts[column] for column in columns]
+        for start in range(0, len(positions), MATCH_BATCH_ROWS):
+            rows = positions[start : start + MATCH_BATCH_ROWS]
+            # scores below the cutoff are returned as 0
+            scores = process.cdist(
+                [query_texts[position] for position in rows],
+                choices,
+                scorer=fuzz.partial_ratio,
+                score_cutoff=threshold,
+                workers=workers,
+            )
+            for position, row in zip(rows, scores):
+                matches[position] = [
+                    columns[column] for column in np.flatnonzero(row >= threshold)
+                ]
+    return matches
+
+
+class MatchStrategy:
+    """Matches entity IDs to candidate IDs (e.g. a source's match key values)
+    with a cascade of strategies, tried in the configured order:
+
+    - 'exact': identical IDs
+    - 'normalized': IDs equal once canonicalized (lowercased, configured
+      prefixes and suffixes stripped, and characters other than letters and
+      digits removed)
+    - 'token': IDs with the same set of letter and digit runs once prefixes and
+      suffixes are stripped, in any order (e.g. 'osa_canine' and 'Canine-OSA')
+    - 'fuzzy': is_fuzzy_match at the configured threshold, in batch, against
+      the candidates a FuzzyMatchIndex finds plausible
+
+    'exact', 'normalized' and 'token' are dictionary lookups. An entity ID is
+    only tried with a strategy if all earlier strategies matched no candidate.
+    """
+
+    def __init__(
+        self,
+        order: tuple = ("fuzzy",),
+        strip_prefixes: tuple = (),
+        strip_suffixes: tuple = (),
+        fuzzy_threshold: float = DEFAULT_MATCH_THRESHOLD,
+    ):
+        """Initialize MatchStrategy.
+
+        Args:
+            order (tuple): Strategies to try, cheapest first.
+            strip_prefixes (tuple): Prefixes removed (case-insensitively) before
+                'normalized' and 'token' matching; the first matching one is
+                removed.
+            strip_suffixes (tuple): Suffixes removed likewise.
+            fuzzy_threshold (float): Similarity threshold (0-100) for 'fuzzy'.
+        """
+        self.order = tuple(order)
+        self.strip_prefixes = tuple(prefix.lower() for prefix in strip_prefixes)
+        self.strip_suffixes = tuple(suffix.lower() for suffix in strip_suffixes)
+        self.fuzzy_threshold = fuzzy_threshold
+
+    @staticmethod
+    def from_config(config: Optional[Union[str, list, dict]]) -> "MatchStrategy":
+        """Create the MatchStrategy described by a source's 'match_strategy'.
+
+        Args:
+            config (Optional[Union[str, list, dict]]): A strategy name, a list
+                of them, or a block with 'order', 'strip_prefixes',
+                'strip_suffixes' and 'fuzzy_threshold'. None selects fuzzy
+                matching at the default threshold.
+
+        Returns:
+            MatchStrategy: The configured strategy.
+        """
+        if config is None:
+            return MatchStrategy()
+        if isinstance(config, str):
+            return MatchStrategy((config,))
+        if isinstance(config, list):
+            return MatchStrategy(tuple(config))
+        return MatchStrategy(
+            tuple(config.get("order", ("fuzzy",))),
+            tuple(config.get("strip_prefixes", ())),
+            tuple(config.get("strip_suffixes", ())),
+            config.get("fuzzy_threshold", DEFAULT_MATCH_THRESHOLD),
+        )
+
+    def match(
+        self, queries: list, candidates: list, workers: int = 1
+    ) -> list[list[int]]:
+        """Match each query string to candidates with the strategy cascade.
+
+        Args:
+            queries (list): Strings to match, e.g. entity IDs.
+            candidates (list): Strings to match against; empty ones never match.
+            workers (int): Threads used for fuzzy batch matching.
+
+        Returns:
+            list[list[int]]: For each query, the positions of the candidates
+            matched by the first strategy matching any, in candidate order.
+        """
+        matches = [[] for _ in queries]
+        unresolved = [position for position, query in enumerate(queries) if query]
+
+        for name in self.order:
+            if not unresolved:
+                break
+            if name == "fuzzy":
+                found = match_fuzzy_batch(
+                    [queries[position] for position in unresolved],
+                    candidates,
+                    self.fuzzy_threshold,
+                    workers,
+                )
+            else:
+                make_key = self._get_key_function(name)
+                lookup = {}
+                for position, candidate in enumerate(candidates):
+                    key = make_key(candidate) if candidate else None
+                    if key:
+                        lookup.setdefault(key, []).append(position)
+                found = [
+                    lookup.get(make_key(queries[position]), [])
+                    for position in unresolved
+                ]
+
+            remaining = []
+            for position, positions in zip(unresolved, found):
+                if positions:
+                    matches[position] = list(positions)
+                else:
+                    remaining.append(position)
+            logger.debug(
+                f"Match strategy '{name}' resolved {len(unresolved) - len(remaining)} "
+                f"of {len(unresolved)} IDs"
+            )
+            unresolved = remaining
+        return matches
+
+    def canonicalize(self, value: str) -> str:
+        """Build the 'normalized' key of an ID.
+
+        Args:
+            value (str): ID to canonicalize.
+
+        Returns:
+            str: Lowercase ID without stripped affixes, letters and digits only.
+        """
+        return re.sub(r"[^a-z0-9]", "", self._strip_affixes(value))
+
+    def tokenize(self, value: str) -> tuple:
+        """Build the 'token' key of an ID.
+
+        Args:
+            value (str): ID to tokenize.
+
+        Returns:
+            tuple: Sorted distinct letter and digit runs of the lowercase ID
+            without stripped affixes.
+        """
+        return tuple(
+            sorted(set(re.findall(r"[a-z]+|[0-9]+", self._strip_affixes(value))))
+        )
+
+    def _get_key_function(self, name: str) -> Callable[[str], Any]:
+        """Look up the function building the lookup key of a strategy.
+
+        Args:
+            name (str): 'exact', 'normalized' or 'token'.
+
+        Returns:
+            Callable[[str], Any]: Function mapping an ID to its key.
+
+        Raises:
+            ValueError: If the strategy is unknown.
+        """
+        if name == "exact":
+            return str
+        if name == "normalized":
+            return self.canonicalize
+        if name == "token":
+            return self.tokenize
+        raise ValueError(f"Unknown match strategy '{name}'")
+
+    def _strip_affixes(self, value: str) -> str:
+        """Lowercase an ID and remove the first matching prefix and suffix.
+
+        Args:
+            value (str): ID to strip.
+
+        Returns:
+            str: Stripped lowercase ID.
+        """
+        text = str(value).strip().lower()
+        for prefix in self.strip_prefixes:
+            if prefix and text.startswith(prefix):
+                text = text[len(prefix) :]
+                break
+        for suffix in self.strip_suffixes:
+            if suffix and text.endswith(suffix):
+                text = text[: -len(suffix)]
+                break
+        return text
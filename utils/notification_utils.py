@@ -1,13 +1,20 @@
 from datetime import datetime, timezone
+from typing import Optional
 
 
-def build_notification_message(success: bool, mappings: list, project: str) -> str:
+def build_notification_message(
+    success: bool,
+    mappings: list,
+    project: str,
+    report_summary: Optional[list] = None,
+) -> str:
     """Constructs SNS notification message summarizing data retrieval result.
 
     Args:
         success (bool): Data retrieval and mapping success/failure.
         mappings (list): List of external data mappings associated with project.
         project (str): Name of project being processed.
+        report_summary (Optional[list]): Summary lines of the run report, if any.
 
     Returns:
         str: Formatted message for SNS notification.
@@ -26,4 +33,7 @@ def build_notification_message(success: bool, mappings: list, project: str) -> s
     else:
         body = f"🚨 The pipeline encountered an error. Please check the logs for more details."
 
-    return f"{header}\n{time_info}\n\n{body}"
+    message = f"{header}\n{time_info}\n\n{body}"
+    if report_summary:
+        message += "\n\n📊 Run report:\n" + "\n".join(report_summary)
+    return message
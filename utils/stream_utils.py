@@ -0,0 +1,210 @@
+from typing import Any, Optional, Union
+
+import ijson
+
+_START_EVENTS = ("start_map", "start_array")
+_END_EVENTS = ("end_map", "end_array")
+
+
+class ResponseStreamExtractor:
+    """Incrementally extracts the data under a dotted 'response_data_key' from
+    JSON byte chunks, building only the records that are kept.
+
+    When the data under the key is a list and both 'match_key' and
+    'filter_prefix' are given, list items whose 'match_key' value does not start
+    with 'filter_prefix' are skipped without being built.
+    """
+
+    def __init__(
+        self,
+        response_data_key: Optional[str] = None,
+        match_key: Optional[str] = None,
+        filter_prefix: Optional[str] = None,
+    ):
+        """Initialize ResponseStreamExtractor.
+
+        Args:
+            response_data_key (Optional[str]): Dot-path to the relevant data.
+            match_key (Optional[str]): Record key checked against filter_prefix.
+            filter_prefix (Optional[str]): Prefix a kept record's match_key value
+                must start with.
+        """
+        self.target_prefix = response_data_key or ""
+        self.item_prefix = (
+            f"{self.target_prefix}.item" if self.target_prefix else "item"
+        )
+        self.match_key = match_key
+        self.filter_prefix = filter_prefix
+        self.filtering = match_key is not None and filter_prefix is not None
+
+        self.result = {}
+        self._events = ijson.sendable_list()
+        self._parser = ijson.parse_coro(self._events, use_float=True)
+        self._in_list = False
+        self._builder = None
+        self._depth = 0
+        self._buffer = None
+        self._skipping = False
+        self._awaiting_match_value = False
+
+    def feed(self, chunk: bytes) -> None:
+        """Parses the next chunk of the response body.
+
+        Args:
+            chunk (bytes): Next chunk of the JSON response body.
+
+        Raises:
+            ValueError: If the body is not valid JSON.
+        """
+        try:
+            self._parser.send(chunk)
+        except ijson.JSONError as e:
+            raise ValueError(f"Invalid JSON in streamed response: {e}") from e
+        self._process_events()
+
+    def close(self) -> Union[list, dict, Any]:
+        """Finishes parsing and returns the extracted data.
+
+        Returns:
+            Union[list, dict, Any]: Data under 'response_data_key', or an empty
+            dict if the key is not present.
+
+        Raises:
+            ValueError: If the body is incomplete or not valid JSON.
+        """
+        try:
+            self._parser.close()
+        except ijson.JSONError as e:
+            raise ValueError(f"Invalid JSON in streamed response: {e}") from e
+        self._process_events()
+        return self.result
+
+    def _process_events(self) -> None:
+        """Consumes the parser events produced so far."""
+        for prefix, event, value in self._events:
+            if self._in_list:
+                self._handle_list_event(prefix, event, value)
+            elif self._builder is not None:
+                self._build(event, value)
+                if self._depth == 0:
+                    self.result = self._builder.value
+                    self._builder = None
+            elif prefix == self.target_prefix:
+                self._start_target(event, value)
+        del self._events[:]
+
+    def _start_target(self, event: str, value: Any) -> None:
+        """Handles the first event of the value under 'response_data_key'.
+
+        Args:
+            event (str): Parser event name.
+            value (Any): Parser event value.
+        """
+        if event == "start_array":
+            self._in_list = True
+            self.result = []
+        elif event == "start_map":
+            self._builder = ijson.ObjectBuilder()
+            self._build(event, value)
+        else:
+            self.result = value
+
+    def _handle_list_event(self, prefix: str, event: str, value: Any) -> None:
+        """Handles an event inside the list under 'response_data_key'.
+
+        Args:
+            prefix (str): Parser event prefix.
+            event (str): Parser event name.
+            value (Any): Parser event value.
+        """
+        if self._depth == 0:
+            if prefix == self.target_prefix and event == "end_array":
+                self._in_list = False
+                return
+            if event not in _START_EVENTS:
+                # scalar list item; scalars have no match_key to filter on
+                if not self.filtering:
+                    self.result.append(value)
+                return
+            self._builder = ijson.ObjectBuilder()
+            self._skipping = False
+            self._awaiting_match_value = False
+            self._buffer = [] if self.filtering and event == "start_map" else None
+            if self.filtering and event == "start_array":
+                self._skipping = True
+
+        if self._skipping:
+            self._track_depth(event)
+        elif self._buffer is not None:
+            self._buffer_event(prefix, event, value)
+        else:
+            self._build(event, value)
+
+        if self._depth == 0:
+            if self._buffer is not None:
+                # record ended without a match_key value
+                self._skipping = not "".startswith(self.filter_prefix)
+                self._flush_buffer()
+            if not self._skipping:
+                self.result.append(self._builder.value)
+            self._builder = None
+            self._buffer = None
+
+    def _buffer_event(self, prefix: str, event: str, value: Any) -> None:
+        """Holds record events until the record's match_key value is known.
+
+        Args:
+            prefix (str): Parser event prefix.
+            event (str): Parser event name.
+            value (Any): Parser event value.
+        """
+        self._track_depth(event)
+        if self._awaiting_match_value:
+            self._awaiting_match_value = False
+            matched = isinstance(value, str) and value.startswith(self.filter_prefix)
+            if not matched:
+                self._skipping = True
+                self._buffer = None
+                return
+            self._buffer.append((event, value))
+            self._flush_buffer()
+            return
+
+        self._buffer.append((event, value))
+        if (
+            event == "map_key"
+            and prefix == self.item_prefix
+            and value == self.match_key
+            and self._depth == 1
+        ):
+            self._awaiting_match_value = True
+
+    def _flush_buffer(self) -> None:
+        """Replays buffered events into the record builder."""
+        if self._buffer is None:
+            return
+        if not self._skipping:
+            for event, value in self._buffer:
+                self._builder.event(event, value)
+        self._buffer = None
+
+    def _build(self, event: str, value: Any) -> None:
+        """Feeds an event to the current builder and tracks nesting depth.
+
+        Args:
+            event (str): Parser event name.
+            value (Any): Parser event value.
+        """
+        self._track_depth(event)
+        self._builder.event(event, value)
+
+    def _track_depth(self, event: str) -> None:
+        """Updates the nesting depth of the value being built.
+
+        Args:
+            event (str): Parser event name.
+        """
+        if event in _START_EVENTS:
+            self._depth += 1
+        elif event in _END_EVENTS:
+            self._depth -= 1